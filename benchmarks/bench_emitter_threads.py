@@ -0,0 +1,63 @@
+"""
+Sustained rate of events emitted from worker threads into a loop-bound EventEmitter.
+
+Compares the batched inbox of `EventEmitter(loop=...)` with the naive approach
+of one `loop.call_soon_threadsafe(emitter.emit, ...)` wakeup per event.
+
+Usage: PYTHONPATH=. python benchmarks/bench_emitter_threads.py [events_per_thread]
+"""
+import asyncio
+import sys
+import threading
+import time
+
+from pattern_kit import EventEmitter
+
+
+async def run(threads: int, per_thread: int, batched: bool) -> float:
+    loop = asyncio.get_running_loop()
+    emitter = EventEmitter(loop=loop if batched else None)
+    expected = threads * per_thread
+    received = 0
+    done = asyncio.Event()
+
+    def listener(data):
+        nonlocal received
+        received += 1
+        if received == expected:
+            done.set()
+
+    emitter.on("tick", listener)
+
+    if batched:
+        def produce():
+            for i in range(per_thread):
+                emitter.emit("tick", i)
+    else:
+        def produce():
+            for i in range(per_thread):
+                loop.call_soon_threadsafe(emitter.emit, "tick", i)
+
+    workers = [threading.Thread(target=produce) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    await done.wait()
+    elapsed = time.perf_counter() - start
+
+    for worker in workers:
+        worker.join()
+    return expected / elapsed
+
+
+def main():
+    per_thread = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"{'threads':>8} {'call_soon_threadsafe':>22} {'batched inbox':>15}")
+    for threads in (1, 2, 4, 8):
+        naive = asyncio.run(run(threads, per_thread, batched=False))
+        batched = asyncio.run(run(threads, per_thread, batched=True))
+        print(f"{threads:>8} {naive:>16,.0f} ev/s {batched:>9,.0f} ev/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Throughput of EventBridge between two processes over a Unix domain socket.
+
+A child process emits events on a bridged topic as fast as it can; the parent
+counts how many reach its own emitter per second.
+
+Usage: PYTHONPATH=. python benchmarks/bench_event_bridge.py [events]
+"""
+import asyncio
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from pattern_kit import EventEmitter, EventBridge
+
+
+def producer(path: str, serializer: str, payload, count: int) -> None:
+    async def main():
+        emitter = EventEmitter()
+        bridge = EventBridge(emitter, ["ticks"], serializer=serializer)
+        await bridge.connect(path)
+        for i in range(count):
+            emitter.emit("ticks", payload)
+            if i % 1000 == 0:
+                # Apply backpressure so the socket buffer does not grow unbounded
+                await bridge.drain()
+        await bridge.aclose()
+
+    asyncio.run(main())
+
+
+async def run(serializer: str, payload, count: int) -> float:
+    emitter = EventEmitter()
+    received = 0
+    done = asyncio.Event()
+
+    def listener(data):
+        nonlocal received
+        received += 1
+        if received == count:
+            done.set()
+
+    emitter.on("ticks", listener)
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.sock")
+    bridge = EventBridge(emitter, ["ticks"], serializer=serializer)
+    await bridge.serve(path)
+
+    process = multiprocessing.get_context("spawn").Process(
+        target=producer, args=(path, serializer, payload, count)
+    )
+    start = time.perf_counter()
+    process.start()
+    await done.wait()
+    elapsed = time.perf_counter() - start
+
+    await bridge.aclose()
+    process.join()
+    return count / elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    cases = [
+        ("pickle", {"symbol": "BTC-USD", "bid": 1.0, "ask": 1.1}),
+        ("raw", b"x" * 64),
+        ("raw", b"x" * 4096),
+    ]
+    for serializer, payload in cases:
+        rate = asyncio.run(run(serializer, payload, count))
+        size = len(payload) if isinstance(payload, bytes) else "dict"
+        print(f"{serializer:>7} payload={size!s:>5}: {rate:>10,.0f} events/s (incl. process start-up)")
+
+
+if __name__ == "__main__":
+    main()
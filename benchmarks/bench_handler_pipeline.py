@@ -0,0 +1,124 @@
+"""
+Per-run overhead of HandlerPipeline for pipelines of 5, 20 and 100 stages.
+
+Compares the compiled plan used by `run()` / `run_async()` with the previous
+interpreted loop, which called `can_handle` and re-classified every handler
+on each run. Also compares dispatching on message types with `can_handle`
+checks against handlers declaring `handles`.
+
+Usage: PYTHONPATH=. python benchmarks/bench_handler_pipeline.py [runs]
+"""
+import asyncio
+import inspect
+import sys
+import time
+
+from pattern_kit import HandlerPipeline, Handler, AsyncHandler, StopPipeline
+
+
+class Increment(Handler):
+    def handle(self, data, **kwargs):
+        return data + 1
+
+
+class AsyncIncrement(AsyncHandler):
+    async def handle(self, data, **kwargs):
+        return data + 1
+
+
+def interpreted_run(handlers, data, **kwargs):
+    result = current = data
+    try:
+        for handler in handlers:
+            if handler.can_handle(current, **kwargs):
+                result = handler.handle(current, **kwargs)
+                current = result
+    except StopPipeline as stop:
+        return stop.result
+    return result
+
+
+async def interpreted_run_async(handlers, data, **kwargs):
+    result = current = data
+    try:
+        for handler in handlers:
+            if handler.can_handle(current, **kwargs):
+                method = getattr(handler, "handle", None)
+                if inspect.iscoroutinefunction(method):
+                    result = await method(current, **kwargs)
+                else:
+                    result = method(current, **kwargs)
+                current = result
+    except StopPipeline as stop:
+        return stop.result
+    return result
+
+
+def make_router(message_type, routed: bool):
+    if routed:
+        class OnType(Handler):
+            handles = (message_type,)
+
+            def handle(self, data, **kwargs):
+                return data
+    else:
+        class OnType(Handler):
+            def can_handle(self, data, **kwargs):
+                return isinstance(data, message_type)
+
+            def handle(self, data, **kwargs):
+                return data
+    return OnType()
+
+
+def timed(fn, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    return (time.perf_counter() - start) / runs * 1e6
+
+
+async def timed_async(fn, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        await fn()
+    return (time.perf_counter() - start) / runs * 1e6
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    print(f"{'stages':>6} {'mode':>6} {'interpreted':>13} {'compiled':>10}")
+    for stages in (5, 20, 100):
+        for mode in ("sync", "async", "mixed"):
+            pipeline = HandlerPipeline(pass_result=True)
+            for i in range(stages):
+                if mode == "async" or (mode == "mixed" and i % 2):
+                    pipeline += AsyncIncrement()
+                else:
+                    pipeline += Increment()
+            handlers = pipeline._handlers
+
+            if mode == "sync":
+                before = timed(lambda: interpreted_run(handlers, 0), runs)
+                after = timed(lambda: pipeline.run(0), runs)
+            else:
+                before = asyncio.run(timed_async(lambda: interpreted_run_async(handlers, 0), runs))
+                after = asyncio.run(timed_async(lambda: pipeline.run_async(0), runs))
+            print(f"{stages:>6} {mode:>6} {before:>10.2f} us {after:>7.2f} us")
+
+    print()
+    print(f"{'types':>6} {'can_handle':>13} {'handles':>10}")
+    for count in (5, 20, 100):
+        types = [type(f"Message{i}", (), {}) for i in range(count)]
+        message = types[count // 2]()
+        timings = []
+        for routed in (False, True):
+            pipeline = HandlerPipeline()
+            for message_type in types:
+                pipeline += make_router(message_type, routed)
+            timings.append(timed(lambda: pipeline.run(message), runs))
+        print(f"{count:>6} {timings[0]:>10.2f} us {timings[1]:>7.2f} us")
+
+
+if __name__ == "__main__":
+    main()
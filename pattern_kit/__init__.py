@@ -1,8 +1,13 @@
 from .architectural.service_locator import ServiceLocator
 
+from .behavioral._dispatch import EmitError, Subscription
+from .behavioral.delivery import Conflate, Debounce, Throttle, Coalesce, Isolate
 from .behavioral.event import Event
 from .behavioral.event_emitter import EventEmitter
+from .behavioral.event_bridge import EventBridge
+from .behavioral.event_stream import EventStream
 from .behavioral.handler_pipeline import Handler, AsyncHandler, HandlerPipeline, StopPipeline
+from .behavioral.handler_graph import HandlerGraph
 from .behavioral.observer import Observer, AsyncObserver, Observable
 
 from .creational.factory import Factory, register_factory
@@ -18,8 +23,14 @@ __all__ = [
     # Behavioral patterns
     "Event",
     "EventEmitter",
+    "EventBridge",
+    "EventStream",
+    "EmitError",
+    "Subscription",
     "Handler", "AsyncHandler", "HandlerPipeline", "StopPipeline",
+    "HandlerGraph",
     "Observable", "Observer", "AsyncObserver",
+    "Conflate", "Debounce", "Throttle", "Coalesce", "Isolate",
 
     # Creational patterns
     "Factory", "register_factory",
@@ -0,0 +1,637 @@
+from collections import deque
+from typing import Any, Callable, Iterable, NamedTuple, Optional
+import inspect
+import asyncio
+import heapq
+import itertools
+import sys
+import threading
+import weakref
+
+
+class DispatchPlan(NamedTuple):
+    """
+    Immutable snapshot of a listener collection, compiled for dispatch.
+
+    `entries` keeps registration order as `(callable, is_async)` pairs, while
+    `sync` holds the callables alone so that the common all-sync case can be
+    walked without any per-listener branching.
+    """
+    entries: tuple[tuple[Callable[..., Any], bool], ...]
+    sync: tuple[Callable[..., Any], ...]
+    has_async: bool
+
+
+EMPTY_PLAN = DispatchPlan((), (), False)
+
+# (sort key, callable, is_async) - sort keys are unique across all registries
+Row = tuple[Any, Callable[..., Any], bool]
+
+
+def build_plan(rows: Iterable[Row]) -> DispatchPlan:
+    """Build a dispatch plan from rows already in dispatch order."""
+    entries = tuple((target, is_async) for _, target, is_async in rows)
+    sync = tuple(target for target, is_async in entries if not is_async)
+    return DispatchPlan(entries, sync, len(sync) != len(entries))
+
+
+def merge_plans(registries: Iterable["ListenerRegistry"]) -> DispatchPlan:
+    """Build a single plan dispatching to several registries, in registration order."""
+    return build_plan(heapq.merge(*(registry.rows for registry in registries)))
+
+
+def weak_ref(obj: Any, callback: Optional[Callable[[Any], Any]] = None) -> weakref.ref:
+    """Return a weak reference to `obj`, using `WeakMethod` for bound methods."""
+    if inspect.ismethod(obj):
+        return weakref.WeakMethod(obj, callback)
+    return weakref.ref(obj, callback)
+
+
+def _weak_caller(ref: weakref.ref, is_async: bool) -> Callable[..., Any]:
+    """Wrap a weak reference in a callable that does nothing once the referent is gone."""
+    if is_async:
+        def call(*args, **kwargs):
+            target = ref()
+            if target is None:
+                return _noop()
+            return target(*args, **kwargs)
+    else:
+        def call(*args, **kwargs):
+            target = ref()
+            if target is not None:
+                return target(*args, **kwargs)
+    return call
+
+
+async def _noop() -> None:
+    pass
+
+
+def _once_caller(target: Callable[..., Any], is_async: bool, registry: "ListenerRegistry", seq: int):
+    """Wrap a one-shot listener so it unsubscribes itself before its first (and only) call."""
+    if is_async:
+        def call(*args, **kwargs):
+            if not registry.discard(seq):
+                return _noop()
+            return target(*args, **kwargs)
+    else:
+        def call(*args, **kwargs):
+            if registry.discard(seq):
+                return target(*args, **kwargs)
+    return call
+
+
+_sequence = itertools.count()
+
+
+class _Entry:
+    """A registered item, held either strongly or through a weak reference."""
+    __slots__ = ("_item", "ref", "seq", "key", "hash", "once")
+
+    def __init__(self, item: Any, ref: Optional[weakref.ref], priority: int, once: bool):
+        self._item = item if ref is None else None
+        self.ref = ref
+        self.seq = next(_sequence)
+        # Higher priorities first, then registration order
+        self.key = (-priority, self.seq)
+        self.hash = _hash(item)
+        self.once = once
+
+    @property
+    def item(self) -> Any:
+        """The registered item, or None if it was weakly held and has been collected."""
+        return self._item if self.ref is None else self.ref()
+
+
+def _hash(item: Any) -> Optional[int]:
+    try:
+        return hash(item)
+    except TypeError:
+        return None
+
+
+class Subscription:
+    """
+    Handle returned when subscribing a listener.
+
+    `cancel()` unsubscribes in constant time, without searching for the listener.
+    Can also be used as a context manager to unsubscribe on exit.
+    """
+    __slots__ = ("_registry", "_seq", "_linked", "_on_cancel")
+
+    def __init__(
+        self,
+        registry: "ListenerRegistry",
+        seq: int,
+        linked: tuple["Subscription", ...] = (),
+        on_cancel: Optional[Callable[[], Any]] = None,
+    ):
+        self._registry = registry
+        self._seq = seq
+        self._linked = linked
+        self._on_cancel = on_cancel
+
+    @classmethod
+    def group(
+        cls,
+        subscriptions: Iterable["Subscription"],
+        on_cancel: Optional[Callable[[], Any]] = None,
+    ) -> "Subscription":
+        """
+        Combine several subscriptions into a single handle cancelling all of them.
+
+        `on_cancel` is called once the combined subscription is cancelled.
+        """
+        first, *rest = subscriptions
+        return cls(first._registry, first._seq, tuple(rest), on_cancel)
+
+    @property
+    def active(self) -> bool:
+        """True until the subscription is cancelled (or a once-listener has fired)."""
+        return self._seq in self._registry._entries or any(sub.active for sub in self._linked)
+
+    def cancel(self) -> bool:
+        """Unsubscribe. Returns False if the subscription was no longer active."""
+        cancelled = self._registry.discard(self._seq)
+        for sub in self._linked:
+            cancelled = sub.cancel() or cancelled
+        if cancelled and self._on_cancel is not None:
+            self._on_cancel()
+        return cancelled
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.cancel()
+
+
+class ListenerRegistry:
+    """
+    Ordered collection of listeners backing `Event`, `EventEmitter` and `Observable`.
+
+    Classifying listeners (sync vs async, bound method lookup) happens once,
+    when the plan is compiled after a change, instead of on every dispatch.
+    Plans are immutable tuples: a listener may subscribe or unsubscribe while
+    a dispatch is in progress without affecting the snapshot being walked, and
+    without copying the listener list on each call.
+
+    Subscribing and unsubscribing are O(1): entries are kept in a dict keyed by
+    sequence number, with a hash index for removal by value. The plan is only
+    recompiled (and sorted by priority) on the next dispatch after a change,
+    so churning many subscriptions between two dispatches costs one rebuild.
+
+    Items registered with `weak=True` are only weakly referenced. When one is
+    garbage-collected, the plan is invalidated and the dead entry is pruned
+    the next time the plan is compiled.
+
+    Mutations and plan compilation are serialized by a lock, so listeners may
+    be added or removed from any thread. Dispatch itself never takes the lock.
+
+    Args:
+        resolve (callable, optional): Maps a registered item to the callable to
+            invoke (e.g. an observer to its bound `notify` method).
+        on_change (callable, optional): Called without arguments whenever the
+            registry changes, so owners can drop plans derived from it.
+    """
+
+    def __init__(
+        self,
+        resolve: Optional[Callable[[Any], Callable[..., Any]]] = None,
+        on_change: Optional[Callable[[], Any]] = None,
+    ):
+        self._entries: dict[int, _Entry] = {}
+        self._index: dict[int, list[int]] = {}
+        self._resolve = resolve
+        self._on_change = on_change
+        self._rows: list[Row] = []
+        self._plan: Optional[DispatchPlan] = EMPTY_PLAN
+        self._lock = threading.RLock()
+
+    def add(self, item: Any, weak: bool = False, once: bool = False, priority: int = 0) -> Subscription:
+        """
+        Register an item and invalidate the compiled plan.
+
+        Args:
+            item: The listener (or observer) to register.
+            weak (bool): Only keep a weak reference to the item.
+            once (bool): Unsubscribe the item automatically before it is first called.
+            priority (int): Items with a higher priority are dispatched first.
+                Items with equal priority keep their registration order.
+        """
+        ref = weak_ref(item, self._on_collected) if weak else None
+        entry = _Entry(item, ref, priority, once)
+        with self._lock:
+            self._entries[entry.seq] = entry
+            if entry.hash is not None:
+                self._index.setdefault(entry.hash, []).append(entry.seq)
+            self._invalidate()
+        return Subscription(self, entry.seq)
+
+    def remove(self, item: Any) -> None:
+        """Unregister the first matching item. Raises `ValueError` if it is not registered."""
+        with self._lock:
+            seq = self._find(item)
+            if seq is None:
+                raise ValueError(f"{item!r} is not registered")
+            self._discard(seq)
+
+    def discard(self, seq: int) -> bool:
+        """Unregister the entry with sequence number `seq`. Returns False if it was not registered."""
+        with self._lock:
+            return self._discard(seq)
+
+    def _discard(self, seq: int) -> bool:
+        entry = self._entries.pop(seq, None)
+        if entry is None:
+            return False
+
+        if entry.hash is not None:
+            bucket = self._index[entry.hash]
+            bucket.remove(seq)
+            if not bucket:
+                del self._index[entry.hash]
+        self._invalidate()
+        return True
+
+    def _find(self, item: Any) -> Optional[int]:
+        item_hash = _hash(item)
+        if item_hash is None:
+            candidates = self._entries
+        else:
+            candidates = self._index.get(item_hash, ())
+
+        for seq in candidates:
+            if self._entries[seq].item == item:
+                return seq
+        return None
+
+    def _on_collected(self, ref: weakref.ref) -> None:
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        self._plan = None
+        if self._on_change is not None:
+            self._on_change()
+
+    @property
+    def plan(self) -> DispatchPlan:
+        """Return the compiled plan, rebuilding it if the registry changed."""
+        plan = self._plan
+        if plan is None:
+            plan = self._compile()
+        return plan
+
+    @property
+    def rows(self) -> list[Row]:
+        """Compiled `(key, callable, is_async)` rows, in dispatch order."""
+        if self._plan is None:
+            self._compile()
+        return self._rows
+
+    def _compile(self) -> DispatchPlan:
+        with self._lock:
+            resolve = self._resolve
+            rows = []
+            for entry in list(self._entries.values()):
+                item = entry.item
+                if item is None and entry.ref is not None:
+                    self._discard(entry.seq)
+                    continue
+
+                target = resolve(item) if resolve is not None else item
+                is_async = inspect.iscoroutinefunction(target)
+                if entry.ref is not None:
+                    ref = entry.ref if target is item else weak_ref(target)
+                    target = _weak_caller(ref, is_async)
+                if entry.once:
+                    target = _once_caller(target, is_async, self, entry.seq)
+                rows.append((entry.key, target, is_async))
+
+            # Entries are already in registration order; this only reorders by priority
+            rows.sort(key=_row_key)
+            self._rows = rows
+            plan = self._plan = build_plan(rows)
+            return plan
+
+    def _items(self) -> list[Any]:
+        return [item for item in (entry.item for entry in self._entries.values()) if item is not None]
+
+    def __contains__(self, item: Any) -> bool:
+        return self._find(item) is not None
+
+    def __iter__(self):
+        return iter(self._items())
+
+    def __len__(self) -> int:
+        return len(self._items())
+
+
+def _row_key(row: Row) -> Any:
+    return row[0]
+
+
+class PlanCache:
+    """
+    Bounded cache of plans merged from several registries, keyed by event name.
+
+    Owners pass `invalidate` as the `on_change` callback of every registry the
+    cached plans are derived from.
+
+    Args:
+        maxsize (int): Maximum number of cached plans; the oldest one is evicted first.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self._maxsize = maxsize
+        self._plans: dict[Any, DispatchPlan] = {}
+        self.version = 0
+        # Makes the version check in `put` atomic with respect to `invalidate`,
+        # which may run on another thread. Reentrant: a weak listener collected
+        # during `put` calls `invalidate` on the same thread.
+        self._lock = threading.RLock()
+
+    def get(self, key: Any) -> Optional[DispatchPlan]:
+        return self._plans.get(key)
+
+    def put(self, key: Any, plan: DispatchPlan, version: int) -> None:
+        """Cache `plan`, unless a change since `version` already made it stale."""
+        with self._lock:
+            if version != self.version:
+                return
+            if len(self._plans) >= self._maxsize:
+                self._plans.pop(next(iter(self._plans)), None)
+            self._plans[key] = plan
+            if version != self.version:
+                # Invalidated from within this call
+                self._plans.pop(key, None)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.version += 1
+            self._plans.clear()
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._plans
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+
+class EmitError(Exception):
+    """
+    Raised by async dispatch in `errors="collect"` mode once every listener
+    has run, carrying all the exceptions raised by failing listeners.
+    """
+
+    def __init__(self, errors: list[BaseException]):
+        super().__init__(f"{len(errors)} listener(s) failed")
+        self.errors = errors
+
+
+class FanOut:
+    """
+    Execution strategy for awaited dispatch (`call_async`, `emit_async`, `notify_async`).
+
+    Sync listeners are always called inline, in registration order. Async
+    listeners are awaited one after another by default, or run together when
+    `concurrent` is set.
+
+    Args:
+        concurrent (bool): Run async listeners concurrently instead of sequentially.
+        max_concurrency (int, optional): Cap on async listeners running at once (concurrent mode).
+        timeout (float, optional): Per-listener timeout in seconds for async listeners.
+        errors (str): `"raise"` stops at the first failure (cancelling listeners still running),
+            `"collect"` runs every listener then raises an `EmitError` with all failures.
+    """
+
+    def __init__(
+        self,
+        concurrent: bool = False,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        errors: str = "raise",
+    ):
+        if errors not in ("raise", "collect"):
+            raise ValueError(f"Invalid errors mode '{errors}', expected 'raise' or 'collect'")
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self.concurrent = concurrent
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.errors = errors
+
+    @property
+    def is_default(self) -> bool:
+        """True when dispatch is a plain sequential loop with no timeout or error collection."""
+        return not self.concurrent and self.timeout is None and self.errors == "raise"
+
+    async def run(self, plan: DispatchPlan, args: tuple, kwargs: dict) -> None:
+        """Dispatch `args`/`kwargs` to every listener of `plan`."""
+        if self.concurrent:
+            await self._run_concurrent(plan, args, kwargs)
+        else:
+            await self._run_sequential(plan, args, kwargs)
+
+    async def _call(self, listener: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+        if self.timeout is None:
+            await listener(*args, **kwargs)
+        else:
+            await asyncio.wait_for(listener(*args, **kwargs), self.timeout)
+
+    async def _run_sequential(self, plan: DispatchPlan, args: tuple, kwargs: dict) -> None:
+        collect = self.errors == "collect"
+        errors = []
+        for listener, is_async in plan.entries:
+            try:
+                if is_async:
+                    await self._call(listener, args, kwargs)
+                else:
+                    listener(*args, **kwargs)
+            except Exception as exc:
+                if not collect:
+                    raise
+                errors.append(exc)
+
+        if errors:
+            raise EmitError(errors)
+
+    async def _run_concurrent(self, plan: DispatchPlan, args: tuple, kwargs: dict) -> None:
+        collect = self.errors == "collect"
+        semaphore = asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else None
+
+        async def run_async(listener):
+            if semaphore is None:
+                await self._call(listener, args, kwargs)
+            else:
+                async with semaphore:
+                    await self._call(listener, args, kwargs)
+
+        errors = []
+        tasks = []
+        try:
+            for listener, is_async in plan.entries:
+                if is_async:
+                    tasks.append(asyncio.ensure_future(run_async(listener)))
+                    continue
+                try:
+                    listener(*args, **kwargs)
+                except Exception as exc:
+                    if not collect:
+                        raise
+                    errors.append(exc)
+
+            if tasks:
+                return_when = asyncio.ALL_COMPLETED if collect else asyncio.FIRST_EXCEPTION
+                await asyncio.wait(tasks, return_when=return_when)
+
+                for task in tasks:
+                    if task.done() and not task.cancelled() and task.exception() is not None:
+                        errors.append(task.exception())
+                if errors and not collect:
+                    raise errors[0]
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        if errors:
+            raise EmitError(errors)
+
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_newest", "inline")
+
+
+class TaskRegistry:
+    """
+    Keeps track of the fire-and-forget tasks started by sync dispatch
+    (`Event.__call__`, `EventEmitter.emit`, `Observable.notify`).
+
+    Holding a reference to every task prevents it from being garbage-collected
+    before it finishes, and lets the owner await outstanding work at shutdown.
+
+    Args:
+        max_pending (int, optional): Maximum number of tasks in flight. Unbounded if None.
+        overflow (str): What to do when `max_pending` is reached:
+
+            - `"block"`: queue the call and start it as soon as a running task finishes.
+              Once `max_backlog` calls are queued, new calls are dropped.
+            - `"drop_oldest"`: cancel the oldest running task to make room.
+            - `"drop_newest"`: discard the new call.
+            - `"inline"`: start the call immediately, ignoring the cap. On Python 3.12+
+              it runs synchronously inside the dispatching call until it first suspends.
+        max_backlog (int): Maximum number of calls queued by the `"block"` policy.
+    """
+
+    def __init__(self, max_pending: Optional[int] = None, overflow: str = "block", max_backlog: int = 1024):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Invalid overflow policy '{overflow}', expected one of {OVERFLOW_POLICIES}")
+        if max_pending is not None and max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        if max_backlog < 0:
+            raise ValueError("max_backlog must not be negative")
+
+        self.max_pending = max_pending
+        self.overflow = overflow
+        self.max_backlog = max_backlog
+        # dicts keep insertion order, so the first key is always the oldest task
+        self._tasks: dict[asyncio.Future, None] = {}
+        self._backlog: deque[tuple[Callable[..., Any], tuple, dict]] = deque()
+        self._closed = False
+
+        self.completed = 0
+        self.failed = 0
+        self.dropped = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of calls running or waiting for a free slot."""
+        return len(self._tasks) + len(self._backlog)
+
+    def spawn(self, listener: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+        """Start `listener(*args, **kwargs)` as a tracked task, honouring the overflow policy."""
+        if self._closed:
+            raise RuntimeError("Cannot schedule listeners after aclose()")
+
+        if self.max_pending is None or len(self._tasks) < self.max_pending:
+            self._start(listener(*args, **kwargs))
+            return
+
+        # Tasks that finished but whose done-callback has not run yet still hold a slot
+        self._settle_done()
+        if len(self._tasks) < self.max_pending:
+            self._start(listener(*args, **kwargs))
+            return
+
+        overflow = self.overflow
+        if overflow == "block":
+            if len(self._backlog) < self.max_backlog:
+                self._backlog.append((listener, args, kwargs))
+            else:
+                self.dropped += 1
+        elif overflow == "drop_newest":
+            self.dropped += 1
+        elif overflow == "drop_oldest":
+            oldest = next(iter(self._tasks))
+            del self._tasks[oldest]
+            oldest.cancel()
+            self.dropped += 1
+            self._start(listener(*args, **kwargs))
+        else:
+            self._start(listener(*args, **kwargs), eager=True)
+
+    def _start(self, coro, eager: bool = False) -> None:
+        if eager and _EAGER_START:
+            task = asyncio.Task(coro, loop=asyncio.get_running_loop(), eager_start=True)
+        else:
+            task = asyncio.create_task(coro)
+        self._tasks[task] = None
+        task.add_done_callback(self._on_done)
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        if task not in self._tasks:
+            # Already accounted for (dropped to make room, or settled by `spawn`)
+            return
+        self._settle(task)
+        self._start_backlog()
+
+    def _settle_done(self) -> None:
+        for task in [task for task in self._tasks if task.done()]:
+            self._settle(task)
+        self._start_backlog()
+
+    def _settle(self, task: asyncio.Task) -> None:
+        del self._tasks[task]
+        if task.cancelled():
+            self.dropped += 1
+        elif task.exception() is not None:
+            self.failed += 1
+            task.get_loop().call_exception_handler({
+                "message": "Unhandled exception in async listener",
+                "exception": task.exception(),
+                "task": task,
+            })
+        else:
+            self.completed += 1
+
+    def _start_backlog(self) -> None:
+        backlog = self._backlog
+        while backlog and len(self._tasks) < self.max_pending:
+            listener, args, kwargs = backlog.popleft()
+            self._start(listener(*args, **kwargs))
+
+    async def drain(self) -> None:
+        """Wait until every tracked task (including queued ones) has finished."""
+        while self._tasks:
+            await asyncio.wait(list(self._tasks))
+
+    async def aclose(self) -> None:
+        """Refuse new calls, then wait for outstanding ones to finish."""
+        self._closed = True
+        await self.drain()
+
+
+_EAGER_START = sys.version_info >= (3, 12)
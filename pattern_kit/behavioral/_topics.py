@@ -0,0 +1,86 @@
+from typing import Callable, Optional
+
+from ._dispatch import ListenerRegistry
+
+
+SINGLE_WILDCARD = "*"
+MULTI_WILDCARD = "#"
+
+
+class _Node:
+    __slots__ = ("children", "registry")
+
+    def __init__(self):
+        self.children: dict[str, "_Node"] = {}
+        self.registry: Optional[ListenerRegistry] = None
+
+
+class TopicIndex:
+    """
+    Segment trie holding wildcard subscriptions such as `orders.*.filled` or `orders.#`.
+
+    `*` matches exactly one segment and `#` matches zero or more segments.
+    Matching a concrete topic walks the trie one segment at a time, so its cost
+    grows with the depth of the topic rather than with the number of patterns.
+
+    Args:
+        delimiter (str): Separator between topic segments.
+    """
+
+    def __init__(self, delimiter: str = "."):
+        self._delimiter = delimiter
+        self._root = _Node()
+
+    def is_pattern(self, topic: str) -> bool:
+        """Return True if `topic` contains a wildcard segment."""
+        segments = topic.split(self._delimiter)
+        return SINGLE_WILDCARD in segments or MULTI_WILDCARD in segments
+
+    def registry(
+        self,
+        pattern: str,
+        factory: Optional[Callable[[], ListenerRegistry]] = None,
+    ) -> Optional[ListenerRegistry]:
+        """
+        Return the registry stored for `pattern`.
+
+        If it does not exist yet, it is created with `factory`, or None is returned
+        when no factory is given.
+        """
+        node = self._root
+        for segment in pattern.split(self._delimiter):
+            child = node.children.get(segment)
+            if child is None:
+                if factory is None:
+                    return None
+                child = node.children[segment] = _Node()
+            node = child
+
+        if node.registry is None and factory is not None:
+            node.registry = factory()
+        return node.registry
+
+    def match(self, topic: str) -> list[ListenerRegistry]:
+        """Return the registries of every pattern matching the concrete `topic`."""
+        found: dict[int, ListenerRegistry] = {}
+        self._walk(self._root, topic.split(self._delimiter), 0, found)
+        return list(found.values())
+
+    def _walk(self, node: _Node, segments: list[str], index: int, found: dict[int, ListenerRegistry]) -> None:
+        multi = node.children.get(MULTI_WILDCARD)
+        if multi is not None:
+            for next_index in range(index, len(segments) + 1):
+                self._walk(multi, segments, next_index, found)
+
+        if index == len(segments):
+            if node.registry is not None:
+                found[id(node.registry)] = node.registry
+            return
+
+        child = node.children.get(segments[index])
+        if child is not None:
+            self._walk(child, segments, index + 1, found)
+
+        single = node.children.get(SINGLE_WILDCARD)
+        if single is not None:
+            self._walk(single, segments, index + 1, found)
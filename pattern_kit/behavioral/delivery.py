@@ -0,0 +1,429 @@
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Hashable, Optional, Protocol
+import asyncio
+import inspect
+
+from .event_stream import EventStream
+
+
+KeyFunc = Callable[[str, Any], Hashable]
+
+ISOLATE_OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_newest", "disconnect")
+
+
+class Target(Protocol):
+    """The observer side of a gate, as seen by delivery modes."""
+
+    def deliver(self, event: str, data: Any) -> None:
+        """Hand a notification over; async observers are started as tracked tasks."""
+
+    def call(self, event: str, data: Any) -> Any:
+        """Call the observer directly, returning its coroutine if it is async."""
+
+    def unsubscribe(self) -> None:
+        """Remove the observer from the observable."""
+
+
+class Delivery(ABC):
+    """
+    Base class for the delivery modes of an observer (see `Observable.add_observer`).
+
+    A delivery mode sits between `notify` and the observer: notifications are
+    buffered and handed over later, from timers on the running asyncio loop, so
+    the producer never waits for a slow observer.
+
+    Notifications are grouped by key, the event name by default. Pass `key`
+    to group them more finely, e.g. `key=lambda event, data: data.symbol`.
+
+    Args:
+        key (callable, optional): Maps `(event, data)` to the grouping key.
+    """
+
+    def __init__(self, key: Optional[KeyFunc] = None):
+        self.key = key
+
+    @abstractmethod
+    def open(self, target: Target) -> "Gate":
+        """Return the per-observer state of this mode, delivering to `target`."""
+        pass
+
+
+class Gate(ABC):
+    """Per-observer state of a delivery mode."""
+
+    def __init__(self, mode: Delivery, target: Target):
+        self._key = mode.key
+        self._target = target
+        self._deliver = target.deliver
+
+    def key(self, event: str, data: Any) -> Hashable:
+        return event if self._key is None else self._key(event, data)
+
+    @abstractmethod
+    def push(self, event: str, data: Any) -> None:
+        """Accept a notification."""
+        pass
+
+    @abstractmethod
+    def flush(self) -> None:
+        """Deliver every notification held back, without waiting for timers."""
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        """Cancel pending timers and drop notifications held back."""
+        pass
+
+    async def join(self) -> None:
+        """Wait until every accepted notification has been handed over."""
+        self.flush()
+
+
+class Conflate(Delivery):
+    """
+    Deliver only the latest notification per key, at most once every `interval` seconds.
+
+    Args:
+        interval (float): Seconds between deliveries.
+        key (callable, optional): Maps `(event, data)` to the conflation key.
+    """
+
+    def __init__(self, interval: float, key: Optional[KeyFunc] = None):
+        super().__init__(key)
+        self.interval = interval
+
+    def open(self, target: Target) -> Gate:
+        return _ConflateGate(self, target)
+
+
+class _ConflateGate(Gate):
+    def __init__(self, mode: Conflate, target: Target):
+        super().__init__(mode, target)
+        self._interval = mode.interval
+        self._latest: dict[Hashable, tuple[str, Any]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def push(self, event: str, data: Any) -> None:
+        self._latest[self.key(event, data)] = (event, data)
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self._interval, self.flush)
+
+    def flush(self) -> None:
+        self._cancel()
+        latest, self._latest = self._latest, {}
+        for event, data in latest.values():
+            self._deliver(event, data)
+
+    def close(self) -> None:
+        self._cancel()
+        self._latest.clear()
+
+    def _cancel(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+
+class Debounce(Delivery):
+    """
+    Deliver the latest notification per key once no new one arrived for `wait` seconds.
+
+    Args:
+        wait (float): Quiet period in seconds.
+        key (callable, optional): Maps `(event, data)` to the debounce key.
+    """
+
+    def __init__(self, wait: float, key: Optional[KeyFunc] = None):
+        super().__init__(key)
+        self.wait = wait
+
+    def open(self, target: Target) -> Gate:
+        return _DebounceGate(self, target)
+
+
+class _DebounceGate(Gate):
+    def __init__(self, mode: Debounce, target: Target):
+        super().__init__(mode, target)
+        self._wait = mode.wait
+        # key -> [event, data, deadline, timer]
+        self._pending: dict[Hashable, list] = {}
+
+    def push(self, event: str, data: Any) -> None:
+        key = self.key(event, data)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._wait
+        state = self._pending.get(key)
+        if state is None:
+            timer = loop.call_at(deadline, self._fire, key)
+            self._pending[key] = [event, data, deadline, timer]
+        else:
+            # Push the deadline back; the timer re-arms itself when it fires early,
+            # instead of being cancelled and recreated on every notification.
+            state[0], state[1], state[2] = event, data, deadline
+
+    def _fire(self, key: Hashable) -> None:
+        state = self._pending[key]
+        loop = asyncio.get_running_loop()
+        if loop.time() < state[2]:
+            state[3] = loop.call_at(state[2], self._fire, key)
+            return
+        del self._pending[key]
+        self._deliver(state[0], state[1])
+
+    def flush(self) -> None:
+        pending, self._pending = self._pending, {}
+        for event, data, _, timer in pending.values():
+            timer.cancel()
+            self._deliver(event, data)
+
+    def close(self) -> None:
+        for state in self._pending.values():
+            state[3].cancel()
+        self._pending.clear()
+
+
+_EMPTY = object()
+
+
+class Throttle(Delivery):
+    """
+    Deliver at most one notification per key every `interval` seconds.
+
+    The first notification is delivered immediately; the latest one received
+    during the window is delivered when it ends.
+
+    Args:
+        interval (float): Window length in seconds.
+        key (callable, optional): Maps `(event, data)` to the throttle key.
+    """
+
+    def __init__(self, interval: float, key: Optional[KeyFunc] = None):
+        super().__init__(key)
+        self.interval = interval
+
+    def open(self, target: Target) -> Gate:
+        return _ThrottleGate(self, target)
+
+
+class _ThrottleGate(Gate):
+    def __init__(self, mode: Throttle, target: Target):
+        super().__init__(mode, target)
+        self._interval = mode.interval
+        # key -> [event, data, timer]; data is _EMPTY when nothing is waiting
+        self._windows: dict[Hashable, list] = {}
+
+    def push(self, event: str, data: Any) -> None:
+        key = self.key(event, data)
+        state = self._windows.get(key)
+        if state is not None:
+            state[0], state[1] = event, data
+            return
+        self._open(key)
+        self._deliver(event, data)
+
+    def _open(self, key: Hashable) -> None:
+        timer = asyncio.get_running_loop().call_later(self._interval, self._close_window, key)
+        self._windows[key] = [None, _EMPTY, timer]
+
+    def _close_window(self, key: Hashable) -> None:
+        event, data, _ = self._windows.pop(key)
+        if data is not _EMPTY:
+            self._open(key)
+            self._deliver(event, data)
+
+    def flush(self) -> None:
+        windows, self._windows = self._windows, {}
+        for event, data, timer in windows.values():
+            timer.cancel()
+            if data is not _EMPTY:
+                self._deliver(event, data)
+
+    def close(self) -> None:
+        for state in self._windows.values():
+            state[2].cancel()
+        self._windows.clear()
+
+
+class Coalesce(Delivery):
+    """
+    Accumulate notifications per key and deliver them as a list once `count` have arrived.
+
+    The observer is called with `notify(event, [data, ...])`.
+
+    Args:
+        count (int): Number of notifications per delivery.
+        max_wait (float, optional): Deliver a partial list once its first notification
+            has waited this many seconds.
+        key (callable, optional): Maps `(event, data)` to the grouping key.
+    """
+
+    def __init__(self, count: int, max_wait: Optional[float] = None, key: Optional[KeyFunc] = None):
+        if count < 1:
+            raise ValueError("count must be at least 1")
+        super().__init__(key)
+        self.count = count
+        self.max_wait = max_wait
+
+    def open(self, target: Target) -> Gate:
+        return _CoalesceGate(self, target)
+
+
+class _CoalesceGate(Gate):
+    def __init__(self, mode: Coalesce, target: Target):
+        super().__init__(mode, target)
+        self._count = mode.count
+        self._max_wait = mode.max_wait
+        # key -> [event, items, timer]
+        self._batches: dict[Hashable, list] = {}
+
+    def push(self, event: str, data: Any) -> None:
+        key = self.key(event, data)
+        batch = self._batches.get(key)
+        if batch is None:
+            timer = None
+            if self._max_wait is not None:
+                timer = asyncio.get_running_loop().call_later(self._max_wait, self._release, key)
+            batch = self._batches[key] = [event, [], timer]
+
+        batch[0] = event
+        batch[1].append(data)
+        if len(batch[1]) >= self._count:
+            self._release(key)
+
+    def _release(self, key: Hashable) -> None:
+        event, items, timer = self._batches.pop(key)
+        if timer is not None:
+            timer.cancel()
+        self._deliver(event, items)
+
+    def flush(self) -> None:
+        for key in list(self._batches):
+            self._release(key)
+
+    def close(self) -> None:
+        for _, _, timer in self._batches.values():
+            if timer is not None:
+                timer.cancel()
+        self._batches.clear()
+
+
+class Isolate(Delivery):
+    """
+    Give the observer its own bounded queue, consumed by a dedicated task.
+
+    `notify` and `notify_async` return as soon as the notification is queued,
+    so a slow observer only delays itself. Every notification is delivered,
+    in order, unless the queue overflows.
+
+    Args:
+        maxsize (int): Maximum number of queued notifications (0 means unbounded).
+        overflow (str): Policy when the queue is full:
+
+            - `"block"`: the producer waits for room (`notify_async` is held back,
+              `notify` queues up tracked tasks).
+            - `"drop_oldest"` / `"drop_newest"`: discard a notification.
+            - `"disconnect"`: remove the observer; notifications still queued are dropped.
+    """
+
+    def __init__(self, maxsize: int = 1024, overflow: str = "block"):
+        if overflow not in ISOLATE_OVERFLOW_POLICIES:
+            raise ValueError(f"Invalid overflow policy '{overflow}', expected one of {ISOLATE_OVERFLOW_POLICIES}")
+        super().__init__()
+        self.maxsize = maxsize
+        self.overflow = overflow
+
+    def open(self, target: Target) -> Gate:
+        return IsolatedGate(self, target)
+
+
+class IsolatedGate(Gate):
+    """
+    Queue and consumer task of an observer added with `Isolate`.
+
+    Attributes:
+        delivered (int): Notifications handed over to the observer so far.
+        disconnected (bool): True once the observer was removed because its queue overflowed.
+    """
+
+    def __init__(self, mode: Isolate, target: Target):
+        super().__init__(mode, target)
+        self._disconnect = mode.overflow == "disconnect"
+        policy = "block" if self._disconnect else mode.overflow
+        self._queue = EventStream(mode.maxsize, policy)
+        self._consumer: Optional[asyncio.Task] = None
+        # Loop of the consumer task, whose clock timestamps the queued notifications
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.delivered = 0
+        self.disconnected = False
+        if mode.maxsize and mode.overflow == "block":
+            self.push = self._put
+
+    @property
+    def depth(self) -> int:
+        """Number of notifications waiting in the queue."""
+        return len(self._queue)
+
+    @property
+    def lag(self) -> float:
+        """
+        Seconds the oldest queued notification has been waiting (0 when the queue is empty).
+
+        May be read from any thread.
+        """
+        oldest = self._queue.peek()
+        if oldest is None:
+            return 0.0
+        return self._loop.time() - oldest[2]
+
+    @property
+    def dropped(self) -> int:
+        """Notifications discarded by the overflow policy."""
+        return self._queue.dropped
+
+    def push(self, event: str, data: Any) -> None:
+        loop = self._start()
+        try:
+            self._queue.put_nowait((event, data, loop.time()))
+        except asyncio.QueueFull:
+            self.disconnected = True
+            self._target.unsubscribe()
+
+    async def _put(self, event: str, data: Any) -> None:
+        loop = self._start()
+        await self._queue.put((event, data, loop.time()))
+
+    def _start(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if self._consumer is None and not self._queue.closed:
+            self._loop = loop
+            self._consumer = loop.create_task(self._consume())
+        return loop
+
+    async def _consume(self) -> None:
+        call = self._target.call
+        async for event, data, _ in self._queue:
+            try:
+                result = call(event, data)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                asyncio.get_running_loop().call_exception_handler({
+                    "message": f"Exception in isolated observer for '{event}'",
+                    "exception": e,
+                })
+            self.delivered += 1
+
+    def flush(self) -> None:
+        # Notifications are handed over continuously by the consumer task
+        pass
+
+    def close(self) -> None:
+        self._queue.close()
+        if self._consumer is not None:
+            self._consumer.cancel()
+
+    async def join(self) -> None:
+        """Stop accepting notifications and wait until the queued ones are delivered."""
+        self._queue.close()
+        if self._consumer is not None:
+            await asyncio.gather(self._consumer, return_exceptions=True)
@@ -1,26 +1,95 @@
-from typing import Callable, Any
-import asyncio
+from typing import Callable, Any, Optional
 import inspect
 
+from ._dispatch import ListenerRegistry, FanOut, TaskRegistry, Subscription
+from .event_stream import EventStream
+
 
 class Event:
     """
     A lightweight event object that acts like a multicast delegate.
 
     Listeners can be added with `+=`, removed with `-=`, and all will be called
-    when the event is triggered like a function: `event(args...)`.
+    when the event is triggered like a function: `event(args...)`. `subscribe()`
+    offers more options and returns a handle that unsubscribes in constant time.
+
+    Supports both synchronous and asynchronous listeners. Listeners are
+    classified once when they are added or removed, not on every call.
 
-    Supports both synchronous and asynchronous listeners.
+    Args:
+        concurrent (bool): If True, async listeners are run concurrently by `call_async`.
+        max_concurrency (int, optional): Maximum number of async listeners running at once.
+        timeout (float, optional): Per-listener timeout (in seconds) for async listeners.
+        errors (str): `"raise"` (fail fast) or `"collect"` (run all, then raise `EmitError`).
+        max_pending (int, optional): Maximum number of async tasks started by `event(...)` in flight.
+        overflow (str): Policy once `max_pending` is reached: `"block"`, `"drop_oldest"`,
+            `"drop_newest"` or `"inline"` (see `TaskRegistry`).
+        max_backlog (int): Maximum number of calls queued by the `"block"` policy;
+            further calls are dropped.
     """
 
-    def __init__(self):
-        self._listeners: list[Callable[..., Any]] = []
+    def __init__(
+        self,
+        concurrent: bool = False,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        errors: str = "raise",
+        max_pending: Optional[int] = None,
+        overflow: str = "block",
+        max_backlog: int = 1024,
+    ):
+        self._listeners = ListenerRegistry()
+        fan_out = FanOut(concurrent, max_concurrency, timeout, errors)
+        self._fan_out = None if fan_out.is_default else fan_out
+        self._tasks = TaskRegistry(max_pending, overflow, max_backlog)
 
     def __iadd__(self, listener: Callable[..., Any]) -> "Event":
         """Add a listener to the event."""
-        self._listeners.append(listener)
+        self._listeners.add(listener)
         return self
 
+    def subscribe(
+        self,
+        listener: Callable[..., Any],
+        weak: bool = False,
+        once: bool = False,
+        priority: int = 0,
+    ) -> Subscription:
+        """
+        Add a listener to the event and return a `Subscription` handle.
+
+        Args:
+            listener (callable): Sync or async listener.
+            weak (bool): Only keep a weak reference to the listener (a `WeakMethod` for
+                bound methods); it is dropped automatically once garbage-collected.
+            once (bool): Remove the listener automatically after its first call.
+            priority (int): Listeners with a higher priority are called first.
+        """
+        return self._listeners.add(listener, weak=weak, once=once, priority=priority)
+
+    def stream(self, maxsize: int = 0, overflow: str = "block") -> EventStream:
+        """
+        Subscribe a bounded buffer to the event, to consume it with `async for`.
+
+        Each item is the single positional argument the event was called with, or a
+        tuple of the positional arguments if there are several. Keyword arguments
+        are not supported. Call `close()` on the stream (or use it as an async
+        context manager) to unsubscribe. See `EventStream` for the overflow policies.
+        """
+        subscription = None
+        stream = EventStream(maxsize, overflow, on_close=lambda: subscription.cancel())
+        put = stream.listener
+
+        if inspect.iscoroutinefunction(put):
+            async def listener(*args):
+                await put(args[0] if len(args) == 1 else args)
+        else:
+            def listener(*args):
+                put(args[0] if len(args) == 1 else args)
+
+        subscription = self._listeners.add(listener)
+        return stream
+
     def __isub__(self, listener: Callable[..., Any]) -> "Event":
         """Remove a listener from the event."""
         self._listeners.remove(listener)
@@ -30,11 +99,17 @@ class Event:
         """
         Call the event and notify all listeners.
 
-        Async listeners are scheduled using `asyncio.create_task()` (non-blocking).
+        Async listeners are scheduled as tracked tasks (non-blocking).
         """
-        for listener in self._listeners:
-            if inspect.iscoroutinefunction(listener):
-                asyncio.create_task(listener(*args, **kwargs))
+        plan = self._listeners.plan
+        if not plan.has_async:
+            for listener in plan.sync:
+                listener(*args, **kwargs)
+            return
+
+        for listener, is_async in plan.entries:
+            if is_async:
+                self._tasks.spawn(listener, args, kwargs)
             else:
                 listener(*args, **kwargs)
 
@@ -42,8 +117,25 @@ class Event:
         """
         Await all async listeners. Sync ones are called immediately.
         """
-        for listener in self._listeners:
-            if inspect.iscoroutinefunction(listener):
+        if self._fan_out is not None:
+            await self._fan_out.run(self._listeners.plan, args, kwargs)
+            return
+
+        for listener, is_async in self._listeners.plan.entries:
+            if is_async:
                 await listener(*args, **kwargs)
             else:
                 listener(*args, **kwargs)
+
+    @property
+    def tasks(self) -> TaskRegistry:
+        """Tracked tasks started by `event(...)`, with `pending`, `completed` and `failed` counters."""
+        return self._tasks
+
+    async def drain(self) -> None:
+        """Wait until every async listener scheduled by `event(...)` has finished."""
+        await self._tasks.drain()
+
+    async def aclose(self) -> None:
+        """Stop scheduling new async listeners and wait for outstanding ones."""
+        await self._tasks.aclose()
@@ -0,0 +1,193 @@
+from typing import Any, Iterable, Optional
+import asyncio
+import os
+import pickle
+import stat
+import struct
+
+from .event_emitter import EventEmitter
+
+
+# Frame layout: payload length (uint32), topic length (uint16), topic (utf-8), payload
+HEADER = struct.Struct("!IH")
+
+SERIALIZERS = ("pickle", "raw")
+
+
+class EventBridge:
+    """
+    Mirrors selected topics of an `EventEmitter` between processes on the same host.
+
+    Processes are connected over a Unix domain socket: one process calls `serve(path)`
+    and acts as the hub, the others call `connect(path)`. An event emitted locally on a
+    bridged topic is forwarded to every other connected process, where it is emitted
+    on that process's emitter. No broker or network access is required.
+
+    Outgoing events are framed in a compact binary format and written in batches,
+    once per event loop iteration.
+
+    Args:
+        emitter (EventEmitter): The local emitter to mirror.
+        topics (iterable of str): Exact event names to forward between processes.
+        serializer (str): `"pickle"` to send arbitrary picklable objects, or `"raw"`
+            to send bytes-like payloads as-is (received as `memoryview`, without copy).
+            Raw payloads are written at the end of the current loop iteration and must
+            not be mutated before then. All processes sharing a socket must use the
+            same serializer.
+    """
+
+    def __init__(self, emitter: EventEmitter, topics: Iterable[str], serializer: str = "pickle"):
+        if serializer not in SERIALIZERS:
+            raise ValueError(f"Invalid serializer '{serializer}', expected one of {SERIALIZERS}")
+
+        self._emitter = emitter
+        self._raw = serializer == "raw"
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._peers: dict[asyncio.StreamWriter, asyncio.Task] = {}
+        self._outbox: list[Any] = []
+        self._flush_scheduled = False
+        self._receiving: Optional[str] = None
+        self._path: Optional[str] = None
+
+        self.sent = 0
+        self.received = 0
+
+        self._topics = {topic: self._make_forwarder(topic) for topic in topics}
+        for topic, forwarder in self._topics.items():
+            emitter.on(topic, forwarder)
+
+    async def serve(self, path: str) -> None:
+        """
+        Listen on the Unix socket `path`, acting as the hub for other processes.
+
+        A stale socket left at `path` is replaced; any other file raises `FileExistsError`.
+        """
+        try:
+            mode = os.stat(path).st_mode
+        except FileNotFoundError:
+            pass
+        else:
+            if not stat.S_ISSOCK(mode):
+                raise FileExistsError(f"'{path}' exists and is not a socket")
+            os.unlink(path)
+        self._path = path
+        self._server = await asyncio.start_unix_server(self._add_peer, path=path)
+
+    async def connect(self, path: str) -> None:
+        """Connect to a hub listening on the Unix socket `path`."""
+        reader, writer = await asyncio.open_unix_connection(path)
+        await self._add_peer(reader, writer)
+
+    async def drain(self) -> None:
+        """Write out pending events and wait until the socket buffers have room again."""
+        self._flush()
+        for writer in list(self._peers):
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+
+    async def aclose(self) -> None:
+        """Stop forwarding events, write out every pending one and close every connection."""
+        for topic, forwarder in self._topics.items():
+            self._emitter.off(topic, forwarder)
+
+        self._flush()
+        peers = list(self._peers.items())
+        self._peers.clear()
+        # Hand every pending frame to the socket, still reading meanwhile so that
+        # two peers closing at once don't wait on each other's full buffers
+        await asyncio.gather(*(_flush_all(writer) for writer, _ in peers), return_exceptions=True)
+        for writer, task in peers:
+            task.cancel()
+            writer.close()
+        await asyncio.gather(*(writer.wait_closed() for writer, _ in peers), return_exceptions=True)
+        await asyncio.gather(*(task for _, task in peers), return_exceptions=True)
+
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            if self._path is not None and os.path.exists(self._path):
+                os.unlink(self._path)
+
+    async def __aenter__(self) -> "EventBridge":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def _make_forwarder(self, topic: str):
+        encoded = topic.encode()
+
+        def forward(data: Any) -> None:
+            # Don't echo back an event that was just received for this topic
+            if self._receiving == topic or not self._peers:
+                return
+            payload = data if self._raw else pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+            size = memoryview(payload).nbytes
+            self._outbox += (HEADER.pack(size, len(encoded)), encoded, payload)
+            self.sent += 1
+            if not self._flush_scheduled:
+                self._flush_scheduled = True
+                asyncio.get_running_loop().call_soon(self._flush)
+        return forward
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        if not self._outbox:
+            return
+        parts, self._outbox = self._outbox, []
+        for writer in self._peers:
+            writer.writelines(parts)
+
+    async def _add_peer(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._peers[writer] = asyncio.create_task(self._read_peer(reader, writer))
+
+    async def _read_peer(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                header = await reader.readexactly(HEADER.size)
+                payload_size, topic_size = HEADER.unpack(header)
+                body = await reader.readexactly(topic_size + payload_size)
+
+                # Relay to the other peers as-is when acting as the hub
+                if len(self._peers) > 1:
+                    for peer in self._peers:
+                        if peer is not writer:
+                            peer.writelines((header, body))
+
+                try:
+                    self._receive(body, topic_size)
+                except Exception as e:
+                    # A bad frame or a failing listener must not drop the connection
+                    asyncio.get_running_loop().call_exception_handler({
+                        "message": "Exception while receiving a bridged event",
+                        "exception": e,
+                    })
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._peers.pop(writer, None)
+            writer.close()
+
+    def _receive(self, body: bytes, topic_size: int) -> None:
+        topic = body[:topic_size].decode()
+        if topic not in self._topics:
+            return
+
+        payload = memoryview(body)[topic_size:]
+        data = payload if self._raw else pickle.loads(payload)
+        self.received += 1
+
+        self._receiving = topic
+        try:
+            self._emitter.emit(topic, data)
+        finally:
+            self._receiving = None
+
+
+async def _flush_all(writer: asyncio.StreamWriter) -> None:
+    """Wait until the write buffer of `writer` is empty, not just below its high-water mark."""
+    writer.transport.set_write_buffer_limits(high=0)
+    await writer.drain()
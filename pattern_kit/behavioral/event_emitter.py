@@ -1,38 +1,214 @@
-from collections import defaultdict
-from typing import Callable, Any
-import inspect
+from collections import defaultdict, deque
+from typing import Callable, Any, Optional
 import asyncio
+import threading
+
+from ._dispatch import ListenerRegistry, FanOut, TaskRegistry, DispatchPlan, PlanCache, Subscription, merge_plans
+from ._topics import TopicIndex
+from .event_stream import EventStream
+
+
+# Maximum number of concrete topics whose resolved plan is cached in wildcard mode
+TOPIC_CACHE_SIZE = 1024
 
 
 class EventEmitter:
     """
     A lightweight event emitter that supports both synchronous and asynchronous listeners.
+
+    Each event name keeps its own precompiled dispatch plan, rebuilt only when
+    its listeners change.
+
+    Args:
+        concurrent (bool): If True, async listeners are run concurrently by `emit_async`.
+        max_concurrency (int, optional): Maximum number of async listeners running at once.
+        timeout (float, optional): Per-listener timeout (in seconds) for async listeners.
+        errors (str): `"raise"` (fail fast) or `"collect"` (run all, then raise `EmitError`).
+        max_pending (int, optional): Maximum number of async tasks started by `emit()` in flight.
+        overflow (str): Policy once `max_pending` is reached: `"block"`, `"drop_oldest"`,
+            `"drop_newest"` or `"inline"` (see `TaskRegistry`).
+        max_backlog (int): Maximum number of calls queued by the `"block"` policy;
+            further calls are dropped.
+        wildcards (bool): If True, event names containing a `*` segment (exactly one
+            segment) or a `#` segment (zero or more segments) subscribe to every
+            matching topic, e.g. `orders.*.filled` or `orders.#`.
+        delimiter (str): Separator between topic segments in wildcard mode.
+        loop (asyncio.AbstractEventLoop, optional): Bind the emitter to an event loop.
+            `emit()` may then be called from any thread: events emitted outside the
+            loop are buffered and dispatched on the loop in batches.
     """
 
-    def __init__(self):
-        self._listeners: dict[str, list[Callable[[Any], Any]]] = defaultdict(list)
+    def __init__(
+        self,
+        concurrent: bool = False,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        errors: str = "raise",
+        max_pending: Optional[int] = None,
+        overflow: str = "block",
+        max_backlog: int = 1024,
+        wildcards: bool = False,
+        delimiter: str = ".",
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ):
+        self._lock = threading.Lock()
+        self._listeners: dict[str, ListenerRegistry] = defaultdict(self._new_registry)
+        self._patterns = TopicIndex(delimiter) if wildcards else None
+        self._topic_plans = PlanCache(TOPIC_CACHE_SIZE)
+        self._loop = loop
+        self._inbox: deque[tuple[str, Any]] = deque()
+        self._wakeup_pending = False
+        fan_out = FanOut(concurrent, max_concurrency, timeout, errors)
+        self._fan_out = None if fan_out.is_default else fan_out
+        self._tasks = TaskRegistry(max_pending, overflow, max_backlog)
 
-    def on(self, event: str, listener: Callable[[Any], Any]) -> None:
+    def on(
+        self,
+        event: str,
+        listener: Callable[[Any], Any],
+        weak: bool = False,
+        priority: int = 0,
+        once: bool = False,
+    ) -> Subscription:
         """
         Register a listener for a given event name.
+
+        Returns a `Subscription` whose `cancel()` removes the listener in constant time.
+
+        Args:
+            event (str): Event name (or pattern, in wildcard mode).
+            listener (callable): Sync or async listener.
+            weak (bool): Only keep a weak reference to the listener (a `WeakMethod` for
+                bound methods); it is dropped automatically once garbage-collected.
+            priority (int): Listeners with a higher priority are called first.
+            once (bool): Remove the listener automatically after its first call.
+        """
+        with self._lock:
+            if self._patterns is not None and self._patterns.is_pattern(event):
+                registry = self._patterns.registry(event, self._new_registry)
+            else:
+                registry = self._listeners[event]
+        return registry.add(listener, weak=weak, once=once, priority=priority)
+
+    def once(
+        self,
+        event: str,
+        listener: Callable[[Any], Any],
+        weak: bool = False,
+        priority: int = 0,
+    ) -> Subscription:
+        """
+        Register a listener that is removed automatically after its first call.
+        """
+        return self.on(event, listener, weak=weak, priority=priority, once=True)
+
+    def stream(self, event: str, maxsize: int = 0, overflow: str = "block") -> EventStream:
+        """
+        Subscribe a bounded buffer to an event, to consume it with `async for`.
+
+        Call `close()` on the stream (or use it as an async context manager) to
+        unsubscribe. See `EventStream` for the overflow policies.
+
+        Example:
+            async with emitter.stream("ticks", maxsize=1024, overflow="drop_oldest") as ticks:
+                async for tick in ticks:
+                    ...
         """
-        self._listeners[event].append(listener)
+        subscription = None
+        stream = EventStream(maxsize, overflow, on_close=lambda: subscription.cancel())
+        subscription = self.on(event, stream.listener)
+        return stream
 
     def off(self, event: str, listener: Callable[[Any], Any]) -> None:
         """
         Unregister a listener from a given event name.
         """
-        self._listeners[event].remove(listener)
+        with self._lock:
+            if self._patterns is not None and self._patterns.is_pattern(event):
+                registry = self._patterns.registry(event)
+                if registry is None:
+                    raise ValueError(f"No listeners registered for '{event}'")
+            else:
+                registry = self._listeners[event]
+        registry.remove(listener)
+
+    def _new_registry(self) -> ListenerRegistry:
+        if self._patterns is None:
+            return ListenerRegistry()
+        return ListenerRegistry(on_change=self._topic_plans.invalidate)
+
+    def _plan_for(self, event: str) -> Optional[DispatchPlan]:
+        """Return the dispatch plan for a concrete event name, or None if nobody listens."""
+        if self._patterns is None:
+            registry = self._listeners.get(event)
+            return None if registry is None else registry.plan
+
+        plan = self._topic_plans.get(event)
+        if plan is None:
+            version = self._topic_plans.version
+            with self._lock:
+                registries = self._patterns.match(event)
+                exact = self._listeners.get(event)
+            if exact is not None:
+                registries.append(exact)
+            plan = merge_plans(registries)
+            self._topic_plans.put(event, plan, version)
+        return plan
 
     def emit(self, event: str, data: Any = None) -> None:
         """
         Emit an event and notify all registered listeners.
 
-        Async listeners are scheduled using `asyncio.create_task()` (non-blocking).
+        Async listeners are scheduled as tracked tasks (non-blocking).
+
+        When the emitter is bound to a loop, this may be called from any thread;
+        events emitted outside the loop are dispatched on it shortly after.
         """
-        for listener in self._listeners.get(event, []):
-            if inspect.iscoroutinefunction(listener):
-                asyncio.create_task(listener(data))
+        if self._loop is not None and asyncio._get_running_loop() is not self._loop:
+            self._post(event, data)
+            return
+        self._dispatch(event, data)
+
+    def _post(self, event: str, data: Any) -> None:
+        """Buffer an event emitted off-loop, waking the loop once per batch."""
+        self._inbox.append((event, data))
+        if not self._wakeup_pending:
+            self._wakeup_pending = True
+            try:
+                self._loop.call_soon_threadsafe(self._drain_inbox)
+            except RuntimeError:
+                # Loop closed: don't leave later events waiting for a wakeup that never comes
+                self._wakeup_pending = False
+                raise
+
+    def _drain_inbox(self) -> None:
+        # Clear the flag before draining: an event appended after this point
+        # either gets drained below or schedules a new wakeup.
+        self._wakeup_pending = False
+        inbox = self._inbox
+        for _ in range(len(inbox)):
+            event, data = inbox.popleft()
+            try:
+                self._dispatch(event, data)
+            except Exception as e:
+                self._loop.call_exception_handler({
+                    "message": f"Exception in listener for '{event}'",
+                    "exception": e,
+                })
+
+    def _dispatch(self, event: str, data: Any) -> None:
+        plan = self._plan_for(event)
+        if plan is None:
+            return
+
+        if not plan.has_async:
+            for listener in plan.sync:
+                listener(data)
+            return
+
+        for listener, is_async in plan.entries:
+            if is_async:
+                self._tasks.spawn(listener, (data,), {})
             else:
                 listener(data)
 
@@ -40,8 +216,29 @@ class EventEmitter:
         """
         Emit an event and await all async listeners (sync ones are called normally).
         """
-        for listener in self._listeners.get(event, []):
-            if inspect.iscoroutinefunction(listener):
+        plan = self._plan_for(event)
+        if plan is None:
+            return
+
+        if self._fan_out is not None:
+            await self._fan_out.run(plan, (data,), {})
+            return
+
+        for listener, is_async in plan.entries:
+            if is_async:
                 await listener(data)
             else:
                 listener(data)
+
+    @property
+    def tasks(self) -> TaskRegistry:
+        """Tracked tasks started by `emit()`, with `pending`, `completed` and `failed` counters."""
+        return self._tasks
+
+    async def drain(self) -> None:
+        """Wait until every async listener scheduled by `emit()` has finished."""
+        await self._tasks.drain()
+
+    async def aclose(self) -> None:
+        """Stop scheduling new async listeners and wait for outstanding ones."""
+        await self._tasks.aclose()
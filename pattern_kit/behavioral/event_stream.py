@@ -0,0 +1,195 @@
+from collections import deque
+from typing import Any, Callable, Optional
+import asyncio
+
+
+STREAM_OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_newest")
+
+
+class EventStream:
+    """
+    A bounded buffer of emitted items, consumed with `async for`.
+
+    Streams are created by `Event.stream()` and `EventEmitter.stream()`. Each
+    stream has its own buffer, so a slow consumer only affects itself: once the
+    buffer is full, `overflow` decides what happens to new items.
+
+    Args:
+        maxsize (int): Maximum number of buffered items (0 means unbounded).
+        overflow (str): Policy when the buffer is full:
+
+            - `"block"`: the producer waits for room. `emit_async` / `call_async` are
+              held back; fire-and-forget emits queue up as tracked tasks.
+            - `"drop_oldest"`: discard the oldest buffered item.
+            - `"drop_newest"`: discard the incoming item.
+        on_close (callable, optional): Called once when the stream is closed.
+    """
+
+    def __init__(self, maxsize: int = 0, overflow: str = "block", on_close: Optional[Callable[[], Any]] = None):
+        if overflow not in STREAM_OVERFLOW_POLICIES:
+            raise ValueError(f"Invalid overflow policy '{overflow}', expected one of {STREAM_OVERFLOW_POLICIES}")
+
+        self._maxsize = maxsize
+        self._overflow = overflow
+        self._on_close = on_close
+        self._buffer: deque[Any] = deque()
+        self._getters: deque[asyncio.Future] = deque()
+        # Producers waiting for room, with the item they will hand over
+        self._putters: deque[tuple[asyncio.Future, Any]] = deque()
+        self._closed = False
+
+        self.dropped = 0
+
+    @property
+    def listener(self) -> Callable[[Any], Any]:
+        """The callable to subscribe: async for a bounded `"block"` stream, sync otherwise."""
+        return self.put if self._maxsize and self._overflow == "block" else self.put_nowait
+
+    @property
+    def closed(self) -> bool:
+        """True once `close()` has been called."""
+        return self._closed
+
+    def put_nowait(self, item: Any) -> None:
+        """Buffer an item, applying the overflow policy if the buffer is full."""
+        if self._closed:
+            return
+
+        if self._full():
+            if self._overflow == "drop_newest":
+                self.dropped += 1
+                return
+            if self._overflow == "drop_oldest":
+                self._buffer.popleft()
+                self.dropped += 1
+            else:
+                raise asyncio.QueueFull
+
+        self._buffer.append(item)
+        _wake_one(self._getters)
+
+    async def put(self, item: Any) -> None:
+        """Buffer an item, waiting for room if the buffer is full."""
+        if self._closed or not (self._putters or self._full()):
+            self.put_nowait(item)
+            return
+
+        # Queue behind producers already waiting; a consumer moves the item into
+        # the buffer when room frees up, so items keep their order.
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (waiter, item)
+        self._putters.append(entry)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if entry in self._putters:
+                self._putters.remove(entry)
+            raise
+
+    def _admit(self) -> None:
+        """Move items of waiting producers into the buffer while there is room."""
+        putters = self._putters
+        while putters and not self._full():
+            waiter, item = putters.popleft()
+            if waiter.done():
+                continue
+            self._buffer.append(item)
+            waiter.set_result(None)
+            _wake_one(self._getters)
+
+    def _full(self) -> bool:
+        return bool(self._maxsize) and len(self._buffer) >= self._maxsize
+
+    async def get(self) -> Any:
+        """Return the next item. Raises `EOFError` once the stream is closed and empty."""
+        while not self._buffer:
+            if self._closed:
+                raise EOFError("stream is closed")
+            await _wait(self._getters)
+
+        item = self._buffer.popleft()
+        if self._putters:
+            self._admit()
+        return item
+
+    async def get_batch(self, n: int) -> list[Any]:
+        """
+        Wait for at least one item, then return up to `n` buffered items at once.
+
+        Returns an empty list once the stream is closed and empty.
+        """
+        while not self._buffer:
+            if self._closed:
+                return []
+            await _wait(self._getters)
+
+        buffer = self._buffer
+        batch = [buffer.popleft() for _ in range(min(n, len(buffer)))]
+        if self._putters:
+            self._admit()
+        return batch
+
+    def peek(self, default: Any = None) -> Any:
+        """Return the oldest buffered item without removing it, or `default` if there is none."""
+        buffer = self._buffer
+        return buffer[0] if buffer else default
+
+    def close(self) -> None:
+        """Unsubscribe and stop accepting items. Buffered items can still be consumed."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._on_close is not None:
+            self._on_close()
+
+        while _wake_one(self._getters):
+            pass
+        # Items of producers still waiting for room are dropped
+        while self._putters:
+            waiter, _ = self._putters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self.dropped += 1
+
+    def __len__(self) -> int:
+        """Return the number of buffered items."""
+        return len(self._buffer)
+
+    def __aiter__(self) -> "EventStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        try:
+            return await self.get()
+        except EOFError:
+            raise StopAsyncIteration
+
+    async def __aenter__(self) -> "EventStream":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+
+async def _wait(waiters: deque) -> None:
+    waiter = asyncio.get_running_loop().create_future()
+    waiters.append(waiter)
+    try:
+        await waiter
+    except asyncio.CancelledError:
+        waiter.cancel()
+        # Pass the wake-up on if this waiter was woken and then cancelled
+        if waiter in waiters:
+            waiters.remove(waiter)
+        else:
+            _wake_one(waiters)
+        raise
+
+
+def _wake_one(waiters: deque) -> bool:
+    while waiters:
+        waiter = waiters.popleft()
+        if not waiter.done():
+            waiter.set_result(None)
+            return True
+    return False
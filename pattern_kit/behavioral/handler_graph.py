@@ -0,0 +1,157 @@
+from typing import Any, Iterable, NamedTuple, Optional, Union
+import asyncio
+
+from .handler_pipeline import Handler, AsyncHandler, StopPipeline, Stage, compile_stage
+
+
+class _Node(NamedTuple):
+    name: str
+    handler: Union[Handler, AsyncHandler]
+    stage: Stage
+    needs: tuple[str, ...]
+
+
+class HandlerGraph:
+    """
+    A directed acyclic graph of handlers.
+
+    Every handler receives the graph's input, plus the results of the handlers it
+    `needs` as keyword arguments named after them. Handlers only depend on handlers
+    added before them, so the graph can never contain a cycle.
+
+    `run_async()` starts each handler as soon as the handlers it needs are done:
+    independent branches run concurrently, and a handler needing several branches
+    acts as the join step merging their outputs.
+
+    The result of a run is the result of the handler nothing else needs, or a dict
+    of such results by name when there are several. A handler raising `StopPipeline`
+    stops every branch, and its `result` is returned instead. A handler whose
+    `can_handle` returns False is skipped, and its result is None.
+
+    Example:
+        graph = HandlerGraph()
+        graph.add("geo", GeoLookup())
+        graph.add("user", UserLookup())
+        graph.add("fraud", FraudScore(), needs=["geo", "user"])  # handle(data, geo, user)
+
+        score = await graph.run_async(request)
+    """
+
+    def __init__(self):
+        self._nodes: dict[str, _Node] = {}
+        self._outputs: list[str] = []
+        self._has_async = False
+
+    def add(
+        self,
+        name: str,
+        handler: Union[Handler, AsyncHandler],
+        needs: Optional[Iterable[str]] = None,
+    ) -> None:
+        """
+        Add a handler to the graph.
+
+        Args:
+            name (str): Name of the handler's result, unique in the graph.
+            handler (Handler | AsyncHandler): The handler to add.
+            needs (iterable of str, optional): Names of previously added handlers whose
+                results this handler receives as keyword arguments. Defaults to the
+                handler's `needs` attribute.
+        """
+        if name in self._nodes:
+            raise ValueError(f"A handler named '{name}' is already in the graph")
+        if needs is None:
+            needs = getattr(handler, "needs", None) or ()
+        needs = tuple(needs)
+        unknown = [need for need in needs if need not in self._nodes]
+        if unknown:
+            raise ValueError(f"'{name}' needs unknown handlers: {', '.join(unknown)}")
+
+        stage = compile_stage(handler)
+        self._nodes[name] = _Node(name, handler, stage, needs)
+        self._changed()
+
+    def remove(self, name: str) -> None:
+        """Remove a handler. Raises `ValueError` if another handler needs it."""
+        if name not in self._nodes:
+            raise ValueError(f"No handler named '{name}' in the graph")
+        dependents = [node.name for node in self._nodes.values() if name in node.needs]
+        if dependents:
+            raise ValueError(f"'{name}' is needed by: {', '.join(dependents)}")
+        del self._nodes[name]
+        self._changed()
+
+    def _changed(self) -> None:
+        needed = {need for node in self._nodes.values() for need in node.needs}
+        self._outputs = [name for name in self._nodes if name not in needed]
+        self._has_async = any(node.stage[2] for node in self._nodes.values())
+
+    @property
+    def outputs(self) -> list[str]:
+        """Names of the handlers whose results are returned (those nothing else needs)."""
+        return list(self._outputs)
+
+    def run(self, data: Any, **kwargs) -> Any:
+        """
+        Run the graph, one handler after another in the order they were added.
+        """
+        results: dict[str, Any] = {}
+        try:
+            for node in self._nodes.values():
+                results[node.name] = _call(node, data, results, kwargs)
+        except StopPipeline as stop:
+            return stop.result
+        return self._output(results)
+
+    async def run_async(self, data: Any, **kwargs) -> Any:
+        """
+        Run the graph asynchronously, running independent branches concurrently.
+        """
+        if not self._has_async:
+            return self.run(data, **kwargs)
+
+        results: dict[str, Any] = {}
+        tasks: dict[str, asyncio.Task] = {}
+
+        async def run_node(node: _Node, needed: list[asyncio.Task]) -> None:
+            if needed:
+                await asyncio.gather(*needed)
+            result = _call(node, data, results, kwargs)
+            if node.stage[2] and result is not None:
+                result = await result
+            results[node.name] = result
+
+        loop = asyncio.get_running_loop()
+        for node in self._nodes.values():
+            needed = [tasks[need] for need in node.needs]
+            tasks[node.name] = loop.create_task(run_node(node, needed))
+
+        try:
+            done, _ = await asyncio.wait(tasks.values(), return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()
+        except StopPipeline as stop:
+            return stop.result
+        finally:
+            # Stop the other branches and consume their outcome
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+        return self._output(results)
+
+    def _output(self, results: dict[str, Any]) -> Any:
+        outputs = self._outputs
+        if len(outputs) == 1:
+            return results[outputs[0]]
+        return {name: results[name] for name in outputs}
+
+
+def _call(node: _Node, data: Any, results: dict[str, Any], kwargs: dict) -> Any:
+    """Call a node's handler with the results it needs. Returns None if it is skipped."""
+    handle, can_handle, _ = node.stage
+    if node.needs:
+        kwargs = {**kwargs, **{need: results[need] for need in node.needs}}
+    if can_handle is not None and not can_handle(data, **kwargs):
+        return None
+    return handle(data, **kwargs)
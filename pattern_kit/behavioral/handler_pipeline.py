@@ -1,6 +1,15 @@
 from abc import ABC, abstractmethod
-from typing import Any, Union
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, AsyncIterable, Callable, Iterable, NamedTuple, Optional, Sequence, Union
+import asyncio
+import functools
 import inspect
+import itertools
+import pickle
+import time
+
+from ..utils.latency import LatencyRecorder
+from ..utils.result_cache import ResultCache
 
 class StopPipeline(Exception):
     """
@@ -11,12 +20,29 @@ class StopPipeline(Exception):
         super().__init__()
         self.result = result
 
+    def __reduce__(self):
+        # Keep `result` when raised from a handler running in a process pool
+        return type(self), (self.result,)
+
 class Handler(ABC):
     """
     Base handler class for use in a HandlerPipeline.
     Override `can_handle()` and `handle()` as needed.
+
+    Handlers may also implement `handle_batch(items, **kwargs)`, returning one
+    result per item, to process whole batches in `run_many()`.
+
+    Set `executor` to `"thread"`, `"process"` or a `concurrent.futures.Executor`
+    to run the handler off the event loop in the async paths (see
+    `HandlerPipeline.add_handler`).
+
+    Set `handles` to the input types (or routing keys) the handler accepts,
+    to let the pipeline skip it for other inputs without calling it.
     """
 
+    executor: Union[str, Executor, None] = None
+    handles: Optional[tuple[Any, ...]] = None
+
     def can_handle(self, data: Any, **kwargs) -> bool:
         """Override if you want filtering behavior. Default: always handle."""
         return True
@@ -30,8 +56,16 @@ class AsyncHandler(ABC):
     """
     Base handler class for use in a HandlerPipeline.
     Override `can_handle()` and `handle()` as needed.
+
+    Handlers may also implement `async handle_batch(items, **kwargs)`, returning
+    one result per item, to process whole batches in `run_many_async()`.
+
+    Set `handles` to the input types (or routing keys) the handler accepts,
+    to let the pipeline skip it for other inputs without calling it.
     """
 
+    handles: Optional[tuple[Any, ...]] = None
+
     def can_handle(self, data: Any, **kwargs) -> bool:
         """Override if you want filtering behavior. Default: always handle."""
         return True
@@ -42,29 +76,516 @@ class AsyncHandler(ABC):
         pass
 
 
+# (handle, can_handle or None when the default always-True one is inherited, is_async)
+Stage = tuple[Callable[..., Any], Optional[Callable[..., bool]], bool]
+
+# (handle_batch, is_async), or None when the handler has no `handle_batch`
+BatchStage = Optional[tuple[Callable[..., Any], bool]]
+
+EXECUTORS = ("thread", "process")
+
+TIMEOUT_POLICIES = ("raise", "skip", "fallback")
+
+# Maximum number of input types (or routing keys) whose route is cached
+ROUTE_CACHE_SIZE = 1024
+
+
+class PipelinePlan(NamedTuple):
+    """
+    Handlers of a pipeline, compiled for execution.
+
+    `handles` holds the bound `handle` methods alone, so that a pipeline
+    without any `can_handle` filter is walked without per-stage branching.
+    `batches` lines up with `stages` and holds each handler's `handle_batch`.
+
+    `async_stages` and `async_batches` are the variants used by the async paths,
+    where handlers bound to an executor are wrapped into coroutines awaiting
+    the executor; `offloaded` flags those stages.
+    """
+    stages: tuple[Stage, ...]
+    handles: tuple[Callable[..., Any], ...]
+    filtered: bool
+    has_async: bool
+    batches: tuple[BatchStage, ...]
+    async_stages: tuple[Stage, ...]
+    async_batches: tuple[BatchStage, ...]
+    offloaded: tuple[bool, ...]
+
+
+_DEFAULT_CAN_HANDLE = (Handler.can_handle, AsyncHandler.can_handle)
+
+
+def compile_stage(handler: Union[Handler, AsyncHandler]) -> Stage:
+    """Resolve and classify a handler once."""
+    handle = handler.handle
+    can_handle = handler.can_handle
+    if getattr(can_handle, "__func__", None) in _DEFAULT_CAN_HANDLE:
+        can_handle = None
+    return handle, can_handle, inspect.iscoroutinefunction(handle)
+
+
+def compile_batch_stage(handler: Union[Handler, AsyncHandler]) -> BatchStage:
+    handle_batch = getattr(handler, "handle_batch", None)
+    if handle_batch is None:
+        return None
+    return handle_batch, inspect.iscoroutinefunction(handle_batch)
+
+
+def make_plan(
+    stages: Sequence[Stage],
+    batches: Sequence[BatchStage],
+    async_stages: Sequence[Stage],
+    async_batches: Sequence[BatchStage],
+    offloaded: Sequence[bool],
+) -> PipelinePlan:
+    return PipelinePlan(
+        tuple(stages),
+        tuple(handle for handle, _, _ in stages),
+        any(can_handle is not None for _, can_handle, _ in stages),
+        any(is_async for _, _, is_async in async_stages),
+        tuple(batches),
+        tuple(async_stages),
+        tuple(async_batches),
+        tuple(offloaded),
+    )
+
+
+def declared_routes(handler: Union[Handler, AsyncHandler]) -> Optional[tuple[Any, ...]]:
+    """Return the types (or keys) a handler declared in `handles`, or None."""
+    handles = getattr(handler, "handles", None)
+    if handles is None:
+        return None
+    if isinstance(handles, (type, str)) or not isinstance(handles, Iterable):
+        return (handles,)
+    return tuple(handles)
+
+
+def _routed_can_handle(
+    routes: tuple[Any, ...],
+    route_key: Optional[Callable[[Any], Any]],
+    can_handle: Optional[Callable[..., bool]],
+) -> Callable[..., bool]:
+    """Combine a handler's declared routes with its own `can_handle`, if any."""
+    if route_key is None:
+        matches: dict[type, bool] = {}
+
+        def accepts(data: Any) -> bool:
+            cls = type(data)
+            match = matches.get(cls)
+            if match is None:
+                match = matches[cls] = issubclass(cls, routes)
+            return match
+    else:
+        keys = frozenset(routes)
+
+        def accepts(data: Any) -> bool:
+            return route_key(data) in keys
+
+    if can_handle is None:
+        return lambda data, **kwargs: accepts(data)
+    return lambda data, **kwargs: accepts(data) and can_handle(data, **kwargs)
+
+
+class _Router:
+    """
+    Index from declared input types (or keys) to the stages accepting them.
+
+    `route()` returns a plan reduced to the stages that apply to an input,
+    cached per concrete input type (or key).
+    """
+
+    def __init__(self, plan: PipelinePlan, routes: list[Optional[tuple[Any, ...]]], route_key: Optional[Callable[[Any], Any]]):
+        self._plan = plan
+        self._route_key = route_key
+        self._index: dict[Any, list[int]] = {}
+        self._always = [i for i, declared in enumerate(routes) if declared is None]
+        for i, declared in enumerate(routes):
+            for route in declared or ():
+                self._index.setdefault(route, []).append(i)
+        self._routes: dict[Any, PipelinePlan] = {}
+
+    def route(self, data: Any) -> PipelinePlan:
+        key = type(data) if self._route_key is None else self._route_key(data)
+        plan = self._routes.get(key)
+        if plan is None:
+            plan = self._routes[key] = self._select(key)
+            if len(self._routes) > ROUTE_CACHE_SIZE:
+                self._routes.pop(next(iter(self._routes)))
+        return plan
+
+    def _select(self, key: Any) -> PipelinePlan:
+        selected = set(self._always)
+        # Walk the MRO so that handlers declared for a base class also apply
+        for route in (key.__mro__ if self._route_key is None else (key,)):
+            selected.update(self._index.get(route, ()))
+
+        plan = self._plan
+        indices = sorted(selected)
+        return make_plan(
+            [plan.stages[i] for i in indices],
+            [plan.batches[i] for i in indices],
+            [plan.async_stages[i] for i in indices],
+            [plan.async_batches[i] for i in indices],
+            [plan.offloaded[i] for i in indices],
+        )
+
+
+def memoize(handle: Callable[..., Any], is_async: bool, cache: ResultCache) -> Callable[..., Any]:
+    """Wrap a handler's `handle` so that its results are served from `cache`."""
+    key = cache.key
+    if is_async:
+        @functools.wraps(handle)
+        async def call(data, **kwargs):
+            return await cache.call_async(key(data, kwargs), lambda: handle(data, **kwargs))
+    else:
+        @functools.wraps(handle)
+        def call(data, **kwargs):
+            return cache.call(key(data, kwargs), lambda: handle(data, **kwargs))
+    return call
+
+
+def offload(fn: Callable[..., Any], executor: Optional[Executor]) -> Callable[..., Any]:
+    """Wrap a sync callable into a coroutine function running it in `executor`."""
+    @functools.wraps(fn)
+    async def call(*args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+    return call
+
+
+# Returned by a stage whose timeout fired with `on_timeout="skip"`
+_SKIPPED = object()
+
+
+def timed(handle: Callable[..., Any], is_async: bool, recorder: LatencyRecorder) -> Callable[..., Any]:
+    """Wrap a handler's `handle` so that the duration of every completed call is recorded."""
+    record = recorder.record
+    clock = time.perf_counter
+    if is_async:
+        @functools.wraps(handle)
+        async def call(data, **kwargs):
+            started = clock()
+            try:
+                result = await handle(data, **kwargs)
+            except asyncio.CancelledError:
+                # Cut short by a timeout or a faster hedge: the duration is unknown
+                raise
+            except BaseException:
+                record(clock() - started)
+                raise
+            record(clock() - started)
+            return result
+    else:
+        @functools.wraps(handle)
+        def call(data, **kwargs):
+            started = clock()
+            try:
+                return handle(data, **kwargs)
+            finally:
+                record(clock() - started)
+    return call
+
+
+def hedged(handle: Callable[..., Any], delay: float) -> Callable[..., Any]:
+    """
+    Wrap an async `handle` so that a duplicate call starts if the first one
+    has not finished after `delay` seconds; the first outcome wins.
+
+    A call failing while the other one is still running does not win: its
+    error is only raised if the other call fails too.
+    """
+    @functools.wraps(handle)
+    async def call(data, **kwargs):
+        first = asyncio.ensure_future(handle(data, **kwargs))
+        calls = [first]
+        try:
+            done, _ = await asyncio.wait(calls, timeout=delay)
+            if done:
+                return first.result()
+
+            calls.append(asyncio.ensure_future(handle(data, **kwargs)))
+            pending = set(calls)
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is None or isinstance(error, StopPipeline):
+                        return task.result()
+                if not pending:
+                    # Both calls failed
+                    return first.result()
+        finally:
+            for task in calls:
+                _discard(task)
+    return call
+
+
+def _discard(task: asyncio.Future) -> None:
+    """Cancel a call whose outcome is not needed, without reporting its exception as unretrieved."""
+    if task.done():
+        if not task.cancelled():
+            task.exception()
+    else:
+        task.cancel()
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+def guard(handle: Callable[..., Any], timeout: float, on_timeout: str, fallback: Any) -> Callable[..., Any]:
+    """Wrap an async `handle` into a coroutine function bounded by `timeout` seconds."""
+    @functools.wraps(handle)
+    async def call(data, **kwargs):
+        try:
+            return await asyncio.wait_for(handle(data, **kwargs), timeout)
+        except asyncio.TimeoutError:
+            if on_timeout == "raise":
+                raise
+            return _SKIPPED if on_timeout == "skip" else fallback
+    return call
+
+
 class HandlerPipeline:
     """
     A configurable pipeline of handlers.
 
+    Handlers are resolved and classified once, into a `PipelinePlan` that is
+    rebuilt only after handlers are added or removed: the inherited always-True
+    `can_handle` is skipped, and pipelines without async handlers run through
+    a plain sync loop.
+
+    Handlers declaring `handles` are indexed by type (walking the input type's
+    MRO) or by routing key, so that `run()` only visits the handlers that apply
+    to an input. Routes are cached per input type or key. With `pass_result=True`,
+    the input changes from stage to stage, so each routed stage checks its
+    (cached) types instead.
+
     Args:
         pass_result (bool): If True, result of each handler is passed to the next handler.
+        route_key (callable, optional): Maps an input to the key matched against the
+            handlers' `handles`. By default, `handles` lists types matched with the
+            input's type and its base classes.
+        cache (ResultCache, optional): Memoize the results of `run()` and `run_async()`.
+        deadline (float, optional): Maximum duration of a `run_async()` call, in seconds.
+            Once it elapses, the running handler is cancelled and `asyncio.TimeoutError`
+            is raised.
+        record_latency (bool): Record the latency of every handler (see `latency()`).
+            Handlers with a `timeout` or `hedge` are always recorded.
     """
 
-    def __init__(self, pass_result: bool = False):
+    def __init__(
+        self,
+        pass_result: bool = False,
+        route_key: Optional[Callable[[Any], Any]] = None,
+        cache: Optional[ResultCache] = None,
+        deadline: Optional[float] = None,
+        record_latency: bool = False,
+    ):
         self._handlers: list[Union[Handler, AsyncHandler]] = []
+        self._cache = cache
+        self.deadline = deadline
+        self._record_latency = record_latency
+        self._caches: dict[int, ResultCache] = {}
+        # id(handler) -> (timeout, on_timeout, fallback, hedge)
+        self._guards: dict[int, tuple[Optional[float], str, Any, Optional[float]]] = {}
+        self._latency: dict[int, LatencyRecorder] = {}
+        self._executors: dict[int, Union[str, Executor]] = {}
+        self._process_pool: Optional[ProcessPoolExecutor] = None
         self._pass_result = pass_result
+        self._route_key = route_key
+        self._plan: Optional[PipelinePlan] = None
+        self._router: Optional[_Router] = None
 
-    def add_handler(self, handler: Union[Handler, AsyncHandler]) -> None:
+    def add_handler(
+        self,
+        handler: Union[Handler, AsyncHandler],
+        executor: Union[str, Executor, None] = None,
+        cache: Optional[ResultCache] = None,
+        timeout: Optional[float] = None,
+        on_timeout: str = "raise",
+        fallback: Any = None,
+        hedge: Optional[float] = None,
+    ) -> None:
         """
         Add an handler.
+
+        Args:
+            handler (Handler | AsyncHandler): The handler to add.
+            executor (str | Executor, optional): Run the (sync) handler off the event loop
+                in `run_async()`, `run_many_async()` and `stream()`: `"thread"` for the
+                loop's default thread pool, `"process"` for a process pool owned by the
+                pipeline (see `close()`), or any `concurrent.futures.Executor`.
+                Defaults to the handler's `executor` attribute. `run()` and `run_many()`
+                always call the handler inline.
+            cache (ResultCache, optional): Memoize the handler's results. Concurrent
+                async calls with the same key share one computation. `handle_batch`
+                calls are not cached.
+            timeout (float, optional): Maximum duration of a `handle` call in the async
+                paths, in seconds.
+            on_timeout (str): What happens when `timeout` fires: `"raise"` raises
+                `asyncio.TimeoutError`, `"skip"` skips the handler as if `can_handle`
+                had returned False, and `"fallback"` uses `fallback` as its result.
+            fallback (any): Result of a call that timed out, with `on_timeout="fallback"`.
+            hedge (float, optional): For idempotent handlers: start a duplicate call if
+                the first one has not finished after this many seconds, and use
+                whichever finishes first. `latency()` helps choosing the delay, e.g.
+                the handler's 95th percentile.
+
+        Timeouts and hedging need the handler to run off the loop's thread: they
+        require an async handler or an `executor`, and do not apply to `run()`,
+        `run_many()` or `handle_batch` calls.
         """
+        routes = declared_routes(handler)
+        if routes is not None and self._route_key is None:
+            if not all(isinstance(route, type) for route in routes):
+                raise TypeError("handles must list types, unless the pipeline has a route_key")
+
+        if executor is None:
+            executor = getattr(handler, "executor", None)
+        if executor is not None:
+            self._check_executor(handler, executor)
+        guarded = timeout is not None or hedge is not None
+        if guarded:
+            self._check_guard(handler, executor, on_timeout)
+
+        if executor is not None:
+            self._executors[id(handler)] = executor
+        if cache is not None:
+            self._caches[id(handler)] = cache
+        if guarded:
+            self._guards[id(handler)] = (timeout, on_timeout, fallback, hedge)
+        if guarded or self._record_latency:
+            self._latency.setdefault(id(handler), LatencyRecorder())
         self._handlers.append(handler)
+        self._plan = None
 
     def remove_handler(self, handler: Union[Handler, AsyncHandler]) -> None:
         """
         Remove an handler.
         """
         self._handlers.remove(handler)
+        if handler not in self._handlers:
+            self._executors.pop(id(handler), None)
+            self._caches.pop(id(handler), None)
+            self._guards.pop(id(handler), None)
+            self._latency.pop(id(handler), None)
+        self._plan = None
+
+    def _check_executor(self, handler: Union[Handler, AsyncHandler], executor: Union[str, Executor]) -> None:
+        if not isinstance(executor, Executor) and executor not in EXECUTORS:
+            raise ValueError(f"Invalid executor '{executor}', expected one of {EXECUTORS} or an Executor")
+        if inspect.iscoroutinefunction(handler.handle):
+            raise ValueError("Async handlers run on the event loop and cannot use an executor")
+
+        # Process-bound handlers are pickled with every call; fail now rather than mid-run
+        if executor == "process" or isinstance(executor, ProcessPoolExecutor):
+            try:
+                pickle.dumps(handler)
+            except Exception as e:
+                raise TypeError(f"{handler!r} must be picklable to run in a process pool") from e
+
+    def _check_guard(self, handler: Union[Handler, AsyncHandler], executor: Union[str, Executor, None], on_timeout: str) -> None:
+        if on_timeout not in TIMEOUT_POLICIES:
+            raise ValueError(f"Invalid on_timeout policy '{on_timeout}', expected one of {TIMEOUT_POLICIES}")
+        # A sync handler running on the loop's thread cannot be interrupted
+        if executor is None and not inspect.iscoroutinefunction(handler.handle):
+            raise ValueError("timeout and hedge require an async handler or an executor")
+
+    def latency(self, handler: Union[Handler, AsyncHandler]) -> Optional[LatencyRecorder]:
+        """
+        Return the latencies recorded for a handler, or None if they are not recorded.
+
+        Every completed `handle` call is recorded, cache hits excepted. Calls cut
+        short by a timeout or a faster hedge are not.
+        """
+        return self._latency.get(id(handler))
+
+    def _resolve_executor(self, handler: Union[Handler, AsyncHandler]) -> Union[Executor, None, bool]:
+        """Return the executor of `handler` (None for the default thread pool), or False if it runs inline."""
+        executor = self._executors.get(id(handler))
+        if executor is None:
+            return False
+        if executor == "thread":
+            return None
+        if executor == "process":
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor()
+            return self._process_pool
+        return executor
+
+    def close(self) -> None:
+        """Shut down the process pool started for `executor="process"` handlers, if any."""
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
+            self._process_pool = None
+        self._plan = None
+
+    def compile(self) -> PipelinePlan:
+        """
+        Build the execution plan now.
+
+        Called automatically on the next run after handlers are added or removed;
+        call it explicitly after replacing `handle` or `can_handle` on a handler
+        that is already in the pipeline.
+        """
+        stages = [compile_stage(handler) for handler in self._handlers]
+        batches = [compile_batch_stage(handler) for handler in self._handlers]
+        executors = [self._resolve_executor(handler) for handler in self._handlers]
+        caches = [self._caches.get(id(handler)) for handler in self._handlers]
+
+        async_stages, async_batches = [], []
+        for i, (handler, (handle, can_handle, is_async), batch, executor, cache) in enumerate(
+            zip(self._handlers, stages, batches, executors, caches)
+        ):
+            if executor is False:
+                async_handle, async_is_async = handle, is_async
+                async_batches.append(batch)
+            else:
+                async_handle, async_is_async = offload(handle, executor), True
+                async_batches.append(None if batch is None else (offload(batch[0], executor), True))
+
+            recorder = self._latency.get(id(handler))
+            if recorder is not None:
+                handle = timed(handle, is_async, recorder)
+                async_handle = timed(async_handle, async_is_async, recorder)
+
+            timeout, on_timeout, fallback, hedge = self._guards.get(id(handler), (None, "raise", None, None))
+            if hedge is not None:
+                async_handle = hedged(async_handle, hedge)
+            if cache is not None:
+                handle = memoize(handle, is_async, cache)
+                async_handle = memoize(async_handle, async_is_async, cache)
+            # Outside the cache, so that fallbacks and skips are not cached
+            if timeout is not None:
+                async_handle = guard(async_handle, timeout, on_timeout, fallback)
+
+            stages[i] = (handle, can_handle, is_async)
+            async_stages.append((async_handle, can_handle, async_is_async))
+
+        offloaded = [executor is not False for executor in executors]
+        routes = [declared_routes(handler) for handler in self._handlers]
+        if all(declared is None for declared in routes):
+            self._router = None
+            plan = self._plan = make_plan(stages, batches, async_stages, async_batches, offloaded)
+            return plan
+
+        # Routed plans only contain matching stages, so they keep the handlers'
+        # own `can_handle`; the full plan checks the declared types per stage.
+        unrouted = make_plan(stages, batches, async_stages, async_batches, offloaded)
+        self._router = _Router(unrouted, routes, self._route_key)
+
+        def route(stage: Stage, declared: Optional[tuple[Any, ...]]) -> Stage:
+            if declared is None:
+                return stage
+            handle, can_handle, is_async = stage
+            return handle, _routed_can_handle(declared, self._route_key, can_handle), is_async
+
+        plan = self._plan = make_plan(
+            [route(stage, declared) for stage, declared in zip(stages, routes)],
+            batches,
+            [route(stage, declared) for stage, declared in zip(async_stages, routes)],
+            async_batches,
+            offloaded,
+        )
+        return plan
 
     def __iadd__(self, handler: Union[Handler, AsyncHandler]):
         """Add handler using `+=` operator."""
@@ -80,18 +601,41 @@ class HandlerPipeline:
         """
         Run the pipeline.
         """
-        result = current = data
-        try:
-            for handler in self._handlers:
-                if handler.can_handle(current, **kwargs):
-                    result = handler.handle(current, **kwargs)
-
-                    if self._pass_result:
-                        current = result
+        cache = self._cache
+        if cache is not None:
+            return cache.call(cache.key(data, kwargs), lambda: self._execute(data, kwargs))
+        return self._execute(data, kwargs)
 
+    def _execute(self, data: Any, kwargs: dict) -> Any:
+        plan = self._plan
+        if plan is None:
+            plan = self.compile()
+        if self._router is not None and not self._pass_result:
+            plan = self._router.route(data)
+        try:
+            return self._run_sync(plan, data, kwargs)
         except StopPipeline as stop:
             return stop.result
 
+    def _run_sync(self, plan: PipelinePlan, data: Any, kwargs: dict) -> Any:
+        result = current = data
+
+        if not kwargs and not plan.filtered:
+            if self._pass_result:
+                for handle in plan.handles:
+                    current = handle(current)
+                return current
+            for handle in plan.handles:
+                result = handle(data)
+            return result
+
+        for handle, can_handle, _ in plan.stages:
+            if can_handle is None or can_handle(current, **kwargs):
+                result = handle(current, **kwargs)
+
+                if self._pass_result:
+                    current = result
+
         return result
 
     async def run_async(self, data: Any, **kwargs) -> Any:
@@ -99,21 +643,454 @@ class HandlerPipeline:
         Run the pipeline asynchronously.
         Supports both sync and async handlers transparently.
         """
+        cache = self._cache
+        if cache is not None:
+            return await cache.call_async(cache.key(data, kwargs), lambda: self._execute_async(data, kwargs))
+        return await self._execute_async(data, kwargs)
+
+    async def _execute_async(self, data: Any, kwargs: dict) -> Any:
+        plan = self._plan
+        if plan is None:
+            plan = self.compile()
+        if self._router is not None and not self._pass_result:
+            plan = self._router.route(data)
+        try:
+            if not plan.has_async:
+                return self._run_sync(plan, data, kwargs)
+            if self.deadline is not None:
+                return await asyncio.wait_for(self._run_async(plan, data, kwargs), self.deadline)
+            return await self._run_async(plan, data, kwargs)
+        except StopPipeline as stop:
+            return stop.result
+
+    async def _run_async(self, plan: PipelinePlan, data: Any, kwargs: dict) -> Any:
         result = current = data
 
+        for handle, can_handle, is_async in plan.async_stages:
+            if can_handle is None or can_handle(current, **kwargs):
+                if is_async:
+                    output = await handle(current, **kwargs)
+                    if output is _SKIPPED:
+                        continue
+                    result = output
+                else:
+                    result = handle(current, **kwargs)
+
+                if self._pass_result:
+                    current = result
+
+        return result
+
+    def run_many(self, items: Iterable[Any], batch_size: int = 1024, **kwargs) -> list[Any]:
+        """
+        Run the pipeline over many inputs, one batch of `batch_size` items at a time.
+
+        Returns one result per input, in order, as `run()` would have returned it.
+        Each stage processes the whole batch before the next one starts: handlers
+        implementing `handle_batch(items, **kwargs)` receive the batch at once,
+        others are called once per item.
+
+        `can_handle` and `StopPipeline` apply to individual items: a stopped item
+        skips the remaining stages, while the rest of the batch carries on. A
+        `handle_batch` can stop single items by returning a `StopPipeline` instance
+        in place of their result, or stop the whole batch by raising it.
+        """
+        plan = self._plan
+        if plan is None:
+            plan = self.compile()
+
+        results = []
+        for batch in _chunks(items, batch_size):
+            run = _BatchRun(batch, self._pass_result)
+            for stage, batch_stage in zip(plan.stages, plan.batches):
+                selected = run.select(stage[1], kwargs)
+                if not selected:
+                    continue
+                inputs = run.inputs(selected)
+                if batch_stage is not None:
+                    try:
+                        outputs = batch_stage[0](inputs, **kwargs)
+                    except StopPipeline as stop:
+                        outputs = [stop] * len(selected)
+                else:
+                    outputs = _call_each(stage[0], inputs, kwargs)
+                run.advance(selected, outputs)
+            results += run.results
+        return results
+
+    async def run_many_async(self, items: Iterable[Any], batch_size: int = 1024, **kwargs) -> list[Any]:
+        """
+        Run the pipeline over many inputs asynchronously, one batch at a time.
+
+        Same semantics as `run_many()`; async `handle` and `handle_batch`
+        methods are awaited.
+        """
+        plan = self._plan
+        if plan is None:
+            plan = self.compile()
+
+        results = []
+        for batch in _chunks(items, batch_size):
+            run = _BatchRun(batch, self._pass_result)
+            stages = zip(plan.async_stages, plan.async_batches, plan.offloaded)
+            for (handle, can_handle, is_async), batch_stage, offloaded in stages:
+                selected = run.select(can_handle, kwargs)
+                if not selected:
+                    continue
+                inputs = run.inputs(selected)
+                if batch_stage is not None:
+                    handle_batch, batch_is_async = batch_stage
+                    try:
+                        outputs = handle_batch(inputs, **kwargs)
+                        if batch_is_async:
+                            outputs = await outputs
+                    except StopPipeline as stop:
+                        outputs = [stop] * len(selected)
+                elif offloaded:
+                    # Spread the batch across the executor's workers
+                    outputs = await asyncio.gather(*(_stopped_or(handle, item, kwargs) for item in inputs))
+                elif is_async:
+                    outputs = [await _stopped_or(handle, item, kwargs) for item in inputs]
+                else:
+                    outputs = _call_each(handle, inputs, kwargs)
+                run.advance(selected, outputs)
+            results += run.results
+        return results
+
+    def stream(
+        self,
+        source: Union[Iterable[Any], AsyncIterable[Any]],
+        workers: Union[int, Sequence[int]] = 1,
+        maxsize: int = 64,
+        ordered: bool = True,
+        **kwargs,
+    ) -> "PipelineStream":
+        """
+        Run the pipeline over a stream of inputs, with each handler as a concurrent stage.
+
+        Every stage has its own workers and reads from a bounded queue filled by the
+        previous stage, so an I/O-bound stage keeps working while another is busy, and
+        a slow stage holds back the stages before it. Each input yields the result
+        `run_async()` would have returned for it.
+
+        Example:
+            async with pipeline.stream(records, workers=[1, 8, 2]) as results:
+                async for result in results:
+                    ...
+
+        Args:
+            source (iterable or async iterable): The inputs.
+            workers (int or sequence of int): Workers per stage, either one count
+                for every stage or one per handler.
+            maxsize (int): Capacity of the queue in front of each stage.
+            ordered (bool): Yield results in input order. If False, results are
+                yielded as soon as they are ready.
+        """
+        plan = self._plan
+        if plan is None:
+            plan = self.compile()
+        return PipelineStream(plan, self._pass_result, source, workers, maxsize, ordered, kwargs)
+
+
+class StageStats:
+    """
+    Live counters of one stage of a `PipelineStream`.
+
+    Attributes:
+        name (str): Class name of the stage's handler.
+        workers (int): Number of workers of the stage.
+        processed (int): Inputs processed so far.
+        busy (float): Seconds spent in the handler, summed over workers.
+    """
+
+    def __init__(self, name: str, workers: int, queue: asyncio.Queue):
+        self.name = name
+        self.workers = workers
+        self.processed = 0
+        self.busy = 0.0
+        self._queue = queue
+        self._started = time.perf_counter()
+
+    @property
+    def queued(self) -> int:
+        """Inputs waiting in the queue in front of the stage."""
+        return self._queue.qsize()
+
+    @property
+    def capacity(self) -> int:
+        """Capacity of the queue in front of the stage."""
+        return self._queue.maxsize
+
+    @property
+    def throughput(self) -> float:
+        """Inputs processed per second since the stream started."""
+        elapsed = time.perf_counter() - self._started
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"<StageStats {self.name}: {self.processed} processed, "
+            f"{self.throughput:,.0f}/s, queue {self.queued}/{self.capacity}>"
+        )
+
+
+_DONE = object()
+
+
+class _Failure:
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class PipelineStream:
+    """
+    Results of `HandlerPipeline.stream()`, consumed with `async for`.
+
+    Stages start on the first iteration. Use the stream as an async context
+    manager (or call `aclose()`) to stop its workers when leaving early. If a
+    handler raises, the stream stops and the exception is raised to the consumer.
+    """
+
+    def __init__(
+        self,
+        plan: PipelinePlan,
+        pass_result: bool,
+        source: Union[Iterable[Any], AsyncIterable[Any]],
+        workers: Union[int, Sequence[int]],
+        maxsize: int,
+        ordered: bool,
+        kwargs: dict,
+    ):
+        stages = plan.stages
+        if isinstance(workers, int):
+            workers = [workers] * len(stages)
+        if len(workers) != len(stages) or any(count < 1 for count in workers):
+            raise ValueError("workers must be a positive count, or one positive count per handler")
+
+        self._stages = plan.async_stages
+        self._workers = list(workers)
+        self._pass_result = pass_result
+        self._source = source
+        self._ordered = ordered
+        self._kwargs = kwargs
+        self._queues = [asyncio.Queue(maxsize) for _ in stages]
+        # Results are bounded by the window below, so the output queue needs no cap
+        self._output: asyncio.Queue = asyncio.Queue()
+        # Caps inputs in flight, including results held back to restore order
+        self._window = maxsize * (len(stages) + 1) + sum(self._workers)
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._tasks: list[asyncio.Task] = []
+        self._held: dict[int, Any] = {}
+        self._next = 0
+        self._finished = False
+
+        self.stats = [
+            StageStats(type(getattr(inspect.unwrap(handle), "__self__", handle)).__name__, count, queue)
+            for (handle, _, _), count, queue in zip(stages, self._workers, self._queues)
+        ]
+
+    def _start(self) -> None:
+        self._slots = asyncio.Semaphore(self._window)
+        loop = asyncio.get_running_loop()
+        self._tasks.append(loop.create_task(self._feed()))
+        for index, count in enumerate(self._workers):
+            remaining = [count]
+            for _ in range(count):
+                self._tasks.append(loop.create_task(self._work(index, remaining)))
+        for stats in self.stats:
+            stats._started = time.perf_counter()
+
+    async def _feed(self) -> None:
+        first = self._queues[0] if self._queues else self._output
         try:
-            for handler in self._handlers:
-                if handler.can_handle(current, **kwargs):
-                    method = getattr(handler, "handle", None)
-                    if inspect.iscoroutinefunction(method):
-                        result = await method(current, **kwargs)
-                    else:
-                        result = method(current, **kwargs)
+            seq = 0
+            if hasattr(self._source, "__aiter__"):
+                async for item in self._source:
+                    await self._slots.acquire()
+                    await first.put([seq, item, item, False])
+                    seq += 1
+            else:
+                for item in self._source:
+                    await self._slots.acquire()
+                    await first.put([seq, item, item, False])
+                    seq += 1
+        except Exception as e:
+            self._fail(e)
+            return
+        await first.put(_DONE)
+
+    async def _work(self, index: int, remaining: list[int]) -> None:
+        handle, can_handle, is_async = self._stages[index]
+        inbox = self._queues[index]
+        outbox = self._queues[index + 1] if index + 1 < len(self._queues) else self._output
+        stats = self.stats[index]
+        kwargs = self._kwargs
+        pass_result = self._pass_result
+
+        while True:
+            record = await inbox.get()
+            if record is _DONE:
+                # Let sibling workers see the end too; the last one passes it on
+                inbox.put_nowait(_DONE)
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    await outbox.put(_DONE)
+                return
+
+            # record: [seq, current input, latest result, stopped]
+            if not record[3]:
+                started = time.perf_counter()
+                try:
+                    current = record[1]
+                    if can_handle is None or can_handle(current, **kwargs):
+                        result = handle(current, **kwargs)
+                        if is_async:
+                            result = await result
+                        if result is not _SKIPPED:
+                            record[2] = result
+                            if pass_result:
+                                record[1] = result
+                except StopPipeline as stop:
+                    record[2] = stop.result
+                    record[3] = True
+                except Exception as e:
+                    self._fail(e)
+                    return
+                stats.busy += time.perf_counter() - started
+                stats.processed += 1
+            await outbox.put(record)
+
+    def _fail(self, error: BaseException) -> None:
+        current = asyncio.current_task()
+        for task in self._tasks:
+            if task is not current:
+                task.cancel()
+        self._output.put_nowait(_Failure(error))
+
+    def __aiter__(self) -> "PipelineStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        if self._finished:
+            raise StopAsyncIteration
+        if self._slots is None:
+            self._start()
 
-                    if self._pass_result:
-                        current = result
+        held = self._held
+        while True:
+            if self._ordered and self._next in held:
+                result = held.pop(self._next)
+                self._next += 1
+                self._slots.release()
+                return result
 
+            record = await self._output.get()
+            if record is _DONE:
+                self._finished = True
+                raise StopAsyncIteration
+            if isinstance(record, _Failure):
+                self._finished = True
+                raise record.error
+
+            if not self._ordered:
+                self._slots.release()
+                return record[2]
+            held[record[0]] = record[2]
+
+    async def aclose(self) -> None:
+        """Stop every stage, discarding inputs still in flight."""
+        self._finished = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def __aenter__(self) -> "PipelineStream":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+
+def _chunks(items: Iterable[Any], size: int):
+    if size < 1:
+        raise ValueError("batch_size must be at least 1")
+    iterator = iter(items)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _call_each(handle: Callable[..., Any], inputs: list[Any], kwargs: dict) -> list[Any]:
+    outputs = []
+    for item in inputs:
+        try:
+            outputs.append(handle(item, **kwargs))
         except StopPipeline as stop:
-            return stop.result
+            outputs.append(stop)
+    return outputs
 
-        return result
+
+async def _stopped_or(handle: Callable[..., Any], item: Any, kwargs: dict) -> Any:
+    try:
+        return await handle(item, **kwargs)
+    except StopPipeline as stop:
+        return stop
+
+
+class _BatchRun:
+    """Per-item state of a batch moving through the stages of `run_many`."""
+
+    def __init__(self, batch: list[Any], pass_result: bool):
+        self.currents = batch
+        self.results = list(batch)
+        self.live = range(len(batch))
+        if pass_result:
+            self.currents = self.results
+
+    def select(self, can_handle: Optional[Callable[..., bool]], kwargs: dict) -> list[int]:
+        """Return the indices of the live items this stage handles."""
+        if can_handle is None:
+            return list(self.live)
+
+        selected, stopped = [], []
+        currents = self.currents
+        for i in self.live:
+            try:
+                if can_handle(currents[i], **kwargs):
+                    selected.append(i)
+            except StopPipeline as stop:
+                self.results[i] = stop.result
+                stopped.append(i)
+        if stopped:
+            self._drop(stopped)
+        return selected
+
+    def inputs(self, selected: list[int]) -> list[Any]:
+        currents = self.currents
+        return [currents[i] for i in selected]
+
+    def advance(self, selected: list[int], outputs: list[Any]) -> None:
+        """Record the outputs of a stage, dropping the items it stopped."""
+        if not isinstance(outputs, list):
+            outputs = list(outputs)
+        if len(outputs) != len(selected):
+            raise ValueError(f"handle_batch returned {len(outputs)} results for {len(selected)} items")
+
+        results, stopped = self.results, []
+        for i, output in zip(selected, outputs):
+            if output is _SKIPPED:
+                continue
+            if isinstance(output, StopPipeline):
+                output = output.result
+                stopped.append(i)
+            results[i] = output
+        if stopped:
+            self._drop(stopped)
+
+    def _drop(self, stopped: list[int]) -> None:
+        gone = set(stopped)
+        self.live = [i for i in self.live if i not in gone]
@@ -1,21 +1,88 @@
-from typing import Any, Union
+from typing import Any, Iterable, Optional, Union
 from abc import ABC, abstractmethod
-import inspect
 import asyncio
+import inspect
+import threading
+import weakref
+
+from ._dispatch import ListenerRegistry, FanOut, TaskRegistry, Subscription, DispatchPlan, PlanCache, merge_plans
+from .delivery import Delivery, Gate
+
+
+# Maximum number of event names whose merged observer plan is cached
+EVENT_CACHE_SIZE = 1024
 
 
 class Observer(ABC):
+    # Event names this observer cares about; None means every event
+    observed_events: Optional[Iterable[str]] = None
+
     @abstractmethod
     def notify(self, event: str, data: Any = None) -> None:
         pass
 
 
 class AsyncObserver(ABC):
+    # Event names this observer cares about; None means every event
+    observed_events: Optional[Iterable[str]] = None
+
     @abstractmethod
     async def notify(self, event: str, data: Any = None) -> None:
         pass
 
 
+def _resolve_notify(observer: Union[Observer, AsyncObserver]):
+    return getattr(observer, "notify")
+
+
+class _GatedObserver:
+    """
+    Registered in place of an observer that has a delivery mode.
+
+    Its `notify` only hands the notification to the mode's gate, which calls
+    the real observer later. It compares equal to the observer it wraps, so
+    `remove_observer()` finds it.
+    """
+
+    def __init__(self, observer: Union[Observer, AsyncObserver], delivery: Delivery, weak: bool, tasks: TaskRegistry):
+        self._ref = weakref.ref(observer) if weak else None
+        self._observer = None if weak else observer
+        self._is_async = inspect.iscoroutinefunction(observer.notify)
+        self._tasks = tasks
+        self.subscription: Optional[Subscription] = None
+        self.gate = delivery.open(self)
+        self.notify = self.gate.push
+
+    @property
+    def observer(self) -> Optional[Union[Observer, AsyncObserver]]:
+        return self._observer if self._ref is None else self._ref()
+
+    def deliver(self, event: str, data: Any) -> None:
+        observer = self.observer
+        # Drop notifications still held back for an observer that was removed
+        if observer is None or not self.subscription.active:
+            return
+        if self._is_async:
+            self._tasks.spawn(observer.notify, (event, data), {})
+        else:
+            observer.notify(event, data)
+
+    def call(self, event: str, data: Any) -> Any:
+        observer = self.observer
+        if observer is not None:
+            return observer.notify(event, data)
+
+    def unsubscribe(self) -> None:
+        self.subscription.cancel()
+
+    def __eq__(self, other: Any) -> bool:
+        observer = self.observer
+        return other is self or (observer is not None and (other is observer or observer == other))
+
+    def __hash__(self) -> int:
+        return hash(self.observer)
+
+
 class Observable:
     """
     Observable class that supports both synchronous and asynchronous observers.
@@ -25,22 +92,125 @@ class Observable:
 
     You can trigger notifications using either `notify()` (non-blocking)
     or `await notify_async()` (fully awaited).
+
+    Each observer's `notify` method is resolved and classified once, when it
+    is added, rather than on every notification.
+
+    Observers may declare the events they care about, either with the `events`
+    argument of `add_observer()` or an `observed_events` attribute. They are
+    indexed by event name, so a notification only reaches the observers
+    interested in it, plus the catch-all observers that declare nothing.
+
+    An observer can also be given a delivery mode: `Conflate`, `Debounce`,
+    `Throttle` or `Coalesce` to receive a bounded rate of notifications,
+    handed over from timers on the running asyncio loop, or `Isolate` to
+    consume notifications from its own queue, at its own pace.
+
+    Args:
+        concurrent (bool): If True, async observers are run concurrently by `notify_async`.
+        max_concurrency (int, optional): Maximum number of async observers running at once.
+        timeout (float, optional): Per-observer timeout (in seconds) for async observers.
+        errors (str): `"raise"` (fail fast) or `"collect"` (run all, then raise `EmitError`).
+        max_pending (int, optional): Maximum number of async tasks started by `notify()` in flight.
+        overflow (str): Policy once `max_pending` is reached: `"block"`, `"drop_oldest"`,
+            `"drop_newest"` or `"inline"` (see `TaskRegistry`).
+        max_backlog (int): Maximum number of calls queued by the `"block"` policy;
+            further calls are dropped.
     """
 
-    def __init__(self) -> None:
-        self._observers: list[Union[Observer, AsyncObserver]] = []
+    def __init__(
+        self,
+        concurrent: bool = False,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        errors: str = "raise",
+        max_pending: Optional[int] = None,
+        overflow: str = "block",
+        max_backlog: int = 1024,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._plans = PlanCache(EVENT_CACHE_SIZE)
+        # Catch-all observers, and observers indexed by the event names they declared
+        self._observers = self._new_registry()
+        self._by_event: dict[str, ListenerRegistry] = {}
+        self._gated: "weakref.WeakSet[_GatedObserver]" = weakref.WeakSet()
+        fan_out = FanOut(concurrent, max_concurrency, timeout, errors)
+        self._fan_out = None if fan_out.is_default else fan_out
+        self._tasks = TaskRegistry(max_pending, overflow, max_backlog)
 
-    def add_observer(self, observer: Union[Observer, AsyncObserver]) -> None:
+    def add_observer(
+        self,
+        observer: Union[Observer, AsyncObserver],
+        weak: bool = False,
+        priority: int = 0,
+        events: Optional[Iterable[str]] = None,
+        delivery: Optional[Delivery] = None,
+    ) -> Subscription:
         """
         Add an observer to the list of subscribers.
+
+        Returns a `Subscription` whose `cancel()` removes the observer in constant time.
+
+        Args:
+            observer (Observer | AsyncObserver): The observer to add.
+            weak (bool): Only keep a weak reference to the observer; it is dropped
+                automatically once garbage-collected.
+            priority (int): Observers with a higher priority are notified first.
+            events (iterable of str, optional): Only notify the observer of these events.
+                Defaults to the observer's `observed_events` attribute; when neither is
+                set, the observer is notified of every event.
+            delivery (Delivery, optional): Buffer notifications for this observer and
+                hand them over from loop timers, e.g. `Conflate(0.05)` or `Throttle(1.0)`.
+                See `pattern_kit.behavioral.delivery`.
         """
-        self._observers.append(observer)
+        if events is None:
+            events = getattr(observer, "observed_events", None)
+        if events is not None:
+            events = list(dict.fromkeys([events] if isinstance(events, str) else events))
+            if not events:
+                raise ValueError("events must name at least one event")
+
+        item, gated = observer, None
+        if delivery is not None:
+            # The wrapper holds the observer weakly itself and is removed with it
+            item = gated = _GatedObserver(observer, delivery, weak, self._tasks)
+            weak = False
+
+        if events is None:
+            subscription = self._observers.add(item, weak=weak, priority=priority)
+        else:
+            with self._lock:
+                registries = [self._registry_for(event) for event in events]
+            subscription = Subscription.group(
+                [registry.add(item, weak=weak, priority=priority) for registry in registries]
+            )
+
+        if gated is not None:
+            subscription = Subscription.group([subscription], on_cancel=gated.gate.close)
+            gated.subscription = subscription
+            self._gated.add(gated)
+            if gated._ref is not None:
+                weakref.finalize(observer, subscription.cancel)
+        return subscription
 
     def remove_observer(self, observer: Union[Observer, AsyncObserver]) -> None:
         """
-        Remove an observer from the list of subscribers.
+        Remove an observer from the list of subscribers (from every event it was added for).
         """
-        self._observers.remove(observer)
+        for gated in list(self._gated):
+            if gated == observer and gated.subscription.cancel():
+                return
+
+        if observer in self._observers:
+            self._observers.remove(observer)
+            return
+
+        with self._lock:
+            registries = [registry for registry in self._by_event.values() if observer in registry]
+        if not registries:
+            raise ValueError(f"{observer!r} is not registered")
+        for registry in registries:
+            registry.remove(observer)
 
     def __iadd__(self, observer: Union[Observer, AsyncObserver]):
         """Add observer using `+=` operator."""
@@ -53,25 +223,93 @@ class Observable:
         return self
 
 
+    def _new_registry(self) -> ListenerRegistry:
+        return ListenerRegistry(resolve=_resolve_notify, on_change=self._plans.invalidate)
+
+    def _registry_for(self, event: str) -> ListenerRegistry:
+        registry = self._by_event.get(event)
+        if registry is None:
+            registry = self._by_event[event] = self._new_registry()
+        return registry
+
+    def _plan_for(self, event: str) -> DispatchPlan:
+        """Return the plan notifying the catch-all observers and those interested in `event`."""
+        if not self._by_event:
+            return self._observers.plan
+
+        plan = self._plans.get(event)
+        if plan is None:
+            version = self._plans.version
+            registry = self._by_event.get(event)
+            if registry is None:
+                plan = self._observers.plan
+            else:
+                plan = merge_plans((self._observers, registry))
+            self._plans.put(event, plan, version)
+        return plan
+
     def notify(self, event: str, data: Any = None) -> None:
         """
-        Notify all observers.
-        If an observer is asynchronous, it will be scheduled via `asyncio.create_task()` (non-blocking).
+        Notify all observers interested in `event`.
+        If an observer is asynchronous, it will be scheduled as a tracked task (non-blocking).
         """
-        for observer in self._observers:
-            method = getattr(observer, "notify", None)
-            if inspect.iscoroutinefunction(method):
-                asyncio.create_task(method(event, data))
+        plan = self._plan_for(event)
+        if not plan.has_async:
+            for method in plan.sync:
+                method(event, data)
+            return
+
+        for method, is_async in plan.entries:
+            if is_async:
+                self._tasks.spawn(method, (event, data), {})
             else:
                 method(event, data)
 
     async def notify_async(self, event: str, data: Any = None) -> None:
         """
-        Notify all observers and await any async ones. Sync observers will be called as normal.
+        Notify all observers interested in `event` and await any async ones.
+        Sync observers will be called as normal.
         """
-        for observer in self._observers:
-            method = getattr(observer, "notify", None)
-            if inspect.iscoroutinefunction(method):
+        plan = self._plan_for(event)
+        if self._fan_out is not None:
+            await self._fan_out.run(plan, (event, data), {})
+            return
+
+        for method, is_async in plan.entries:
+            if is_async:
                 await method(event, data)
             else:
                 method(event, data)
+
+    @property
+    def tasks(self) -> TaskRegistry:
+        """Tracked tasks started by `notify()`, with `pending`, `completed` and `failed` counters."""
+        return self._tasks
+
+    async def drain(self) -> None:
+        """Wait until every async observer scheduled by `notify()` has finished."""
+        await self._tasks.drain()
+
+    def gate(self, observer: Union[Observer, AsyncObserver]) -> Optional[Gate]:
+        """
+        Return the delivery state of an observer added with a delivery mode, or None.
+
+        For `Isolate`, this exposes the observer's queue `depth`, `lag` and counters.
+        """
+        for gated in list(self._gated):
+            if gated == observer and gated.subscription.active:
+                return gated.gate
+        return None
+
+    def flush(self) -> None:
+        """Deliver every notification held back by delivery modes now, without waiting for timers."""
+        for gated in list(self._gated):
+            gated.gate.flush()
+
+    async def aclose(self) -> None:
+        """
+        Deliver held-back notifications, stop scheduling new async observers and
+        wait for outstanding ones.
+        """
+        await asyncio.gather(*(gated.gate.join() for gated in list(self._gated)))
+        await self._tasks.aclose()
@@ -1,110 +1,969 @@
-from queue import Queue, Empty
-from typing import Callable, TypeVar, Generic
-from contextlib import contextmanager, asynccontextmanager
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Optional, TypeVar, Generic, Union
+from contextlib import contextmanager, asynccontextmanager, nullcontext
 
 import asyncio
+import inspect
+import logging
+import threading
+import time
+import weakref
+
+from ..utils.latency import LatencyRecorder
 
 T = TypeVar("T")
 
+logger = logging.getLogger(__name__)
+
+
+# Returned instead of an idle object when the caller may create one
+_CREATE = object()
+
+
+class _Lifecycle:
+    """
+    Expiry rules of a pool, and the timestamps of its objects.
+
+    Timestamps are kept aside, keyed by `id(obj)`, so that the pool hands out
+    the factory's objects themselves. Entries are dropped when the pool
+    discards an object.
+    """
+
+    def __init__(
+        self,
+        max_idle_time: Optional[float],
+        max_lifetime: Optional[float],
+        validate: Optional[Callable[[Any], bool]],
+        reap_interval: Optional[float],
+    ):
+        self.max_idle_time = max_idle_time
+        self.max_lifetime = max_lifetime
+        self.validate = validate
+        self.tracked = max_idle_time is not None or max_lifetime is not None
+        # True when objects must be checked before being handed out
+        self.checked = max_lifetime is not None or validate is not None
+        if reap_interval is None and self.tracked:
+            reap_interval = min(limit for limit in (max_idle_time, max_lifetime) if limit is not None) / 2
+        self.reap_interval = reap_interval
+        # id(obj) -> [created at, idle since]
+        self._times: dict[int, list[float]] = {}
+
+    def created(self, obj: Any) -> None:
+        if self.tracked:
+            now = time.monotonic()
+            self._times[id(obj)] = [now, now]
+
+    def idle(self, obj: Any) -> bool:
+        """Mark `obj` as idle. Returns False if it outlived `max_lifetime`."""
+        if not self.tracked:
+            return True
+        now = time.monotonic()
+        times = self._times.get(id(obj))
+        if times is None:
+            # Not created by the pool: its lifetime starts now
+            times = self._times[id(obj)] = [now, now]
+        times[1] = now
+        return self.max_lifetime is None or now - times[0] < self.max_lifetime
+
+    def usable(self, obj: Any) -> bool:
+        """Check an idle object before handing it out: lifetime first, then `validate`."""
+        if self.max_lifetime is not None:
+            times = self._times.get(id(obj))
+            if times is not None and time.monotonic() - times[0] >= self.max_lifetime:
+                return False
+        if self.validate is None:
+            return True
+        try:
+            return bool(self.validate(obj))
+        except Exception:
+            # A failing health check (e.g. `conn.ping()` on a dead connection) means unusable
+            return False
+
+    def forget(self, obj: Any) -> None:
+        self._times.pop(id(obj), None)
+
+    def split(self, idle: deque, min_idle: int) -> tuple[deque, list]:
+        """
+        Separate the expired idle objects from the others.
+
+        Objects past `max_lifetime` always expire; objects idle for longer than
+        `max_idle_time` expire, least recently used first, while more than
+        `min_idle` objects remain.
+        """
+        now = time.monotonic()
+        max_idle_time, max_lifetime = self.max_idle_time, self.max_lifetime
+        remaining = len(idle)
+        keep, expired = deque(), []
+        for obj in idle:
+            times = self._times.get(id(obj))
+            if times is not None and (
+                (max_lifetime is not None and now - times[0] >= max_lifetime)
+                or (max_idle_time is not None and now - times[1] >= max_idle_time and remaining > min_idle)
+            ):
+                expired.append(obj)
+                remaining -= 1
+            else:
+                keep.append(obj)
+        return keep, expired
+
 
 class ObjectPool(Generic[T]):
     """
     A simple thread-safe object pool for synchronous use.
 
-    This pool reuses objects to avoid repeated construction.
-    It does not strictly enforce a maximum number of active objects—
-    `max_size` only limits how many can be stored for reuse.
+    This pool reuses objects to avoid repeated construction. By default it does
+    not enforce a maximum number of active objects: `max_size` only limits how
+    many can be stored for reuse. Pass `max_objects` to cap the number of live
+    objects (idle or in use): once reached, `acquire()` blocks until an object
+    is released.
+
+    With `max_idle_time` or `max_lifetime`, a daemon thread reaps expired idle
+    objects in the background (see `reap()`); call `close()` to stop it.
+
+    With `local_cache`, each thread keeps a few idle objects for itself, in front
+    of the shared pool, and reuses them without taking the pool's lock. Objects
+    move between the caches and the shared pool in batches: half of a full cache
+    is returned to the pool on release, and an empty cache takes up to half its
+    size from the pool on acquire. Waiting threads and the reaper reclaim objects
+    from every cache, and the cache of a thread is returned to the pool when the
+    thread exits.
+
+    Args:
+        factory (callable): Creates a new object.
+        max_size (int): Maximum number of idle objects kept for reuse (0 means unbounded).
+        max_objects (int, optional): Maximum number of live objects. Only release
+            objects acquired from the pool, so that they are counted correctly.
+        max_idle_time (float, optional): Seconds after which an idle object is reaped,
+            as long as more than `min_idle` objects are idle.
+        max_lifetime (float, optional): Seconds after which an object is discarded,
+            once it is idle.
+        validate (callable, optional): Called with an idle object before it is handed
+            out; objects for which it returns False or raises are discarded.
+        reset (callable, optional): Called with every released object before it is
+            reused; objects for which it raises are discarded.
+        dispose (callable, optional): Called with every object the pool discards
+            (expired, invalid, cleared, or released while the pool is full).
+        min_idle (int): Number of idle objects the pool maintains: the reaper keeps them
+            even past `max_idle_time`, and they are created again in the background
+            when fewer are idle (see `prefill()`).
+        reap_interval (float, optional): Seconds between reaper passes. Defaults to half
+            the shortest of `max_idle_time` and `max_lifetime`.
+        prefill_concurrency (int): Maximum number of objects created at once by `prefill()`.
+        local_cache (int): Number of idle objects each thread may keep for itself
+            (0 disables the per-thread caches). `max_size` only limits the shared pool.
+
+    Attributes:
+        wait_times (LatencyRecorder): Time spent in `acquire()` waiting for an object,
+            in bounded mode.
+        timeouts (int): Number of `acquire()` calls that timed out.
+        warmup_times (LatencyRecorder): Duration of each warm-up, from the first object
+            requested to the last one ready.
     """
 
-    def __init__(self, factory: Callable[[], T], max_size: int = 10):
+    def __init__(
+        self,
+        factory: Callable[[], T],
+        max_size: int = 10,
+        max_objects: Optional[int] = None,
+        max_idle_time: Optional[float] = None,
+        max_lifetime: Optional[float] = None,
+        validate: Optional[Callable[[T], bool]] = None,
+        reset: Optional[Callable[[T], Any]] = None,
+        dispose: Optional[Callable[[T], Any]] = None,
+        min_idle: int = 0,
+        reap_interval: Optional[float] = None,
+        prefill_concurrency: int = 4,
+        local_cache: int = 0,
+    ):
+        if max_objects is not None and max_objects < 1:
+            raise ValueError("max_objects must be at least 1")
         self._factory = factory
-        self._pool = Queue(maxsize=max_size)
+        self._max_size = max_size
+        self._max_objects = max_objects
+        self._reset = reset
+        self._dispose = dispose
+        self._min_idle = min_idle
+        self._lifecycle = _Lifecycle(max_idle_time, max_lifetime, validate, reap_interval)
+        self._idle: deque[T] = deque()
+        self._live = 0
+        self._waiting = 0
+        self._cond = threading.Condition(threading.Lock())
+        # Objects being created in the background by `prefill()`
+        self._pending = 0
+        self._prefill_concurrency = prefill_concurrency
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Per-thread free lists, and a registry of them to reclaim their objects
+        self._local_size = local_cache
+        self._local = threading.local()
+        self._caches: list[list[T]] = []
+
+        self.wait_times = LatencyRecorder()
+        self.timeouts = 0
+        self.warmup_times = LatencyRecorder()
+
+        self._stop_reaper = threading.Event()
+        if self._lifecycle.reap_interval:
+            reaper = threading.Thread(
+                target=_reap_periodically,
+                args=(weakref.ref(self), self._stop_reaper, self._lifecycle.reap_interval),
+                name="ObjectPool-reaper",
+                daemon=True,
+            )
+            reaper.start()
+            # The reaper only holds a weak reference: stop it once the pool is gone
+            weakref.finalize(self, self._stop_reaper.set)
 
-    def acquire(self) -> T:
+    def acquire(self, timeout: Optional[float] = None) -> T:
         """
         Acquire an object from the pool. If none are available, creates a new one.
+
+        In bounded mode, waits for an object to be released once `max_objects`
+        are live, and raises `TimeoutError` if none is after `timeout` seconds.
+        """
+        cache = None
+        if self._local_size:
+            cache = self._local_cache()
+            while cache:
+                try:
+                    obj = cache.pop()
+                except IndexError:
+                    # Reclaimed by another thread meanwhile
+                    break
+                if not self._lifecycle.checked or self._lifecycle.usable(obj):
+                    return obj
+                self._discard(obj)
+
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            with self._cond:
+                obj = self._take(deadline, timeout)
+                if cache is not None and self._idle and not self._waiting:
+                    # Refill the local cache in one go
+                    for _ in range(min(self._local_size // 2, len(self._idle))):
+                        cache.append(self._idle.pop())
+            if obj is _CREATE:
+                obj = self._create()
+                break
+            if not self._lifecycle.checked or self._lifecycle.usable(obj):
+                break
+            self._discard(obj)
+
+        if self._min_idle and len(self) + self._pending < self._min_idle:
+            self._refill()
+        return obj
+
+    def _local_cache(self) -> list[T]:
+        try:
+            return self._local.cache
+        except AttributeError:
+            pass
+        cache: list[T] = []
+        owner = _CacheOwner()
+        self._local.cache = cache
+        self._local.owner = owner
+        with self._cond:
+            self._caches.append(cache)
+        # Return the objects to the pool once the thread (and its local data) is gone
+        weakref.finalize(owner, _reclaim_cache, weakref.ref(self), cache)
+        return cache
+
+    def _reclaim(self) -> None:
+        """Move the objects of every thread's cache to the shared pool. Called with the lock held."""
+        idle = self._idle
+        for cache in self._caches:
+            while cache:
+                try:
+                    idle.append(cache.pop())
+                except IndexError:
+                    break
+
+    def _remove_cache(self, cache: list[T]) -> None:
+        with self._cond:
+            self._caches = [other for other in self._caches if other is not cache]
+        objs = []
+        while cache:
+            objs.append(cache.pop())
+        self._store(objs)
+
+    def _take(self, deadline: Optional[float], timeout: Optional[float]):
+        """Pop an idle object, or return `_CREATE` if one may be created. Called with the lock held."""
+        if self._max_objects is None:
+            return self._idle.pop() if self._idle else _CREATE
+        if self._idle or self._live < self._max_objects:
+            self.wait_times.record(0.0)
+        else:
+            self._wait(deadline, timeout)
+        if self._idle:
+            return self._idle.pop()
+        self._live += 1
+        return _CREATE
+
+    def _wait(self, deadline: Optional[float], timeout: Optional[float]) -> None:
+        """Block until an object is idle or may be created. Called with the lock held."""
+        started = time.perf_counter()
+        self._waiting += 1
+        try:
+            while not self._idle and self._live >= self._max_objects:
+                if self._caches:
+                    self._reclaim()
+                    if self._idle:
+                        break
+                remaining = None if deadline is None else deadline - time.perf_counter()
+                if remaining is not None and remaining <= 0:
+                    self.timeouts += 1
+                    raise TimeoutError(f"No object available after {timeout} seconds")
+                self._cond.wait(remaining)
+        finally:
+            self._waiting -= 1
+        self.wait_times.record(time.perf_counter() - started)
+
+    def _create(self) -> T:
+        try:
+            obj = self._factory()
+        except BaseException:
+            if self._max_objects is not None:
+                self._free_slots(1)
+            raise
+        self._lifecycle.created(obj)
+        return obj
+
+    def prefill(self, n: Optional[int] = None) -> int:
         """
+        Create objects until `n` are idle (by default `min_idle`), and return how many were created.
+
+        Objects are created concurrently, on up to `prefill_concurrency` threads.
+        Blocks until they are ready, and raises the first factory error, if any.
+        The pool's `max_size` and `max_objects` still apply.
+        """
+        futures = self._spawn(self._min_idle if n is None else n)
+        wait(futures)
+        for future in futures:
+            if future.exception() is not None:
+                raise future.exception()
+        return len(futures)
+
+    def _spawn(self, target: int) -> list[Future]:
+        """Start creating objects in the background until `target` are idle or on their way."""
+        with self._cond:
+            count = _fill_count(self, target)
+            if count <= 0:
+                return []
+            self._pending += count
+            if self._max_objects is not None:
+                self._live += count
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self._prefill_concurrency, thread_name_prefix="ObjectPool-prefill")
+        # [objects left to create, start time]
+        batch = [count, time.perf_counter()]
+        return [self._executor.submit(self._fill_one, batch) for _ in range(count)]
+
+    def _refill(self) -> None:
+        """Create objects in the background until `min_idle` are idle, logging factory errors."""
+        for future in self._spawn(self._min_idle):
+            future.add_done_callback(_report_refill_error)
+
+    def _fill_one(self, batch: list) -> None:
         try:
-            return self._pool.get_nowait()
-        except Empty:
-            return self._factory()
+            obj = self._factory()
+        except BaseException:
+            with self._cond:
+                self._filled(batch)
+                if self._max_objects is not None:
+                    self._live -= 1
+                    self._cond.notify()
+            raise
+        self._lifecycle.created(obj)
+        with self._cond:
+            self._filled(batch)
+            self._idle.append(obj)
+            if self._waiting:
+                self._cond.notify()
+
+    def _filled(self, batch: list) -> None:
+        """Account for one object of a warm-up batch. Called with the lock held."""
+        self._pending -= 1
+        batch[0] -= 1
+        if batch[0] == 0:
+            self.warmup_times.record(time.perf_counter() - batch[1])
+
+    def _free_slots(self, count: int) -> None:
+        with self._cond:
+            self._live -= count
+            self._cond.notify(count)
+
+    def _discard(self, obj: T) -> None:
+        """Drop a live object that is not idle."""
+        if self._max_objects is not None:
+            self._free_slots(1)
+        self._forget(obj)
+
+    def _forget(self, obj: T) -> None:
+        self._lifecycle.forget(obj)
+        if self._dispose is not None:
+            self._dispose(obj)
 
     def release(self, obj: T) -> None:
         """
         Return an object to the pool for reuse. If the pool is full, the object is discarded.
         """
-        try:
-            self._pool.put_nowait(obj)
-        except:
-            pass
+        if self._reset is not None:
+            try:
+                self._reset(obj)
+            except Exception:
+                self._discard(obj)
+                return
+        if not self._lifecycle.idle(obj):
+            self._discard(obj)
+            return
+
+        # Objects go to the shared pool while threads are waiting for one
+        if self._local_size and not self._waiting:
+            cache = self._local_cache()
+            if len(cache) < self._local_size:
+                cache.append(obj)
+                if self._waiting:
+                    # A thread started waiting after the check above and may have missed the object
+                    with self._cond:
+                        self._reclaim()
+                        if self._waiting:
+                            self._cond.notify(len(self._idle))
+                return
+            # Full: return half of the cache to the shared pool in one go
+            objs = [obj]
+            for _ in range(max(self._local_size // 2, 1)):
+                try:
+                    objs.append(cache.pop(0))
+                except IndexError:
+                    break
+            self._store(objs)
+            return
+
+        with self._cond:
+            # Keep the object for a waiting thread even if the idle storage is full
+            if self._max_size <= 0 or len(self._idle) < self._max_size or self._waiting:
+                self._idle.append(obj)
+                if self._waiting:
+                    self._cond.notify()
+                return
+        self._discard(obj)
+
+    def _store(self, objs: list[T]) -> None:
+        """Add idle objects to the shared pool, discarding those it has no room for."""
+        with self._cond:
+            if self._max_size <= 0 or self._waiting:
+                room = len(objs)
+            else:
+                room = max(self._max_size - len(self._idle), 0)
+            self._idle.extend(objs[:room])
+            if self._waiting:
+                self._cond.notify(room)
+        for obj in objs[room:]:
+            self._discard(obj)
 
     @contextmanager
-    def borrow(self):
+    def borrow(self, timeout: Optional[float] = None):
         """
         Context manager version of `acquire()` + `release()`.
         """
-        obj = self.acquire()
+        obj = self.acquire(timeout)
         try:
             yield obj
         finally:
             self.release(obj)
 
+    def reap(self) -> int:
+        """
+        Discard the expired idle objects now, and return how many were discarded.
+
+        Called periodically by the reaper thread.
+        """
+        with self._cond:
+            self._reclaim()
+            self._idle, expired = self._lifecycle.split(self._idle, self._min_idle)
+            if expired and self._max_objects is not None:
+                self._live -= len(expired)
+                self._cond.notify(len(expired))
+        for obj in expired:
+            self._forget(obj)
+        if self._min_idle:
+            self._refill()
+        return len(expired)
+
     def clear(self) -> None:
         """Remove all idle objects from the pool."""
-        while not self._pool.empty():
-            self._pool.get_nowait()
+        with self._cond:
+            self._reclaim()
+            idle, self._idle = self._idle, deque()
+            if self._max_objects is not None and idle:
+                self._live -= len(idle)
+                self._cond.notify(len(idle))
+        for obj in idle:
+            self._forget(obj)
+
+    def close(self) -> None:
+        """Stop the reaper thread and the prefill threads, and remove all idle objects."""
+        self._stop_reaper.set()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self.clear()
 
     def __len__(self) -> int:
-        """Return the number of idle objects in the pool."""
-        return self._pool.qsize()
+        """Return the number of idle objects in the pool, including the per-thread caches."""
+        return len(self._idle) + sum(len(cache) for cache in self._caches)
+
+
+class _CacheOwner:
+    """Stored next to a thread's cache; collected with the thread's local data."""
+
+    __slots__ = ("__weakref__",)
+
+
+def _reclaim_cache(pool_ref: "weakref.ref[ObjectPool]", cache: list) -> None:
+    pool = pool_ref()
+    if pool is not None:
+        pool._remove_cache(cache)
+
+
+def _report_refill_error(future: Future) -> None:
+    if future.exception() is not None:
+        logger.error("Exception while refilling the object pool", exc_info=future.exception())
+
+
+def _fill_count(pool, target: int) -> int:
+    """Number of objects to create so that `target` are idle, within the pool's limits."""
+    count = target - len(pool) - pool._pending
+    if pool._max_size > 0:
+        count = min(count, pool._max_size - len(pool._idle) - pool._pending)
+    if pool._max_objects is not None:
+        count = min(count, pool._max_objects - pool._live)
+    return count
+
+
+def _reap_periodically(pool_ref: "weakref.ref[ObjectPool]", stop: threading.Event, interval: float) -> None:
+    while not stop.wait(interval):
+        pool = pool_ref()
+        if pool is None:
+            return
+        pool.reap()
+        del pool
 
 
 class AsyncObjectPool(Generic[T]):
     """
     An asyncio-compatible object pool.
 
-    This pool reuses objects to avoid repeated construction.
-    It does not strictly enforce a maximum number of active objects—
-    `max_size` only limits how many can be stored for reuse.
+    This pool reuses objects to avoid repeated construction. By default it does
+    not enforce a maximum number of active objects: `max_size` only limits how
+    many can be stored for reuse. Pass `max_objects` to cap the number of live
+    objects (idle or in use): once reached, `acquire()` waits until an object is
+    released. Waiters are served in the order they arrived, and released or
+    newly created objects are handed to them directly.
+
+    The factory and the `reset` and `dispose` hooks may be coroutine functions.
+    Pass `max_creating` to cap the number of objects being created at once:
+    callers arriving meanwhile wait in line for the next object instead of
+    calling the factory.
+
+    With `max_idle_time` or `max_lifetime`, a task started on first use reaps
+    expired idle objects in the background (see `reap()`); call `close()` to stop it.
+
+    Args:
+        factory (callable): Creates a new object, or returns an awaitable of one.
+        max_size (int): Maximum number of idle objects kept for reuse (0 means unbounded).
+        max_objects (int, optional): Maximum number of live objects. Only release
+            objects acquired from the pool, so that they are counted correctly.
+        max_creating (int, optional): Maximum number of factory calls in flight.
+        max_idle_time (float, optional): Seconds after which an idle object is reaped,
+            as long as more than `min_idle` objects are idle.
+        max_lifetime (float, optional): Seconds after which an object is discarded,
+            once it is idle.
+        validate (callable, optional): Called with an idle object before it is handed
+            out; objects for which it returns False or raises are discarded.
+        reset (callable, optional): Called with every released object before it is
+            reused; objects for which it raises are discarded.
+        dispose (callable, optional): Called with every object the pool discards
+            (expired, invalid, cleared, or released while the pool is full).
+            Async disposals run as tasks, awaited by `close()`.
+        min_idle (int): Number of idle objects the pool maintains: the reaper keeps them
+            even past `max_idle_time`, and they are created again in the background
+            when fewer are idle (see `prefill()`).
+        reap_interval (float, optional): Seconds between reaper passes. Defaults to half
+            the shortest of `max_idle_time` and `max_lifetime`.
+        prefill_concurrency (int): Maximum number of objects created at once by `prefill()`.
+
+    Attributes:
+        wait_times (LatencyRecorder): Time spent in `acquire()` waiting for an object,
+            in bounded mode.
+        timeouts (int): Number of `acquire()` calls that timed out.
+        warmup_times (LatencyRecorder): Duration of each warm-up, from the first object
+            requested to the last one ready.
     """
 
-    def __init__(self, factory: Callable[[], T], max_size: int = 10):
+    def __init__(
+        self,
+        factory: Callable[[], Union[T, Awaitable[T]]],
+        max_size: int = 10,
+        max_objects: Optional[int] = None,
+        max_creating: Optional[int] = None,
+        max_idle_time: Optional[float] = None,
+        max_lifetime: Optional[float] = None,
+        validate: Optional[Callable[[T], bool]] = None,
+        reset: Optional[Callable[[T], Any]] = None,
+        dispose: Optional[Callable[[T], Any]] = None,
+        min_idle: int = 0,
+        reap_interval: Optional[float] = None,
+        prefill_concurrency: int = 4,
+    ):
+        if max_objects is not None and max_objects < 1:
+            raise ValueError("max_objects must be at least 1")
+        if max_creating is not None and max_creating < 1:
+            raise ValueError("max_creating must be at least 1")
         self._factory = factory
-        self._pool = asyncio.Queue(maxsize=max_size)
+        self._max_size = max_size
+        self._max_objects = max_objects
+        self._max_creating = max_creating
+        self._reset = reset
+        self._dispose = dispose
+        self._min_idle = min_idle
+        self._lifecycle = _Lifecycle(max_idle_time, max_lifetime, validate, reap_interval)
+        self._idle: deque[T] = deque()
+        self._live = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._waiting = 0
+        self._bounded = max_objects is not None or max_creating is not None
+        # Gate of the factory calls, created on first use (see `_gate`)
+        self._creation_gate: Optional[asyncio.Semaphore] = None
+        # Objects being created on behalf of waiters
+        self._creating_for_waiters = 0
+        self._reaper: Optional[asyncio.Task] = None
+        # Objects being created by `prefill()`
+        self._pending = 0
+        self._prefill_concurrency = prefill_concurrency
+        self._refill: Optional[asyncio.Task] = None
+        self._disposals: set[asyncio.Task] = set()
+        # Tasks creating objects for waiters
+        self._creations: set[asyncio.Task] = set()
 
-    async def acquire(self) -> T:
+        self.wait_times = LatencyRecorder()
+        self.timeouts = 0
+        self.warmup_times = LatencyRecorder()
+
+    async def acquire(self, timeout: Optional[float] = None) -> T:
         """
         Acquire an object from the async pool.
         Returns a new one if no reusable objects are available.
+
+        In bounded mode, waits for an object once `max_objects` are live or
+        `max_creating` are being created, and raises `TimeoutError` if none is
+        ready after `timeout` seconds.
+        """
+        if self._reaper is None and self._lifecycle.reap_interval:
+            self._start_reaper()
+
+        while True:
+            if not self._bounded:
+                obj = self._idle.pop() if self._idle else await self._create()
+            elif not self._waiters and (self._idle or self._can_create()):
+                self.wait_times.record(0.0)
+                if self._idle:
+                    obj = self._idle.pop()
+                else:
+                    self._live += 1
+                    obj = await self._create()
+            else:
+                obj = await self._wait(timeout)
+
+            if not self._lifecycle.checked or self._lifecycle.usable(obj):
+                break
+            self._discard(obj)
+
+        if self._min_idle and len(self._idle) + self._pending < self._min_idle:
+            self._start_refill()
+        return obj
+
+    def _can_create(self) -> bool:
+        if self._max_objects is not None and self._live >= self._max_objects:
+            return False
+        return self._creation_gate is None or not self._creation_gate.locked()
+
+    def _gate(self) -> Optional[asyncio.Semaphore]:
+        if self._max_creating is not None and self._creation_gate is None:
+            self._creation_gate = asyncio.Semaphore(self._max_creating)
+        return self._creation_gate
+
+    async def _wait(self, timeout: Optional[float]) -> T:
+        """Wait in line for a released or newly created object."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        self._waiting += 1
+        self._create_for_waiters()
+        timer = None
+        if timeout is not None:
+            timer = loop.call_later(timeout, _expire, waiter, timeout)
+        try:
+            obj = await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                # Cancelled after being served: pass the object on
+                self._put(waiter.result())
+            raise
+        except TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self._waiting -= 1
+            if timer is not None:
+                timer.cancel()
+
+        self.wait_times.record(loop.time() - started)
+        return obj
+
+    def _create_for_waiters(self) -> None:
+        """Start creating objects for the waiters that no creation is on its way for yet."""
+        loop = asyncio.get_running_loop()
+        while self._waiting > self._creating_for_waiters and (
+            self._max_objects is None or self._live < self._max_objects
+        ):
+            self._live += 1
+            self._creating_for_waiters += 1
+            task = loop.create_task(self._create_for_waiter())
+            self._creations.add(task)
+            task.add_done_callback(self._creations.discard)
+
+    async def _create_for_waiter(self) -> None:
+        try:
+            async with _maybe(self._gate()):
+                if not self._waiting:
+                    # Served by released objects while waiting for the gate
+                    self._free_slot()
+                    return
+                obj = await self._call_factory()
+        except asyncio.CancelledError:
+            # Cancelled by `close()`: give the slot back without starting another creation
+            if self._max_objects is not None:
+                self._live -= 1
+            raise
+        except Exception as e:
+            self._free_slot()
+            self._fail_waiter(e)
+            return
+        finally:
+            self._creating_for_waiters -= 1
+        self._lifecycle.created(obj)
+        self._put(obj)
+
+    def _fail_waiter(self, error: Exception) -> None:
+        waiters = self._waiters
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_exception(error)
+                return
+
+    async def _call_factory(self) -> T:
+        obj = self._factory()
+        if inspect.isawaitable(obj):
+            obj = await obj
+        return obj
+
+    async def _create(self) -> T:
+        try:
+            async with _maybe(self._gate()):
+                obj = await self._call_factory()
+        except BaseException:
+            self._free_slot()
+            raise
+        self._lifecycle.created(obj)
+        return obj
+
+    async def prefill(self, n: Optional[int] = None) -> int:
         """
-        if self._pool.empty():
-            return self._factory()
-        return await self._pool.get()
+        Create objects until `n` are idle (by default `min_idle`), and return how many were created.
+
+        Up to `prefill_concurrency` objects are created at once, within `max_creating`.
+        Raises the first factory error, if any. The pool's `max_size` and `max_objects`
+        still apply, and waiters are handed the new objects directly.
+        """
+        count = _fill_count(self, self._min_idle if n is None else n)
+        if count <= 0:
+            return 0
+        self._pending += count
+        if self._max_objects is not None:
+            self._live += count
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        limit = asyncio.Semaphore(self._prefill_concurrency)
+        results = await asyncio.gather(*(self._fill_one(limit) for _ in range(count)), return_exceptions=True)
+        self.warmup_times.record(loop.time() - started)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return count
+
+    async def _fill_one(self, limit: asyncio.Semaphore) -> None:
+        try:
+            async with limit, _maybe(self._gate()):
+                obj = await self._call_factory()
+        except BaseException:
+            self._pending -= 1
+            self._free_slot()
+            raise
+        self._lifecycle.created(obj)
+        self._pending -= 1
+        self._put(obj)
+
+    def _start_refill(self) -> None:
+        if self._refill is None or self._refill.done():
+            self._refill = asyncio.get_running_loop().create_task(self._refill_in_background())
+
+    async def _refill_in_background(self) -> None:
+        try:
+            await self.prefill()
+        except Exception as e:
+            asyncio.get_running_loop().call_exception_handler({
+                "message": "Exception while refilling the object pool",
+                "exception": e,
+            })
+
+    def _serve(self, obj: T) -> bool:
+        """Hand `obj` to the first waiter still waiting."""
+        waiters = self._waiters
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(obj)
+                return True
+        return False
+
+    def _free_slot(self) -> None:
+        """Free the slot of a discarded object, creating one for the waiters if needed."""
+        if self._max_objects is not None:
+            self._live -= 1
+            if self._waiting:
+                self._create_for_waiters()
+
+    def _discard(self, obj: T) -> None:
+        """Drop a live object that is not idle."""
+        self._free_slot()
+        self._forget(obj)
+
+    def _forget(self, obj: T) -> None:
+        self._lifecycle.forget(obj)
+        if self._dispose is not None:
+            result = self._dispose(obj)
+            if inspect.isawaitable(result):
+                task = asyncio.ensure_future(result)
+                self._disposals.add(task)
+                task.add_done_callback(self._disposed)
+
+    def _disposed(self, task: asyncio.Task) -> None:
+        self._disposals.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            task.get_loop().call_exception_handler({
+                "message": "Exception while disposing of a pooled object",
+                "exception": task.exception(),
+            })
+
+    def _put(self, obj: T) -> None:
+        if not self._lifecycle.idle(obj):
+            self._discard(obj)
+        elif self._waiters and self._serve(obj):
+            return
+        elif self._max_size <= 0 or len(self._idle) < self._max_size:
+            self._idle.append(obj)
+        else:
+            self._discard(obj)
 
     async def release(self, obj: T) -> None:
         """
         Return an object to the pool. If the pool is full, the object is discarded.
         """
-        if self._pool.full():
-            return
-        await self._pool.put(obj)
+        if self._reaper is None and self._lifecycle.reap_interval:
+            self._start_reaper()
+        if self._reset is not None:
+            try:
+                result = self._reset(obj)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                self._discard(obj)
+                return
+            except BaseException:
+                # Cancelled while resetting: the object's state is unknown, drop it
+                self._discard(obj)
+                raise
+        self._put(obj)
 
     @asynccontextmanager
-    async def borrow(self):
+    async def borrow(self, timeout: Optional[float] = None):
         """
         Async context manager version of `acquire()` + `release()`.
         """
-        obj = await self.acquire()
+        obj = await self.acquire(timeout)
         try:
             yield obj
         finally:
             await self.release(obj)
 
+    def _start_reaper(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._reaper = loop.create_task(_reap_periodically_async(weakref.ref(self), self._lifecycle.reap_interval))
+
+    async def reap(self) -> int:
+        """
+        Discard the expired idle objects now, and return how many were discarded.
+
+        Called periodically by the reaper task.
+        """
+        self._idle, expired = self._lifecycle.split(self._idle, self._min_idle)
+        for obj in expired:
+            self._discard(obj)
+        if self._min_idle and len(self._idle) + self._pending < self._min_idle:
+            self._start_refill()
+        return len(expired)
+
     async def clear(self) -> None:
         """Remove all idle objects from the pool."""
-        while not self._pool.empty():
-            await self._pool.get()
+        idle, self._idle = self._idle, deque()
+        for obj in idle:
+            self._discard(obj)
+
+    async def close(self) -> None:
+        """
+        Stop the reaper, refill and creation tasks, remove all idle objects and wait for their disposal.
+        """
+        tasks = [task for task in (self._reaper, self._refill) if task is not None]
+        tasks += self._creations
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.clear()
+        await asyncio.gather(*self._disposals, return_exceptions=True)
 
     def __len__(self) -> int:
         """Return the number of idle objects in the pool."""
-        return self._pool.qsize()
+        return len(self._idle)
+
+
+async def _reap_periodically_async(pool_ref: "weakref.ref[AsyncObjectPool]", interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        pool = pool_ref()
+        if pool is None:
+            return
+        await pool.reap()
+        del pool
+
+
+def _maybe(gate: Optional[asyncio.Semaphore]):
+    return nullcontext() if gate is None else gate
+
+
+def _expire(waiter: asyncio.Future, timeout: float) -> None:
+    if not waiter.done():
+        waiter.set_exception(TimeoutError(f"No object available after {timeout} seconds"))
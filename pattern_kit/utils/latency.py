@@ -0,0 +1,80 @@
+from collections import deque
+import math
+
+
+class LatencyRecorder:
+    """
+    Records durations and reports their distribution.
+
+    Percentiles are computed over the most recent `window` samples, so they
+    follow changes in the recorded latencies. `count`, `total` and `max` cover
+    every sample since the last `reset()`.
+
+    Example:
+        recorder = LatencyRecorder()
+        recorder.record(0.012)
+        ...
+        p50, p99 = recorder.percentiles(50, 99)
+
+    Args:
+        window (int): Number of recent samples kept for percentiles.
+
+    Attributes:
+        count (int): Samples recorded.
+        total (float): Sum of the samples, in seconds.
+        max (float): Largest sample, in seconds.
+    """
+
+    def __init__(self, window: int = 1024):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self._samples: deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add a sample, in seconds."""
+        self._samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean(self) -> float:
+        """Mean of every sample, in seconds (0 when nothing was recorded)."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> float:
+        """Return the `p`-th percentile (0-100) of the recent samples, in seconds (0 when empty)."""
+        return self.percentiles(p)[0]
+
+    def percentiles(self, *ps: float) -> list[float]:
+        """Return several percentiles of the recent samples at once, sorting them only once."""
+        samples = sorted(self._samples)
+        return [_nearest_rank(samples, p) for p in ps]
+
+    def reset(self) -> None:
+        """Drop every sample."""
+        self._samples.clear()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def __len__(self) -> int:
+        """Return the number of samples kept for percentiles."""
+        return len(self._samples)
+
+    def __repr__(self) -> str:
+        p50, p99 = self.percentiles(50, 99)
+        return f"<LatencyRecorder n={self.count} p50={p50 * 1000:.2f}ms p99={p99 * 1000:.2f}ms max={self.max * 1000:.2f}ms>"
+
+
+def _nearest_rank(samples: list[float], p: float) -> float:
+    if not 0 <= p <= 100:
+        raise ValueError("percentile must be between 0 and 100")
+    if not samples:
+        return 0.0
+    rank = max(math.ceil(p / 100 * len(samples)), 1)
+    return samples[rank - 1]
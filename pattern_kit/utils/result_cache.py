@@ -0,0 +1,192 @@
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+import asyncio
+import sys
+import threading
+import time
+
+
+_MISSING = object()
+_ABANDONED = object()
+
+
+def default_key(data: Any, kwargs: dict) -> Hashable:
+    """Cache key of an input: the input itself, plus the keyword arguments if any."""
+    if not kwargs:
+        return data
+    return data, tuple(sorted(kwargs.items()))
+
+
+class ResultCache:
+    """
+    Memoizes results by key, with LRU eviction, an optional TTL and an optional memory bound.
+
+    `call()` computes a missing value synchronously. `call_async()` also collapses
+    concurrent requests for the same key into a single in-flight computation
+    (single-flight): later callers await the first one instead of recomputing.
+    Exceptions are never cached.
+
+    Example:
+        cache = ResultCache(maxsize=10_000, ttl=60)
+        pipeline = HandlerPipeline(cache=cache)
+        ...
+        print(cache.hits, cache.misses, cache.evictions)
+
+    Args:
+        maxsize (int, optional): Maximum number of entries (None means unbounded).
+        ttl (float, optional): Seconds after which an entry expires.
+        max_bytes (int, optional): Maximum total size of the cached values, as
+            measured by `sizeof`. Values larger than this are not cached.
+        key (callable, optional): Maps `(data, kwargs)` to a hashable cache key.
+            Defaults to the input itself, plus the keyword arguments if any.
+        sizeof (callable): Measures a value, in bytes. Defaults to `sys.getsizeof`,
+            which does not follow references; pass a deep measure for containers.
+
+    Attributes:
+        hits (int): Lookups answered from the cache, or by joining an in-flight computation.
+        misses (int): Lookups that had to compute the value.
+        evictions (int): Entries removed to honour `maxsize` or `max_bytes`.
+        expirations (int): Entries dropped because their TTL elapsed.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = 1024,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        key: Optional[Callable[[Any, dict], Hashable]] = None,
+        sizeof: Callable[[Any], int] = sys.getsizeof,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.key = key or default_key
+        self._sizeof = sizeof
+        # key -> (value, expires at, size)
+        self._entries: OrderedDict[Hashable, tuple[Any, Optional[float], int]] = OrderedDict()
+        self._bytes = 0
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def bytes(self) -> int:
+        """Total size of the cached values, as measured by `sizeof`."""
+        return self._bytes
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for `key`, or `default`. Counts as a hit or a miss."""
+        value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Cache `value` under `key`, evicting the least recently used entries if needed."""
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+            self._entries[key] = (value, expires, size)
+            self._bytes += size
+
+            entries = self._entries
+            while (self.maxsize is not None and len(entries) > self.maxsize) or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                _, (_, _, evicted) = entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def call(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for `key`, computing and caching it on a miss."""
+        value = self._lookup(key)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    async def call_async(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value for `key`, awaiting `compute()` on a miss.
+
+        Concurrent calls for a key already being computed wait for that computation.
+        If the caller computing it is cancelled, one of the waiting callers takes over.
+        """
+        while True:
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            value = await asyncio.shield(inflight)
+            if value is not _ABANDONED:
+                self.hits += 1
+                return value
+
+        value = self._lookup(key)
+        if value is not _MISSING:
+            return value
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            # Only this caller was cancelled: wake the others so one of them recomputes
+            del self._inflight[key]
+            future.set_result(_ABANDONED)
+            raise
+        except BaseException as e:
+            del self._inflight[key]
+            future.set_exception(e)
+            # Nobody else may be waiting; don't report the exception as unretrieved
+            future.exception()
+            raise
+        else:
+            del self._inflight[key]
+            future.set_result(value)
+            self.put(key, value)
+            return value
+
+    def _lookup(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires, size = entry
+                if expires is None or expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+            self.misses += 1
+            return _MISSING
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Drop the entry for `key`. Returns False if it was not cached."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return False
+            self._bytes -= entry[2]
+            return True
+
+    def clear(self) -> None:
+        """Drop every entry (statistics are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and (entry[1] is None or entry[1] > time.monotonic())
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,237 @@
+import asyncio
+import gc
+
+import pytest
+
+from pattern_kit import Observable, Observer, AsyncObserver, Conflate, Debounce, Throttle, Coalesce, Isolate
+
+
+class Recorder(Observer):
+    def __init__(self):
+        self.calls = []
+
+    def notify(self, event, data=None):
+        self.calls.append((event, data))
+
+
+class AsyncRecorder(AsyncObserver):
+    def __init__(self):
+        self.calls = []
+
+    async def notify(self, event, data=None):
+        self.calls.append((event, data))
+
+
+async def test_conflate_delivers_latest_value_per_event():
+    obs = Observable()
+    observer = Recorder()
+    obs.add_observer(observer, delivery=Conflate(0.02))
+
+    for price in range(100):
+        obs.notify("price", price)
+    obs.notify("volume", 7)
+    assert observer.calls == []
+
+    await asyncio.sleep(0.05)
+    assert observer.calls == [("price", 99), ("volume", 7)]
+
+
+async def test_conflate_with_key_function():
+    obs = Observable()
+    observer = Recorder()
+    obs.add_observer(observer, delivery=Conflate(0.01, key=lambda event, data: data[0]))
+
+    for tick in [("AAPL", 1), ("MSFT", 2), ("AAPL", 3)]:
+        obs.notify("tick", tick)
+
+    await asyncio.sleep(0.03)
+    assert observer.calls == [("tick", ("AAPL", 3)), ("tick", ("MSFT", 2))]
+
+
+async def test_debounce_waits_for_quiet_period():
+    obs = Observable()
+    observer = Recorder()
+    obs.add_observer(observer, delivery=Debounce(0.03))
+
+    for i in range(5):
+        obs.notify("search", i)
+        await asyncio.sleep(0.01)
+    assert observer.calls == []
+
+    await asyncio.sleep(0.05)
+    assert observer.calls == [("search", 4)]
+
+
+async def test_throttle_delivers_leading_and_trailing():
+    obs = Observable()
+    observer = Recorder()
+    obs.add_observer(observer, delivery=Throttle(0.03))
+
+    for i in range(10):
+        obs.notify("price", i)
+    assert observer.calls == [("price", 0)]
+
+    await asyncio.sleep(0.05)
+    assert observer.calls == [("price", 0), ("price", 9)]
+
+    await asyncio.sleep(0.05)
+    obs.notify("price", 10)
+    assert observer.calls[-1] == ("price", 10)
+
+
+async def test_coalesce_hands_over_lists():
+    obs = Observable()
+    observer = Recorder()
+    obs.add_observer(observer, delivery=Coalesce(3, max_wait=0.02))
+
+    for i in range(7):
+        obs.notify("fill", i)
+    assert observer.calls == [("fill", [0, 1, 2]), ("fill", [3, 4, 5])]
+
+    await asyncio.sleep(0.04)
+    assert observer.calls[-1] == ("fill", [6])
+
+    with pytest.raises(ValueError):
+        Coalesce(0)
+
+
+async def test_delivery_modes_work_with_notify_async_and_async_observers():
+    obs = Observable()
+    observer = AsyncRecorder()
+    obs.add_observer(observer, delivery=Conflate(0.01))
+
+    await obs.notify_async("price", 1)
+    await obs.notify_async("price", 2)
+    await asyncio.sleep(0.03)
+    await obs.drain()
+    assert observer.calls == [("price", 2)]
+
+
+async def test_removed_observer_receives_nothing_held_back():
+    obs = Observable()
+    observer = Recorder()
+    obs.add_observer(observer, delivery=Conflate(0.01), events=["price"])
+    assert observer in obs._by_event["price"]
+
+    obs.notify("price", 1)
+    obs.remove_observer(observer)
+    await asyncio.sleep(0.03)
+    assert observer.calls == []
+
+
+async def test_flush_and_aclose_deliver_held_back_notifications():
+    obs = Observable()
+    observer = Recorder()
+    obs.add_observer(observer, delivery=Debounce(10))
+
+    obs.notify("a", 1)
+    obs.flush()
+    assert observer.calls == [("a", 1)]
+
+    obs.notify("a", 2)
+    await obs.aclose()
+    assert observer.calls == [("a", 1), ("a", 2)]
+
+
+async def test_weak_observer_with_delivery_is_removed_when_collected():
+    obs = Observable()
+    observer = Recorder()
+    subscription = obs.add_observer(observer, weak=True, delivery=Conflate(0.01))
+
+    del observer
+    gc.collect()
+    assert not subscription.active
+    obs.notify("a", 1)
+    await asyncio.sleep(0.02)
+
+
+class SlowObserver(AsyncObserver):
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.calls = []
+        self.release = asyncio.Event()
+
+    async def notify(self, event, data=None):
+        await self.release.wait()
+        self.calls.append(data)
+
+
+async def test_isolated_observer_does_not_stall_notify_async():
+    obs = Observable()
+    slow = SlowObserver()
+    fast = Recorder()
+    obs.add_observer(slow, delivery=Isolate(maxsize=10))
+    obs.add_observer(fast)
+
+    for i in range(5):
+        await asyncio.wait_for(obs.notify_async("tick", i), 0.1)
+    assert [data for _, data in fast.calls] == [0, 1, 2, 3, 4]
+
+    await asyncio.sleep(0)
+    gate = obs.gate(slow)
+    assert gate.depth == 4
+    assert gate.lag > 0
+    # Readable off the loop, e.g. from a metrics thread
+    assert await asyncio.get_running_loop().run_in_executor(None, lambda: gate.lag) > 0
+
+    slow.release.set()
+    await obs.aclose()
+    assert slow.calls == [0, 1, 2, 3, 4]
+    assert gate.delivered == 5
+    assert gate.depth == 0
+
+
+async def test_isolated_block_policy_holds_back_producer():
+    obs = Observable()
+    slow = SlowObserver()
+    obs.add_observer(slow, delivery=Isolate(maxsize=2))
+
+    for i in range(3):
+        await obs.notify_async("tick", i)
+    blocked = asyncio.create_task(obs.notify_async("tick", 3))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+
+    slow.release.set()
+    await asyncio.wait_for(blocked, 0.1)
+    await obs.aclose()
+    assert slow.calls == [0, 1, 2, 3]
+
+
+async def test_isolated_drop_policy():
+    obs = Observable()
+    slow = SlowObserver()
+    obs.add_observer(slow, delivery=Isolate(maxsize=2, overflow="drop_oldest"))
+
+    for i in range(6):
+        obs.notify("tick", i)
+    await asyncio.sleep(0)
+    for i in range(6, 10):
+        obs.notify("tick", i)
+
+    gate = obs.gate(slow)
+    assert gate.dropped == 7
+    slow.release.set()
+    await obs.aclose()
+    assert slow.calls == [4, 8, 9]
+
+
+async def test_isolated_disconnect_policy_removes_observer():
+    obs = Observable()
+    slow = SlowObserver()
+    subscription = obs.add_observer(slow, delivery=Isolate(maxsize=2, overflow="disconnect"))
+    gate = obs.gate(slow)
+
+    for i in range(4):
+        obs.notify("tick", i)
+
+    assert gate.disconnected
+    assert not subscription.active
+    assert obs.gate(slow) is None
+    obs.notify("tick", 5)
+    slow.release.set()
+    await asyncio.sleep(0.01)
+    assert slow.calls == []
+
+    with pytest.raises(ValueError):
+        Isolate(overflow="explode")
@@ -1,5 +1,9 @@
 import asyncio
-from unittest.mock import MagicMock, AsyncMock
+import gc
+import inspect
+from unittest.mock import MagicMock, AsyncMock, patch
+import pytest
+from pattern_kit import EmitError
 from pattern_kit.behavioral.event import Event
 
 
@@ -56,3 +60,341 @@ async def test_event_call_schedules_async_listeners():
     # Let the event loop run a bit to schedule the async listener
     await asyncio.sleep(0.05)
     listener.assert_awaited_once_with("fire-and-forget")
+
+
+def test_event_listener_added_during_call_runs_next_time():
+    event = Event()
+    late = MagicMock()
+
+    def subscriber(*args):
+        event.__iadd__(late)
+
+    event += subscriber
+    event("first")
+    late.assert_not_called()
+
+    event -= subscriber
+    event("second")
+    late.assert_called_once_with("second")
+
+
+def test_event_classifies_listeners_once():
+    event = Event()
+    calls = []
+    event += calls.append
+
+    with patch("inspect.iscoroutinefunction", wraps=inspect.iscoroutinefunction) as classify:
+        event("a")
+        event("b")
+        event("c")
+
+    assert classify.call_count == 1
+    assert calls == ["a", "b", "c"]
+
+
+async def test_event_concurrent_call_async_runs_listeners_together():
+    event = Event(concurrent=True)
+    running = []
+    peak = []
+
+    async def slow(_):
+        running.append(1)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.pop()
+
+    for _ in range(5):
+        event += slow
+
+    await event.call_async("x")
+    assert max(peak) == 5
+
+
+async def test_event_concurrent_respects_max_concurrency():
+    event = Event(concurrent=True, max_concurrency=2)
+    running = []
+    peak = []
+
+    async def slow(_):
+        running.append(1)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.pop()
+
+    for _ in range(5):
+        event += slow
+
+    await event.call_async("x")
+    assert max(peak) == 2
+
+
+async def test_event_concurrent_keeps_sync_order():
+    event = Event(concurrent=True)
+    order = []
+
+    async def async_listener(_):
+        order.append("async")
+
+    event += lambda _: order.append("sync-1")
+    event += async_listener
+    event += lambda _: order.append("sync-2")
+
+    await event.call_async("x")
+    assert order == ["sync-1", "sync-2", "async"]
+
+
+async def test_event_fail_fast_cancels_remaining():
+    event = Event(concurrent=True)
+    finished = []
+
+    async def failing(_):
+        raise RuntimeError("boom")
+
+    async def slow(_):
+        await asyncio.sleep(1)
+        finished.append(True)
+
+    event += slow
+    event += failing
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await event.call_async("x")
+    assert finished == []
+
+
+async def test_event_collect_errors_and_timeout():
+    event = Event(concurrent=True, timeout=0.01, errors="collect")
+    done = []
+
+    async def failing(_):
+        raise RuntimeError("boom")
+
+    async def too_slow(_):
+        await asyncio.sleep(1)
+
+    async def ok(_):
+        done.append(True)
+
+    event += failing
+    event += too_slow
+    event += ok
+
+    with pytest.raises(EmitError) as info:
+        await event.call_async("x")
+
+    assert done == [True]
+    assert [type(e) for e in info.value.errors] == [RuntimeError, asyncio.TimeoutError]
+
+
+def test_event_rejects_unknown_errors_mode():
+    with pytest.raises(ValueError):
+        Event(errors="ignore")
+
+
+async def test_event_tracks_tasks_and_drains():
+    event = Event()
+    done = []
+
+    async def listener(value):
+        await asyncio.sleep(0.01)
+        done.append(value)
+
+    event += listener
+    event(1)
+    event(2)
+    assert event.tasks.pending == 2
+
+    await event.drain()
+    assert done == [1, 2]
+    assert event.tasks.pending == 0
+    assert event.tasks.completed == 2
+
+
+async def test_event_counts_failed_tasks():
+    event = Event()
+    errors = []
+    asyncio.get_running_loop().set_exception_handler(lambda loop, ctx: errors.append(ctx["exception"]))
+
+    async def failing(_):
+        raise RuntimeError("boom")
+
+    event += failing
+    event("x")
+    await event.drain()
+
+    assert event.tasks.failed == 1
+    assert isinstance(errors[0], RuntimeError)
+
+
+async def test_event_block_policy_defers_calls():
+    event = Event(max_pending=1, overflow="block")
+    started = []
+
+    async def listener(value):
+        started.append(value)
+        await asyncio.sleep(0.01)
+
+    event += listener
+    event(1)
+    event(2)
+    await asyncio.sleep(0)
+
+    assert started == [1]
+    assert event.tasks.pending == 2
+
+    await event.drain()
+    assert started == [1, 2]
+
+
+async def test_event_drop_newest_policy():
+    event = Event(max_pending=1, overflow="drop_newest")
+    started = []
+
+    async def listener(value):
+        started.append(value)
+        await asyncio.sleep(0.01)
+
+    event += listener
+    event(1)
+    event(2)
+    await event.drain()
+
+    assert started == [1]
+    assert event.tasks.dropped == 1
+
+
+async def test_event_drop_oldest_policy():
+    event = Event(max_pending=1, overflow="drop_oldest")
+    finished = []
+
+    async def listener(value):
+        await asyncio.sleep(0.01)
+        finished.append(value)
+
+    event += listener
+    event(1)
+    event(2)
+    await event.drain()
+
+    assert finished == [2]
+    assert event.tasks.dropped == 1
+
+
+async def test_event_drop_oldest_skips_finished_tasks():
+    event = Event(max_pending=1, overflow="drop_oldest")
+    finished = []
+
+    async def listener(value):
+        finished.append(value)
+
+    event += listener
+    event(1)
+    await asyncio.sleep(0)  # The first task is done, its done-callback not run yet
+    event(2)
+    await event.drain()
+
+    assert finished == [1, 2]
+    assert (event.tasks.completed, event.tasks.dropped) == (2, 0)
+
+
+async def test_event_block_policy_bounds_the_backlog():
+    event = Event(max_pending=1, overflow="block", max_backlog=2)
+    started = []
+
+    async def listener(value):
+        started.append(value)
+        await asyncio.sleep(0.01)
+
+    event += listener
+    for i in range(5):
+        event(i)
+    assert event.tasks.pending == 3
+    assert event.tasks.dropped == 2
+
+    await event.drain()
+    assert started == [0, 1, 2]
+
+
+async def test_event_inline_policy_ignores_cap():
+    event = Event(max_pending=1, overflow="inline")
+    finished = []
+
+    async def listener(value):
+        await asyncio.sleep(0)
+        finished.append(value)
+
+    event += listener
+    event(1)
+    event(2)
+    await event.drain()
+
+    assert sorted(finished) == [1, 2]
+
+
+async def test_event_aclose_refuses_new_calls():
+    event = Event()
+    event += AsyncMock()
+
+    event("x")
+    await event.aclose()
+
+    with pytest.raises(RuntimeError):
+        event("y")
+
+
+def test_event_weak_listener_is_pruned():
+    class Listener:
+        def __init__(self):
+            self.calls = []
+
+        def on_event(self, value):
+            self.calls.append(value)
+
+    event = Event()
+    listener = Listener()
+    event.subscribe(listener.on_event, weak=True)
+
+    event(1)
+    assert listener.calls == [1]
+    assert listener.on_event in event._listeners
+
+    del listener
+    gc.collect()
+
+    event(2)
+    assert len(event._listeners) == 0
+    assert not event._listeners._entries
+
+
+async def test_event_weak_async_listener_after_collection():
+    class Listener:
+        async def on_event(self, value):
+            pass
+
+    event = Event()
+    listener = Listener()
+    event.subscribe(listener.on_event, weak=True)
+    plan = event._listeners.plan
+
+    del listener
+    gc.collect()
+
+    # A dispatch already holding the old snapshot must not fail
+    for target, is_async in plan.entries:
+        assert is_async
+        await target("x")
+    await event.call_async("y")
+
+
+def test_event_subscribe_once_and_priority():
+    event = Event()
+    calls = []
+
+    event += lambda value: calls.append(("normal", value))
+    event.subscribe(lambda value: calls.append(("first", value)), priority=1)
+    event.subscribe(lambda value: calls.append(("once", value)), once=True)
+
+    event(1)
+    event(2)
+
+    assert calls == [("first", 1), ("normal", 1), ("once", 1), ("first", 2), ("normal", 2)]
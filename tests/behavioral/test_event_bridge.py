@@ -0,0 +1,198 @@
+import asyncio
+import multiprocessing
+import pickle
+import time
+
+import pytest
+from pattern_kit import EventEmitter, EventBridge
+
+
+async def wait_for(predicate, timeout=2.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        if loop.time() > deadline:
+            raise TimeoutError
+        await asyncio.sleep(0.005)
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    return str(tmp_path / "bridge.sock")
+
+
+async def test_bridge_mirrors_topics_between_emitters(socket_path):
+    hub_emitter, client_emitter = EventEmitter(), EventEmitter()
+    hub_received, client_received = [], []
+    hub_emitter.on("orders", hub_received.append)
+    client_emitter.on("orders", client_received.append)
+
+    async with EventBridge(hub_emitter, ["orders"]) as hub, EventBridge(client_emitter, ["orders"]) as client:
+        await hub.serve(socket_path)
+        await client.connect(socket_path)
+        await wait_for(lambda: hub._peers)
+
+        client_emitter.emit("orders", {"id": 1})
+        hub_emitter.emit("orders", {"id": 2})
+
+        await wait_for(lambda: len(hub_received) == 2 and len(client_received) == 2)
+
+    # Each side sees its own event locally plus the mirrored one, without echo
+    assert hub_received == [{"id": 2}, {"id": 1}]
+    assert client_received == [{"id": 1}, {"id": 2}]
+
+
+async def test_bridge_only_forwards_selected_topics(socket_path):
+    hub_emitter, client_emitter = EventEmitter(), EventEmitter()
+    received = []
+    hub_emitter.on("private", received.append)
+
+    async with EventBridge(hub_emitter, ["public"]) as hub, EventBridge(client_emitter, ["public"]) as client:
+        await hub.serve(socket_path)
+        await client.connect(socket_path)
+
+        client_emitter.emit("private", 1)
+        client_emitter.emit("public", 2)
+        await wait_for(lambda: hub.received == 1)
+
+    assert received == []
+
+
+async def test_bridge_keeps_reading_after_a_listener_fails(socket_path):
+    hub_emitter, client_emitter = EventEmitter(), EventEmitter()
+    received, errors = [], []
+
+    def listener(data):
+        if data == "bad":
+            raise ValueError(data)
+        received.append(data)
+
+    hub_emitter.on("orders", listener)
+    asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context["exception"]))
+
+    async with EventBridge(hub_emitter, ["orders"]) as hub, EventBridge(client_emitter, ["orders"]) as client:
+        await hub.serve(socket_path)
+        await client.connect(socket_path)
+        await wait_for(lambda: hub._peers)
+
+        client_emitter.emit("orders", "bad")
+        client_emitter.emit("orders", "good")
+        await wait_for(lambda: received == ["good"])
+        assert len(hub._peers) == 1
+
+    assert [type(e) for e in errors] == [ValueError]
+
+
+async def test_bridge_serve_only_replaces_a_socket(tmp_path):
+    path = tmp_path / "data.txt"
+    path.write_text("keep me")
+    with pytest.raises(FileExistsError):
+        await EventBridge(EventEmitter(), ["x"]).serve(str(path))
+    assert path.read_text() == "keep me"
+
+
+async def test_bridge_hub_relays_between_clients(socket_path):
+    emitters = [EventEmitter() for _ in range(3)]
+    received = []
+    emitters[2].on("ticks", received.append)
+
+    bridges = [EventBridge(emitter, ["ticks"], serializer="raw") for emitter in emitters]
+    await bridges[0].serve(socket_path)
+    await bridges[1].connect(socket_path)
+    await bridges[2].connect(socket_path)
+    await wait_for(lambda: len(bridges[0]._peers) == 2)
+
+    for i in range(100):
+        emitters[1].emit("ticks", bytes([i]))
+
+    await wait_for(lambda: len(received) == 100)
+    assert [bytes(item) for item in received] == [bytes([i]) for i in range(100)]
+
+    for bridge in bridges:
+        await bridge.aclose()
+
+
+def _child(path, ready):
+    async def main():
+        emitter = EventEmitter()
+        done = asyncio.Event()
+        bridge = EventBridge(emitter, ["ping", "pong"])
+        emitter.on("ping", lambda data: (emitter.emit("pong", data * 2), done.set()))
+        await bridge.connect(path)
+        ready.set()
+        await done.wait()
+        await asyncio.sleep(0.05)
+        await bridge.aclose()
+
+    asyncio.run(main())
+
+
+async def test_bridge_between_processes(socket_path):
+    emitter = EventEmitter()
+    received = []
+    emitter.on("pong", received.append)
+
+    bridge = EventBridge(emitter, ["ping", "pong"])
+    await bridge.serve(socket_path)
+
+    ctx = multiprocessing.get_context("spawn")
+    ready = ctx.Event()
+    process = ctx.Process(target=_child, args=(socket_path, ready))
+    process.start()
+    try:
+        await asyncio.get_running_loop().run_in_executor(None, ready.wait, 10)
+        await wait_for(lambda: bridge._peers, timeout=10)
+
+        emitter.emit("ping", 21)
+        await wait_for(lambda: received, timeout=10)
+        assert received == [42]
+    finally:
+        await bridge.aclose()
+        process.join(10)
+
+
+def _flood(path, count):
+    async def main():
+        emitter = EventEmitter()
+        bridge = EventBridge(emitter, ["ticks"], serializer="raw")
+        await bridge.connect(path)
+        for i in range(count):
+            emitter.emit("ticks", i.to_bytes(4, "big") * 16)
+            if i % 1000 == 0:
+                await bridge.drain()
+        # Exits right after closing: every pending frame must be written by then
+        await bridge.aclose()
+
+    asyncio.run(main())
+
+
+async def test_bridge_aclose_delivers_pending_events_before_exit(socket_path):
+    count = 50_000
+    emitter = EventEmitter()
+    received = []
+
+    def listener(data):
+        received.append(int.from_bytes(data[:4], "big"))
+        if len(received) % 1000 == 0:
+            # Read slower than the sender writes, so that frames are still buffered when it closes
+            time.sleep(0.002)
+
+    emitter.on("ticks", listener)
+
+    bridge = EventBridge(emitter, ["ticks"], serializer="raw")
+    await bridge.serve(socket_path)
+
+    process = multiprocessing.get_context("spawn").Process(target=_flood, args=(socket_path, count))
+    process.start()
+    try:
+        await wait_for(lambda: len(received) == count or not process.is_alive() and not bridge._peers, timeout=30)
+        await asyncio.sleep(0.05)
+        assert received == list(range(count))
+    finally:
+        await bridge.aclose()
+        process.join(10)
+
+
+def test_bridge_rejects_unknown_serializer():
+    with pytest.raises(ValueError):
+        EventBridge(EventEmitter(), ["x"], serializer="json")
@@ -1,6 +1,9 @@
 import asyncio
+import threading
 from unittest.mock import MagicMock, AsyncMock, patch
-from pattern_kit import EventEmitter
+import pytest
+from pattern_kit import EventEmitter, EmitError
+from pattern_kit.behavioral._dispatch import PlanCache
 
 
 def test_add_and_remove_listener():
@@ -65,3 +68,360 @@ def test_emit_schedules_async_listeners():
 
         # Manually close the coroutine to suppress any warning
         called_coro.close()
+
+
+def test_listener_removed_during_emit_keeps_snapshot():
+    emitter = EventEmitter()
+    second = MagicMock()
+
+    def first(data):
+        if second in emitter._listeners["event"]:
+            emitter.off("event", second)
+
+    emitter.on("event", first)
+    emitter.on("event", second)
+
+    emitter.emit("event", 1)
+    second.assert_called_once_with(1)
+
+    emitter.emit("event", 2)
+    second.assert_called_once_with(1)
+
+
+def test_emit_unknown_event_is_noop():
+    emitter = EventEmitter()
+    emitter.emit("nothing", 1)
+    assert "nothing" not in emitter._listeners
+
+
+async def test_emit_async_concurrent_collects_errors():
+    emitter = EventEmitter(concurrent=True, errors="collect")
+    received = []
+
+    async def failing(data):
+        raise ValueError(data)
+
+    async def ok(data):
+        await asyncio.sleep(0)
+        received.append(data)
+
+    emitter.on("event", failing)
+    emitter.on("event", ok)
+
+    with pytest.raises(EmitError) as info:
+        await emitter.emit_async("event", 7)
+
+    assert received == [7]
+    assert isinstance(info.value.errors[0], ValueError)
+
+
+async def test_emit_tasks_are_tracked():
+    emitter = EventEmitter(max_pending=2, overflow="drop_newest")
+    listener = AsyncMock()
+    emitter.on("event", listener)
+
+    for i in range(5):
+        emitter.emit("event", i)
+
+    await emitter.drain()
+    assert listener.await_count == 2
+    assert emitter.tasks.completed == 2
+    assert emitter.tasks.dropped == 3
+
+
+def test_plan_cache_invalidated_during_put():
+    # Stands in for a weak listener collected by the GC while a plan is being cached
+    cache = PlanCache()
+
+    class Key:
+        def __hash__(self):
+            cache.invalidate()
+            return 0
+
+    cache.put(Key(), MagicMock(), cache.version)
+    assert len(cache) == 0
+
+
+def test_weak_callable_object_listener():
+    class Listener:
+        def __init__(self):
+            self.calls = []
+
+        def __call__(self, data):
+            self.calls.append(data)
+
+    emitter = EventEmitter()
+    listener = Listener()
+    emitter.on("event", listener, weak=True)
+
+    emitter.emit("event", 1)
+    assert listener.calls == [1]
+
+    emitter.off("event", listener)
+    emitter.emit("event", 2)
+    assert listener.calls == [1]
+
+
+def test_wildcard_single_segment():
+    emitter = EventEmitter(wildcards=True)
+    listener = MagicMock()
+    emitter.on("orders.*.filled", listener)
+
+    emitter.emit("orders.42.filled", "a")
+    emitter.emit("orders.42.cancelled", "b")
+    emitter.emit("orders.42.x.filled", "c")
+
+    listener.assert_called_once_with("a")
+
+
+def test_wildcard_multi_segment():
+    emitter = EventEmitter(wildcards=True)
+    listener = MagicMock()
+    emitter.on("orders.#", listener)
+
+    emitter.emit("orders", 1)
+    emitter.emit("orders.42", 2)
+    emitter.emit("orders.42.filled", 3)
+    emitter.emit("trades.1", 4)
+
+    assert [c.args[0] for c in listener.call_args_list] == [1, 2, 3]
+
+
+def test_wildcard_and_exact_listeners_keep_registration_order():
+    emitter = EventEmitter(wildcards=True)
+    calls = []
+    emitter.on("orders.#", lambda d: calls.append("multi"))
+    emitter.on("orders.1.filled", lambda d: calls.append("exact"))
+    emitter.on("orders.*.filled", lambda d: calls.append("single"))
+    emitter.on("#.filled", lambda d: calls.append("suffix"))
+
+    emitter.emit("orders.1.filled")
+    assert calls == ["multi", "exact", "single", "suffix"]
+
+
+def test_wildcard_cache_invalidated_on_change():
+    emitter = EventEmitter(wildcards=True)
+    first = MagicMock()
+    second = MagicMock()
+
+    emitter.on("orders.*", first)
+    emitter.emit("orders.1", 1)
+    assert "orders.1" in emitter._topic_plans
+
+    emitter.on("orders.1", second)
+    emitter.emit("orders.1", 2)
+    second.assert_called_once_with(2)
+
+    emitter.off("orders.*", first)
+    emitter.emit("orders.1", 3)
+    assert first.call_count == 2
+
+
+def test_wildcard_disabled_by_default():
+    emitter = EventEmitter()
+    listener = MagicMock()
+    emitter.on("orders.*", listener)
+
+    emitter.emit("orders.1", 1)
+    listener.assert_not_called()
+
+    emitter.emit("orders.*", 2)
+    listener.assert_called_once_with(2)
+
+
+def test_wildcard_off_unknown_pattern():
+    emitter = EventEmitter(wildcards=True)
+    with pytest.raises(ValueError):
+        emitter.off("orders.*", MagicMock())
+
+
+async def test_wildcard_emit_async():
+    emitter = EventEmitter(wildcards=True)
+    listener = AsyncMock()
+    emitter.on("ticks.#", listener)
+
+    await emitter.emit_async("ticks.btc.usd", 100)
+    listener.assert_awaited_once_with(100)
+
+
+async def test_loop_bound_emit_from_threads():
+    loop = asyncio.get_running_loop()
+    emitter = EventEmitter(loop=loop)
+    received = []
+    threads_seen = set()
+    done = asyncio.Event()
+
+    def listener(data):
+        received.append(data)
+        threads_seen.add(threading.get_ident())
+        if len(received) == 4000:
+            done.set()
+
+    emitter.on("tick", listener)
+
+    def produce(offset):
+        for i in range(1000):
+            emitter.emit("tick", offset + i)
+
+    with patch.object(loop, "call_soon_threadsafe", wraps=loop.call_soon_threadsafe) as wakeup:
+        threads = [threading.Thread(target=produce, args=(n * 1000,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        await asyncio.wait_for(done.wait(), 5)
+
+    assert sorted(received) == list(range(4000))
+    assert threads_seen == {threading.get_ident()}
+    # Events are drained in batches, not one wakeup per event
+    assert wakeup.call_count < 4000
+
+
+async def test_loop_bound_emit_on_loop_is_synchronous():
+    emitter = EventEmitter(loop=asyncio.get_running_loop())
+    listener = MagicMock()
+    emitter.on("event", listener)
+
+    emitter.emit("event", 1)
+    listener.assert_called_once_with(1)
+
+
+async def test_loop_bound_async_listener_from_thread():
+    emitter = EventEmitter(loop=asyncio.get_running_loop())
+    listener = AsyncMock()
+    emitter.on("event", listener)
+
+    thread = threading.Thread(target=emitter.emit, args=("event", 1))
+    thread.start()
+    thread.join()
+
+    await asyncio.sleep(0.01)
+    await emitter.drain()
+    listener.assert_awaited_once_with(1)
+
+
+def test_loop_bound_emit_after_loop_closed_keeps_raising():
+    loop = asyncio.new_event_loop()
+    emitter = EventEmitter(loop=loop)
+    emitter.on("event", MagicMock())
+    loop.close()
+
+    # Each emit reports the closed loop instead of buffering events silently
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            emitter.emit("event", 1)
+
+
+def test_on_returns_cancellable_subscription():
+    emitter = EventEmitter()
+    listener = MagicMock()
+
+    subscription = emitter.on("event", listener)
+    assert subscription.active
+
+    assert subscription.cancel() is True
+    assert not subscription.active
+    assert subscription.cancel() is False
+
+    emitter.emit("event", 1)
+    listener.assert_not_called()
+
+
+def test_subscription_as_context_manager():
+    emitter = EventEmitter()
+    listener = MagicMock()
+
+    with emitter.on("event", listener):
+        emitter.emit("event", 1)
+    emitter.emit("event", 2)
+
+    listener.assert_called_once_with(1)
+
+
+def test_once_listener_fires_once():
+    emitter = EventEmitter()
+    listener = MagicMock()
+    subscription = emitter.once("event", listener)
+
+    emitter.emit("event", 1)
+    emitter.emit("event", 2)
+
+    listener.assert_called_once_with(1)
+    assert not subscription.active
+    assert listener not in emitter._listeners["event"]
+
+
+def test_once_listener_not_called_twice_on_reentrant_emit():
+    emitter = EventEmitter()
+    calls = []
+
+    def reentrant(data):
+        if data == 1:
+            emitter.emit("event", 2)
+
+    emitter.on("event", reentrant)
+    emitter.once("event", calls.append)
+    emitter.emit("event", 1)
+
+    # The nested emit ran first and consumed the once-listener
+    assert calls == [2]
+
+
+async def test_once_async_listener():
+    emitter = EventEmitter()
+    listener = AsyncMock()
+    emitter.once("event", listener)
+
+    await emitter.emit_async("event", 1)
+    await emitter.emit_async("event", 2)
+    listener.assert_awaited_once_with(1)
+
+
+def test_priority_ordering_is_stable():
+    emitter = EventEmitter()
+    calls = []
+
+    emitter.on("event", lambda d: calls.append("low"), priority=-1)
+    emitter.on("event", lambda d: calls.append("default-1"))
+    emitter.on("event", lambda d: calls.append("high"), priority=10)
+    emitter.on("event", lambda d: calls.append("default-2"))
+
+    emitter.emit("event")
+    assert calls == ["high", "default-1", "default-2", "low"]
+
+
+def test_priority_across_wildcard_patterns():
+    emitter = EventEmitter(wildcards=True)
+    calls = []
+
+    emitter.on("orders.#", lambda d: calls.append("pattern"))
+    emitter.on("orders.1", lambda d: calls.append("exact"), priority=5)
+
+    emitter.emit("orders.1")
+    assert calls == ["exact", "pattern"]
+
+
+def test_off_removes_first_duplicate_only():
+    emitter = EventEmitter()
+    listener = MagicMock()
+
+    emitter.on("event", listener)
+    emitter.on("event", listener)
+    emitter.off("event", listener)
+
+    emitter.emit("event", 1)
+    listener.assert_called_once_with(1)
+
+
+def test_off_many_subscriptions():
+    emitter = EventEmitter()
+    listeners = [MagicMock() for _ in range(1000)]
+    for listener in listeners:
+        emitter.on("event", listener)
+
+    for listener in listeners[::2]:
+        emitter.off("event", listener)
+
+    emitter.emit("event", 1)
+    assert sum(listener.called for listener in listeners) == 500
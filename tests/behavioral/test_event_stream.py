@@ -0,0 +1,141 @@
+import asyncio
+
+import pytest
+from pattern_kit import Event, EventEmitter, EventStream
+
+
+async def test_emitter_stream_yields_items():
+    emitter = EventEmitter()
+    stream = emitter.stream("ticks")
+
+    for i in range(3):
+        emitter.emit("ticks", i)
+    stream.close()
+
+    assert [item async for item in stream] == [0, 1, 2]
+
+
+async def test_stream_close_unsubscribes():
+    emitter = EventEmitter()
+    async with emitter.stream("ticks") as stream:
+        emitter.emit("ticks", 1)
+
+    emitter.emit("ticks", 2)
+    assert len(stream) == 1
+    assert len(emitter._listeners["ticks"]) == 0
+
+
+async def test_stream_drop_oldest():
+    emitter = EventEmitter()
+    stream = emitter.stream("ticks", maxsize=2, overflow="drop_oldest")
+
+    for i in range(5):
+        emitter.emit("ticks", i)
+
+    assert await stream.get_batch(10) == [3, 4]
+    assert stream.dropped == 3
+
+
+async def test_stream_drop_newest():
+    emitter = EventEmitter()
+    stream = emitter.stream("ticks", maxsize=2, overflow="drop_newest")
+
+    for i in range(5):
+        emitter.emit("ticks", i)
+
+    assert await stream.get_batch(10) == [0, 1]
+    assert stream.dropped == 3
+
+
+async def test_stream_block_applies_backpressure():
+    emitter = EventEmitter()
+    stream = emitter.stream("ticks", maxsize=1)
+
+    await emitter.emit_async("ticks", 1)
+    producer = asyncio.create_task(emitter.emit_async("ticks", 2))
+    await asyncio.sleep(0.01)
+    assert not producer.done()
+
+    assert await stream.get() == 1
+    await asyncio.wait_for(producer, 1)
+    assert await stream.get() == 2
+
+
+async def test_stream_block_with_fire_and_forget_emit_keeps_order():
+    emitter = EventEmitter()
+    stream = emitter.stream("ticks", maxsize=2)
+
+    for i in range(10):
+        emitter.emit("ticks", i)
+
+    received = []
+    while len(received) < 10:
+        received += await stream.get_batch(4)
+    assert received == list(range(10))
+
+
+async def test_get_batch_waits_for_first_item():
+    stream = EventStream()
+
+    async def produce():
+        await asyncio.sleep(0.01)
+        stream.put_nowait("a")
+        stream.put_nowait("b")
+
+    asyncio.create_task(produce())
+    assert await stream.get_batch(5) == ["a", "b"]
+
+
+async def test_get_after_close_raises():
+    stream = EventStream()
+    stream.close()
+
+    with pytest.raises(EOFError):
+        await stream.get()
+    assert await stream.get_batch(3) == []
+
+
+async def test_close_wakes_waiting_consumer():
+    stream = EventStream()
+    consumer = asyncio.create_task(stream.get_batch(3))
+    await asyncio.sleep(0)
+
+    stream.close()
+    assert await asyncio.wait_for(consumer, 1) == []
+
+
+async def test_event_stream_packs_arguments():
+    event = Event()
+    stream = event.stream(overflow="drop_oldest", maxsize=10)
+
+    event("single")
+    event("a", "b")
+    stream.close()
+
+    assert [item async for item in stream] == ["single", ("a", "b")]
+
+
+async def test_each_stream_has_its_own_buffer():
+    emitter = EventEmitter()
+    fast = emitter.stream("ticks", maxsize=10, overflow="drop_newest")
+    slow = emitter.stream("ticks", maxsize=1, overflow="drop_newest")
+
+    for i in range(3):
+        emitter.emit("ticks", i)
+
+    assert await fast.get_batch(10) == [0, 1, 2]
+    assert await slow.get_batch(10) == [0]
+
+
+def test_stream_rejects_unknown_policy():
+    with pytest.raises(ValueError):
+        EventStream(overflow="error")
+
+
+async def test_peek_returns_oldest_item_without_removing_it():
+    stream = EventStream()
+    assert stream.peek() is None
+    stream.put_nowait(1)
+    stream.put_nowait(2)
+    assert stream.peek() == 1
+    assert len(stream) == 2
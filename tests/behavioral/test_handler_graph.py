@@ -0,0 +1,122 @@
+import asyncio
+import time
+
+import pytest
+from pattern_kit import HandlerGraph, Handler, AsyncHandler, StopPipeline
+
+
+class Lookup(AsyncHandler):
+    def __init__(self, value, delay=0.05):
+        self.value = value
+        self.delay = delay
+
+    async def handle(self, data):
+        await asyncio.sleep(self.delay)
+        return f"{self.value}:{data}"
+
+
+class Merge(Handler):
+    needs = ("geo", "user")
+
+    def handle(self, data, geo, user):
+        return {"request": data, "geo": geo, "user": user}
+
+
+def make_graph():
+    graph = HandlerGraph()
+    graph.add("geo", Lookup("geo"))
+    graph.add("user", Lookup("user"))
+    graph.add("merged", Merge())
+    return graph
+
+
+async def test_independent_branches_run_concurrently_and_join():
+    graph = make_graph()
+
+    started = time.perf_counter()
+    result = await graph.run_async("r1")
+    elapsed = time.perf_counter() - started
+
+    assert result == {"request": "r1", "geo": "geo:r1", "user": "user:r1"}
+    assert elapsed < 0.09
+    assert graph.outputs == ["merged"]
+
+
+def test_sync_run_and_multiple_outputs():
+    class Upper(Handler):
+        def handle(self, data, **kwargs):
+            return data.upper()
+
+    class Suffix(Handler):
+        def handle(self, data, upper):
+            return upper + "!"
+
+    graph = HandlerGraph()
+    graph.add("upper", Upper())
+    graph.add("suffix", Suffix(), needs=["upper"])
+    graph.add("length", Upper())
+    assert graph.run("hi") == {"suffix": "HI!", "length": "HI"}
+
+
+async def test_stop_pipeline_short_circuits_every_branch():
+    finished = []
+
+    class Slow(AsyncHandler):
+        async def handle(self, data):
+            await asyncio.sleep(1)
+            finished.append("slow")
+
+    class Reject(AsyncHandler):
+        async def handle(self, data):
+            await asyncio.sleep(0.01)
+            raise StopPipeline("rejected")
+
+    class After(Handler):
+        def handle(self, data, **kwargs):
+            finished.append("after")
+
+    graph = HandlerGraph()
+    graph.add("slow", Slow())
+    graph.add("reject", Reject())
+    graph.add("after", After(), needs=["reject", "slow"])
+
+    assert await asyncio.wait_for(graph.run_async(1), 0.5) == "rejected"
+    assert finished == []
+
+
+async def test_errors_propagate_and_skipped_handlers_yield_none():
+    class Skip(Handler):
+        def can_handle(self, data, **kwargs):
+            return False
+
+        def handle(self, data, **kwargs):
+            return "never"
+
+    class Boom(AsyncHandler):
+        async def handle(self, data, **kwargs):
+            raise RuntimeError("boom")
+
+    graph = HandlerGraph()
+    graph.add("user", Skip())
+    graph.add("geo", Lookup("geo", delay=0))
+    graph.add("echo", Merge())
+    result = await graph.run_async(1)
+    assert result["geo"] == "geo:1" and result["user"] is None
+
+    graph.add("boom", Boom(), needs=["echo"])
+    with pytest.raises(RuntimeError):
+        await graph.run_async(1)
+
+
+def test_graph_validation():
+    graph = make_graph()
+    with pytest.raises(ValueError):
+        graph.add("geo", Lookup("geo"))
+    with pytest.raises(ValueError):
+        graph.add("late", Merge(), needs=["missing"])
+    with pytest.raises(ValueError):
+        graph.remove("geo")
+
+    graph.remove("merged")
+    graph.remove("geo")
+    assert graph.outputs == ["user"]
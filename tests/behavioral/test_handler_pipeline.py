@@ -1,5 +1,11 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from pattern_kit import HandlerPipeline, Handler, AsyncHandler, StopPipeline
+from pattern_kit.utils.result_cache import ResultCache
 
 
 # --- Dummy handlers for tests ---
@@ -169,3 +175,599 @@ async def test_async_pipeline_with_sync_only():
     pipeline += SyncAddOne()
     pipeline += SyncAddOne()
     assert await pipeline.run_async(10) == 12
+
+
+# ---------- compiled plan ----------
+
+def test_compile_skips_default_can_handle_and_classifies_stages():
+    pipeline = HandlerPipeline()
+    pipeline += AddOneHandler()
+    pipeline += AlwaysSkipHandler()
+    pipeline += AsyncMultiply()
+
+    plan = pipeline.compile()
+    assert [can_handle is None for _, can_handle, _ in plan.stages] == [True, False, True]
+    assert [is_async for _, _, is_async in plan.stages] == [False, False, True]
+    assert plan.filtered and plan.has_async
+
+
+def test_plan_is_rebuilt_after_handlers_change():
+    pipeline = HandlerPipeline(pass_result=True)
+    pipeline += AddOneHandler()
+    assert pipeline.run(1) == 2
+    first_plan = pipeline._plan
+
+    multiply = MultiplyHandler()
+    pipeline += multiply
+    assert pipeline.run(1) == 4
+    assert pipeline._plan is not first_plan
+
+    pipeline -= multiply
+    assert pipeline.run(1) == 2
+
+
+def test_kwargs_are_only_forwarded_when_provided():
+    class WithContext(Handler):
+        def can_handle(self, data, **kwargs):
+            return kwargs.get("enabled", True)
+
+        def handle(self, data, **kwargs):
+            return data + kwargs.get("step", 1)
+
+    pipeline = HandlerPipeline(pass_result=True)
+    pipeline += AddOneHandler()
+    assert pipeline.run(1) == 2
+
+    pipeline -= pipeline._handlers[0]
+    pipeline += WithContext()
+    assert pipeline.run(1) == 2
+    assert pipeline.run(1, step=5) == 6
+    assert pipeline.run(1, enabled=False) == 1
+
+
+async def test_run_async_with_sync_plan_matches_run():
+    pipeline = HandlerPipeline(pass_result=False)
+    pipeline += AddOneHandler()
+    pipeline += MultiplyHandler()
+
+    assert not pipeline.compile().has_async
+    assert await pipeline.run_async(3) == pipeline.run(3) == 6
+
+
+# ---------- batch execution ----------
+
+class BatchDouble(Handler):
+    def __init__(self):
+        self.batches = []
+
+    def handle(self, data):
+        return data * 2
+
+    def handle_batch(self, items):
+        self.batches.append(list(items))
+        return [item * 2 for item in items]
+
+
+class OnlyOdd(Handler):
+    def can_handle(self, data):
+        return data % 2 == 1
+
+    def handle(self, data):
+        return data * 100
+
+
+def test_run_many_matches_run_for_each_item():
+    pipeline = HandlerPipeline(pass_result=True)
+    pipeline += AddOneHandler()
+    pipeline += StopIfEvenHandler()
+    pipeline += OnlyOdd()
+    pipeline += MultiplyHandler()
+
+    items = list(range(10))
+    assert pipeline.run_many(items, batch_size=3) == [pipeline.run(item) for item in items]
+
+
+def test_run_many_hands_whole_batches_to_handle_batch():
+    doubler = BatchDouble()
+    pipeline = HandlerPipeline(pass_result=True)
+    pipeline += AddOneHandler()
+    pipeline += StopIfEvenHandler()
+    pipeline += doubler
+
+    assert pipeline.run_many(iter(range(6)), batch_size=4) == [2, None, 6, None, 10, None]
+    # Stopped items never reach the batch handler
+    assert doubler.batches == [[1, 3], [5]]
+
+
+def test_handle_batch_can_stop_single_items_or_whole_batch():
+    class StopLarge(Handler):
+        def handle(self, data):
+            return data
+
+        def handle_batch(self, items):
+            return [StopPipeline("large") if item > 2 else item for item in items]
+
+    class StopAll(Handler):
+        def handle(self, data):
+            return data
+
+        def handle_batch(self, items):
+            raise StopPipeline("all")
+
+    pipeline = HandlerPipeline(pass_result=True)
+    pipeline += StopLarge()
+    pipeline += AddOneHandler()
+    assert pipeline.run_many([1, 2, 3]) == [2, 3, "large"]
+
+    pipeline += StopAll()
+    assert pipeline.run_many([1, 5]) == ["all", "large"]
+
+
+def test_run_many_rejects_mismatched_batch_results():
+    class Broken(Handler):
+        def handle(self, data):
+            return data
+
+        def handle_batch(self, items):
+            return items[:1]
+
+    pipeline = HandlerPipeline()
+    pipeline += Broken()
+    with pytest.raises(ValueError):
+        pipeline.run_many([1, 2])
+
+
+async def test_run_many_async_mixes_sync_async_and_batch_handlers():
+    class AsyncBatchAdd(AsyncHandler):
+        async def handle(self, data):
+            return data + 10
+
+        async def handle_batch(self, items):
+            return [item + 10 for item in items]
+
+    pipeline = HandlerPipeline(pass_result=True)
+    pipeline += SyncAddOne()
+    pipeline += AsyncStopIfNegative()
+    pipeline += AsyncMultiply()
+    pipeline += AsyncBatchAdd()
+
+    items = [-3, 0, 4, -1]
+    expected = [await pipeline.run_async(item) for item in items]
+    assert await pipeline.run_many_async(items, batch_size=3) == expected == [None, 12, 20, 10]
+
+
+# ---------- streaming ----------
+
+class SlowAsyncAdd(AsyncHandler):
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def handle(self, data):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01 if data % 3 == 0 else 0.001)
+        self.active -= 1
+        return data + 1
+
+
+async def test_stream_yields_results_in_order():
+    slow = SlowAsyncAdd()
+    pipeline = HandlerPipeline(pass_result=True)
+    pipeline += slow
+    pipeline += StopIfEvenHandler()
+    pipeline += MultiplyHandler()
+
+    items = list(range(20))
+    expected = [await pipeline.run_async(item) for item in items]
+
+    async with pipeline.stream(items, workers=[4, 1, 1], maxsize=2) as results:
+        assert [result async for result in results] == expected
+    assert slow.peak > 1
+
+
+async def test_stream_unordered_from_async_source():
+    async def source():
+        for i in range(10):
+            yield i
+
+    pipeline = HandlerPipeline(pass_result=True)
+    pipeline += SlowAsyncAdd()
+
+    results = [result async for result in pipeline.stream(source(), workers=3, ordered=False)]
+    assert sorted(results) == list(range(1, 11))
+
+
+async def test_stream_reports_stage_stats_and_applies_backpressure():
+    gate = asyncio.Event()
+
+    class Blocked(AsyncHandler):
+        async def handle(self, data):
+            await gate.wait()
+            return data
+
+    pipeline = HandlerPipeline()
+    pipeline += AddOneHandler()
+    pipeline += Blocked()
+
+    stream = pipeline.stream(range(1000), maxsize=4)
+    consumer = asyncio.create_task(stream.__anext__())
+    await asyncio.sleep(0.01)
+
+    first, second = stream.stats
+    assert first.name == "AddOneHandler"
+    assert second.queued == second.capacity == 4
+    assert first.processed < 20
+
+    gate.set()
+    assert await consumer == 0
+    rest = [result async for result in stream]
+    assert len(rest) == 999
+    assert second.processed == 1000
+    assert first.throughput > 0
+
+
+async def test_stream_raises_handler_errors():
+    class Boom(Handler):
+        def handle(self, data):
+            if data == 3:
+                raise RuntimeError("boom")
+            return data
+
+    pipeline = HandlerPipeline()
+    pipeline += Boom()
+
+    with pytest.raises(RuntimeError):
+        async with pipeline.stream(range(10)) as results:
+            async for _ in results:
+                pass
+
+    with pytest.raises(ValueError):
+        pipeline.stream(range(3), workers=[1, 2])
+
+
+# ---------- executors ----------
+
+class ThreadName(Handler):
+    executor = "thread"
+
+    def handle(self, data):
+        return threading.current_thread().name
+
+
+class ProcessId(Handler):
+    def handle(self, data):
+        if data < 0:
+            raise StopPipeline("negative")
+        return os.getpid()
+
+
+def test_executor_handlers_run_inline_in_sync_run():
+    pipeline = HandlerPipeline()
+    pipeline += ThreadName()
+    assert pipeline.run(1) == threading.current_thread().name
+
+
+async def test_thread_executor_offloads_run_async():
+    pipeline = HandlerPipeline()
+    pipeline += ThreadName()
+    assert await pipeline.run_async(1) != threading.current_thread().name
+
+    with ThreadPoolExecutor(2, thread_name_prefix="custom") as executor:
+        pipeline = HandlerPipeline()
+        pipeline.add_handler(ThreadName(), executor=executor)
+        assert (await pipeline.run_async(1)).startswith("custom")
+        assert all(name.startswith("custom") for name in await pipeline.run_many_async(range(4)))
+
+
+async def test_process_executor_offloads_and_keeps_stop_results():
+    pipeline = HandlerPipeline()
+    pipeline.add_handler(ProcessId(), executor="process")
+    try:
+        assert await pipeline.run_async(1) != os.getpid()
+        assert await pipeline.run_async(-1) == "negative"
+        results = [result async for result in pipeline.stream(range(4), workers=2)]
+        assert os.getpid() not in results
+    finally:
+        pipeline.close()
+
+
+def test_executor_is_validated_at_registration():
+    class Unpicklable(Handler):
+        def __init__(self):
+            self.callback = lambda data: data
+
+        def handle(self, data):
+            return self.callback(data)
+
+    pipeline = HandlerPipeline()
+    with pytest.raises(TypeError):
+        pipeline.add_handler(Unpicklable(), executor="process")
+    with pytest.raises(ValueError):
+        pipeline.add_handler(AddOneHandler(), executor="gpu")
+    with pytest.raises(ValueError):
+        pipeline.add_handler(AsyncMultiply(), executor="thread")
+    assert pipeline._handlers == []
+
+    pipeline.add_handler(Unpicklable(), executor="thread")
+    assert pipeline.run(3) == 3
+
+
+# ---------- type-indexed routing ----------
+
+class Message:
+    pass
+
+
+class Order(Message):
+    def __init__(self, qty):
+        self.qty = qty
+
+
+class Cancel(Message):
+    pass
+
+
+class Recording(Handler):
+    def __init__(self, name, log, handles=None):
+        self.name = name
+        self.log = log
+        if handles is not None:
+            self.handles = handles
+
+    def handle(self, data):
+        self.log.append(self.name)
+        return self.name
+
+
+def test_routing_only_visits_matching_handlers():
+    log = []
+    visited = []
+
+    class LargeOrders(Recording):
+        handles = (Order,)
+
+        def can_handle(self, data):
+            visited.append(data)
+            return data.qty > 10
+
+    pipeline = HandlerPipeline()
+    pipeline += Recording("orders", log, handles=(Order,))
+    pipeline += Recording("cancels", log, handles=Cancel)
+    pipeline += Recording("messages", log, handles=(Message,))
+    pipeline += LargeOrders("large", log)
+    pipeline += Recording("everything", log)
+
+    assert pipeline.run(Order(5)) == "everything"
+    assert log == ["orders", "messages", "everything"]
+    assert len(visited) == 1
+
+    log.clear()
+    pipeline.run(Order(50))
+    assert log == ["orders", "messages", "large", "everything"]
+
+    log.clear()
+    pipeline.run(Cancel())
+    pipeline.run("text")
+    assert log == ["cancels", "messages", "everything", "everything"]
+    assert len(visited) == 2
+
+
+def test_routes_are_cached_and_invalidated():
+    log = []
+    pipeline = HandlerPipeline()
+    pipeline += Recording("orders", log, handles=(Order,))
+    pipeline.run(Order(1))
+    route = pipeline._router._routes[Order]
+    pipeline.run(Order(2))
+    assert pipeline._router._routes[Order] is route
+
+    pipeline += Recording("more orders", log, handles=(Order,))
+    log.clear()
+    pipeline.run(Order(3))
+    assert log == ["orders", "more orders"]
+
+
+async def test_routing_with_keys_and_async_run():
+    log = []
+    pipeline = HandlerPipeline(route_key=lambda message: message["type"])
+    pipeline += Recording("fill", log, handles=("fill",))
+    pipeline += Recording("quote", log, handles=("quote", "indicative"))
+
+    assert await pipeline.run_async({"type": "indicative"}) == "quote"
+    assert pipeline.run({"type": "fill"}) == "fill"
+    assert pipeline.run({"type": "other"}) == {"type": "other"}
+    assert log == ["quote", "fill"]
+
+    with pytest.raises(TypeError):
+        HandlerPipeline().add_handler(Recording("bad", log, handles=("fill",)))
+
+
+def test_routing_with_pass_result_checks_each_stage():
+    class ToText(Handler):
+        handles = (int,)
+
+        def handle(self, data):
+            return str(data)
+
+    class Shout(Handler):
+        handles = (str,)
+
+        def handle(self, data):
+            return data + "!"
+
+    pipeline = HandlerPipeline(pass_result=True)
+    pipeline += Shout()
+    pipeline += ToText()
+    pipeline += Shout()
+
+    assert pipeline.run(1) == "1!"
+    assert pipeline.run("a") == "a!!"
+    assert pipeline.run_many([1, "a", 2.5]) == ["1!", "a!!", 2.5]
+
+
+# ---------- result caching ----------
+
+class KwargsTracker(TrackingHandler):
+    def handle(self, data, **kwargs):
+        return super().handle(data)
+
+
+class CountingLookup(AsyncHandler):
+    def __init__(self):
+        self.calls = 0
+
+    async def handle(self, data, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return data * 10 + kwargs.get("offset", 0)
+
+
+def test_pipeline_cache_memoizes_run():
+    tracker = KwargsTracker()
+    cache = ResultCache()
+    pipeline = HandlerPipeline(cache=cache)
+    pipeline += tracker
+
+    assert [pipeline.run(1), pipeline.run(1), pipeline.run(2), pipeline.run(1, tag="x")] == [1, 1, 2, 1]
+    assert tracker.calls == [1, 2, 1]
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+async def test_pipeline_cache_single_flight_run_async():
+    lookup = CountingLookup()
+    pipeline = HandlerPipeline(cache=ResultCache(ttl=60))
+    pipeline += lookup
+
+    results = await asyncio.gather(*(pipeline.run_async(4) for _ in range(5)))
+    assert results == [40] * 5
+    assert lookup.calls == 1
+
+
+async def test_handler_cache_only_memoizes_that_handler():
+    lookup = CountingLookup()
+    tracker = KwargsTracker()
+    cache = ResultCache(key=lambda data, kwargs: data)
+    pipeline = HandlerPipeline(pass_result=True)
+    pipeline.add_handler(lookup, cache=cache)
+    pipeline += tracker
+
+    assert await pipeline.run_async(1) == 10
+    assert await pipeline.run_async(1, offset=5) == 10
+    assert await pipeline.run_many_async([1, 2]) == [10, 20]
+    assert lookup.calls == 2
+    assert tracker.calls == [10, 10, 10, 20]
+    assert cache.hits == 2
+
+
+# ---------- timeouts, deadlines and hedging ----------
+
+class SleepyHandler(AsyncHandler):
+    """Sleeps for the next delay of `delays` (the last one repeats), then returns `data + 1`."""
+
+    def __init__(self, *delays):
+        self.delays = list(delays)
+        self.calls = 0
+
+    async def handle(self, data):
+        delay = self.delays[min(self.calls, len(self.delays) - 1)]
+        self.calls += 1
+        await asyncio.sleep(delay)
+        return data + 1
+
+
+async def test_handler_timeout_policies():
+    pipeline = HandlerPipeline(pass_result=True)
+    pipeline.add_handler(SleepyHandler(1), timeout=0.01, on_timeout="skip")
+    pipeline.add_handler(SleepyHandler(0))
+    assert await pipeline.run_async(1) == 2
+
+    pipeline = HandlerPipeline()
+    pipeline.add_handler(SleepyHandler(1), timeout=0.01, on_timeout="fallback", fallback="cached")
+    assert await pipeline.run_async(1) == "cached"
+    assert await pipeline.run_many_async([1, 2]) == ["cached", "cached"]
+
+    pipeline = HandlerPipeline()
+    pipeline.add_handler(SleepyHandler(1), timeout=0.01)
+    with pytest.raises(asyncio.TimeoutError):
+        await pipeline.run_async(1)
+
+
+async def test_timeout_with_cache_does_not_cancel_waiting_callers():
+    pipeline = HandlerPipeline()
+    pipeline.add_handler(SleepyHandler(1), cache=ResultCache(), timeout=0.1, on_timeout="fallback", fallback="late")
+
+    first = asyncio.ensure_future(pipeline.run_async(1))
+    await asyncio.sleep(0.05)
+    second = asyncio.ensure_future(pipeline.run_async(1))
+    assert await first == "late"
+    assert await second == "late"
+
+
+async def test_deadline_bounds_the_whole_run():
+    pipeline = HandlerPipeline(deadline=0.05)
+    for _ in range(3):
+        pipeline += SleepyHandler(0.03)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await pipeline.run_async(1)
+
+    pipeline.deadline = None
+    assert await pipeline.run_async(1) == 2
+
+
+async def test_hedged_handler_takes_the_fastest_call():
+    handler = SleepyHandler(1, 0)
+    pipeline = HandlerPipeline()
+    pipeline.add_handler(handler, hedge=0.01)
+
+    assert await asyncio.wait_for(pipeline.run_async(1), 0.5) == 2
+    assert handler.calls == 2
+
+    # A call finishing before the hedge delay is not duplicated
+    handler = SleepyHandler(0)
+    pipeline = HandlerPipeline()
+    pipeline.add_handler(handler, hedge=0.05)
+    assert await pipeline.run_async(1) == 2
+    assert handler.calls == 1
+
+
+async def test_hedge_waits_for_the_other_call_when_one_fails():
+    class Flaky(AsyncHandler):
+        def __init__(self):
+            self.calls = 0
+
+        async def handle(self, data):
+            self.calls += 1
+            if self.calls == 1:
+                await asyncio.sleep(0.02)
+                raise RuntimeError("first call failed")
+            await asyncio.sleep(0.05)
+            return "second"
+
+    pipeline = HandlerPipeline()
+    pipeline.add_handler(Flaky(), hedge=0.01)
+    assert await pipeline.run_async(1) == "second"
+
+
+async def test_latency_is_recorded_per_handler():
+    fast, slow = SleepyHandler(0), SleepyHandler(0.02)
+    pipeline = HandlerPipeline(record_latency=True)
+    pipeline += fast
+    pipeline.add_handler(slow, timeout=1)
+
+    for i in range(5):
+        await pipeline.run_async(i)
+
+    assert pipeline.latency(fast).count == pipeline.latency(slow).count == 5
+    assert pipeline.latency(slow).percentile(50) >= 0.02 > pipeline.latency(fast).percentile(99)
+    assert HandlerPipeline().latency(fast) is None
+
+
+def test_timeouts_are_validated_at_registration():
+    pipeline = HandlerPipeline()
+    with pytest.raises(ValueError):
+        pipeline.add_handler(AddOneHandler(), timeout=1)
+    with pytest.raises(ValueError):
+        pipeline.add_handler(SleepyHandler(0), timeout=1, on_timeout="ignore")
+    pipeline.add_handler(AddOneHandler(), executor="thread", timeout=1)
@@ -1,7 +1,11 @@
 import asyncio
+import gc
+import weakref
 from typing import Any
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from pattern_kit import Observable, Observer, AsyncObserver
 
 
@@ -90,3 +94,180 @@ async def test_async_observer_called_via_notify(monkeypatch):
 
         # Manually close the coroutine to suppress any warning
         called_coro.close()
+
+
+
+def test_observer_added_during_notify_sees_next_event():
+    obs = Observable()
+    late = SyncObserver()
+
+    class Subscriber(Observer):
+        def notify(self, event, data=None):
+            if late not in obs._observers:
+                obs.add_observer(late)
+
+    obs += Subscriber()
+    obs.notify("first", 1)
+    assert late.last_event is None
+
+    obs.notify("second", 2)
+    assert late.last_event == "second"
+
+
+async def test_concurrent_notify_async_overlaps_observers():
+    obs = Observable(concurrent=True)
+    observers = [CustomAsyncObserver() for _ in range(10)]
+    for observer in observers:
+        obs += observer
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await obs.notify_async("tick", 1)
+
+    # Ten 10ms observers finish in roughly the time of one
+    assert loop.time() - start < 0.05
+    assert all(observer.last_event == "tick" for observer in observers)
+
+
+async def test_notify_tasks_are_drained():
+    obs = Observable()
+    async_observer = CustomAsyncObserver()
+    obs += async_observer
+
+    obs.notify("on_event", 1)
+    assert obs.tasks.pending == 1
+
+    await obs.aclose()
+    assert async_observer.last_event == "on_event"
+    assert obs.tasks.completed == 1
+
+
+def test_weak_observer_does_not_keep_observer_alive():
+    obs = Observable()
+    sync_observer = SyncObserver()
+    ref = weakref.ref(sync_observer)
+    obs.add_observer(sync_observer, weak=True)
+
+    obs.notify("first", 1)
+    assert sync_observer.last_event == "first"
+
+    del sync_observer
+    gc.collect()
+
+    assert ref() is None
+    obs.notify("second", 2)
+    assert len(obs._observers) == 0
+
+
+def test_add_observer_returns_subscription_and_priority():
+    obs = Observable()
+    calls = []
+
+    class Recorder(Observer):
+        def __init__(self, name):
+            self.name = name
+
+        def notify(self, event, data=None):
+            calls.append(self.name)
+
+    obs.add_observer(Recorder("second"))
+    subscription = obs.add_observer(Recorder("first"), priority=1)
+
+    obs.notify("event")
+    assert calls == ["first", "second"]
+
+    subscription.cancel()
+    obs.notify("event")
+    assert calls == ["first", "second", "second"]
+
+
+def test_unhashable_observer_can_be_removed():
+    class Unhashable(SyncObserver):
+        __hash__ = None
+
+    obs = Observable()
+    observer = Unhashable()
+    obs += observer
+    obs -= observer
+    assert observer not in obs._observers
+
+
+class Recorder(Observer):
+    def __init__(self, name, calls, events=None):
+        self.name = name
+        self.calls = calls
+        self.observed_events = events
+
+    def notify(self, event, data=None):
+        self.calls.append((self.name, event))
+
+
+def test_observers_are_only_notified_of_declared_events():
+    obs = Observable()
+    calls = []
+
+    obs.add_observer(Recorder("prices", calls), events=["price"])
+    obs.add_observer(Recorder("trades", calls, events=("trade",)))
+    obs.add_observer(Recorder("all", calls))
+
+    obs.notify("price", 1)
+    obs.notify("trade", 2)
+    obs.notify("other", 3)
+
+    assert calls == [
+        ("prices", "price"), ("all", "price"),
+        ("trades", "trade"), ("all", "trade"),
+        ("all", "other"),
+    ]
+
+
+def test_interest_index_keeps_priorities_across_registries():
+    obs = Observable()
+    calls = []
+
+    obs.add_observer(Recorder("all", calls))
+    obs.add_observer(Recorder("urgent", calls), events="price", priority=5)
+    obs.add_observer(Recorder("late", calls), events=["price"])
+
+    obs.notify("price")
+    assert calls == [("urgent", "price"), ("all", "price"), ("late", "price")]
+
+
+async def test_notify_async_uses_interest_index():
+    obs = Observable()
+    observer = CustomAsyncObserver()
+    obs.add_observer(observer, events=["wanted"])
+
+    await obs.notify_async("unwanted", 1)
+    assert observer.last_event is None
+
+    await obs.notify_async("wanted", 2)
+    assert observer.last_data == 2
+
+
+def test_remove_and_cancel_observer_with_events():
+    obs = Observable()
+    calls = []
+    first = Recorder("first", calls)
+    subscription = obs.add_observer(first, events=["a", "b"])
+    obs.add_observer(Recorder("second", calls), events=["a"])
+
+    obs.notify("a")
+    obs -= first
+    obs.notify("a")
+    obs.notify("b")
+    assert calls == [("first", "a"), ("second", "a"), ("second", "a")]
+    assert not subscription.active
+
+    other = obs.add_observer(first, events=["a", "b"])
+    assert other.cancel() is True
+    assert other.cancel() is False
+    obs.notify("b")
+    assert len(calls) == 3
+
+
+def test_remove_unknown_observer_raises():
+    obs = Observable()
+    obs.add_observer(SyncObserver(), events=["a"])
+    with pytest.raises(ValueError):
+        obs.remove_observer(SyncObserver())
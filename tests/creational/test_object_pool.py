@@ -1,4 +1,8 @@
 import asyncio
+import gc
+import threading
+import time
+
 import pytest
 from pattern_kit.creational.object_pool import ObjectPool, AsyncObjectPool
 
@@ -50,6 +54,284 @@ def test_sync_context_manager():
 
     assert len(pool) == 1
 
+def test_bounded_pool_blocks_until_release():
+    created = []
+    pool = ObjectPool(factory=lambda: created.append(MyObject()) or created[-1], max_objects=2)
+    a, b = pool.acquire(), pool.acquire()
+
+    acquired = []
+    waiter = threading.Thread(target=lambda: acquired.append(pool.acquire(timeout=5)))
+    waiter.start()
+    time.sleep(0.05)
+    assert not acquired  # Blocked on the cap
+
+    pool.release(a)
+    waiter.join(1)
+    assert acquired == [a]
+    assert len(created) == 2
+    assert pool.wait_times.count == 3 and pool.wait_times.max >= 0.04
+
+
+def test_bounded_pool_timeout_and_freed_slots():
+    pool = ObjectPool(factory=MyObject, max_size=0, max_objects=1)
+    obj = pool.acquire()
+
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.01)
+    assert pool.timeouts == 1
+
+    # A failing factory does not leak its slot
+    pool.release(obj)
+    pool.clear()
+    pool._factory = lambda: 1 / 0
+    with pytest.raises(ZeroDivisionError):
+        pool.acquire()
+    pool._factory = MyObject
+    assert isinstance(pool.acquire(timeout=0), MyObject)
+
+
+def test_bounded_pool_under_contention():
+    pool = ObjectPool(factory=MyObject, max_size=1, max_objects=3)
+    live, peak, lock = [0], [0], threading.Lock()
+
+    def work():
+        for _ in range(50):
+            with pool.borrow(timeout=5):
+                with lock:
+                    live[0] += 1
+                    peak[0] = max(peak[0], live[0])
+                time.sleep(0.0001)
+                with lock:
+                    live[0] -= 1
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak[0] <= 3
+    assert pool.timeouts == 0
+
+def test_reap_trims_idle_objects_down_to_min_idle(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    disposed = []
+    pool = ObjectPool(factory=MyObject, max_idle_time=10, min_idle=1, dispose=disposed.append, reap_interval=3600)
+
+    objs = [pool.acquire() for _ in range(3)]
+    for obj in objs:
+        pool.release(obj)
+        now[0] += 1
+    assert pool.reap() == 0
+
+    now[0] += 20
+    assert pool.reap() == 2
+    assert disposed == objs[:2]  # Least recently used first
+    assert pool.acquire() is objs[2]
+    pool.close()
+
+
+def test_max_lifetime_and_validate_on_borrow(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    disposed = []
+    pool = ObjectPool(factory=MyObject, max_lifetime=60, dispose=disposed.append, reap_interval=3600,
+                      validate=lambda obj: obj.value >= 0)
+
+    old = pool.acquire()
+    pool.release(old)
+    now[0] += 61
+    fresh = pool.acquire()
+    assert fresh is not old and disposed == [old]
+
+    # Released past its lifetime: discarded right away
+    now[0] += 61
+    pool.release(fresh)
+    assert len(pool) == 0 and disposed == [old, fresh]
+
+    broken = pool.acquire()
+    broken.value = -1
+    pool.release(broken)
+    assert pool.acquire() is not broken
+    assert disposed[-1] is broken
+    pool.close()
+
+
+def ping(obj):
+    if obj.value < 0:
+        raise ConnectionError("dead")
+    return True
+
+
+def test_validator_that_raises_discards_the_object():
+    disposed = []
+    pool = ObjectPool(factory=MyObject, max_objects=1, validate=ping, dispose=disposed.append)
+
+    dead = pool.acquire()
+    dead.value = -1
+    pool.release(dead)
+    # The dead object's slot is freed for a new one
+    assert pool.acquire(timeout=0.2) is not dead
+    assert disposed == [dead]
+
+
+def test_reset_hook_runs_on_release():
+    def reset(obj):
+        if obj.value < 0:
+            raise ValueError("broken")
+        obj.value = 0
+
+    disposed = []
+    pool = ObjectPool(factory=MyObject, reset=reset, dispose=disposed.append)
+    with pool.borrow() as obj:
+        obj.value = 5
+    assert obj.value == 0 and len(pool) == 1
+
+    with pool.borrow() as obj:
+        obj.value = -1
+    assert len(pool) == 0 and disposed == [obj]
+
+
+def test_reaper_thread_runs_in_the_background():
+    pool = ObjectPool(factory=MyObject, max_idle_time=0.01)
+    pool.release(pool.acquire())
+    assert len(pool) == 1
+
+    deadline = time.monotonic() + 1
+    while len(pool) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(pool) == 0
+    pool.close()
+
+class SlowObject(MyObject):
+    def __init__(self):
+        super().__init__()
+        time.sleep(0.05)
+
+
+def test_prefill_creates_objects_concurrently():
+    pool = ObjectPool(factory=SlowObject, prefill_concurrency=8)
+
+    started = time.perf_counter()
+    assert pool.prefill(8) == 8
+    assert time.perf_counter() - started < 0.3
+    assert len(pool) == 8
+    assert pool.warmup_times.count == 1 and pool.warmup_times.max >= 0.05
+    assert pool.prefill(4) == 0  # Already enough idle objects
+    pool.close()
+
+
+def test_prefill_respects_pool_limits_and_raises_factory_errors():
+    pool = ObjectPool(factory=MyObject, max_size=3, max_objects=5)
+    held = pool.acquire()
+    assert pool.prefill(10) == 3
+    pool.release(held)
+    assert len(pool) == 3  # max_size: the released object was discarded
+
+    failing = ObjectPool(factory=lambda: 1 / 0, max_objects=2)
+    with pytest.raises(ZeroDivisionError):
+        failing.prefill(2)
+    failing._factory = MyObject
+    assert failing.prefill(2) == 2  # Slots of failed creations were freed
+    pool.close()
+    failing.close()
+
+
+def test_min_idle_is_refilled_in_the_background():
+    pool = ObjectPool(factory=MyObject, min_idle=2)
+    pool.acquire()
+
+    deadline = time.monotonic() + 1
+    while len(pool) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(pool) == 2
+    pool.close()
+
+def test_background_refill_errors_are_logged(caplog):
+    def broken():
+        raise RuntimeError("no connection")
+
+    pool = ObjectPool(factory=broken, min_idle=1)
+    with caplog.at_level("ERROR"):
+        pool.reap()
+        pool.close()
+    assert [record.exc_info[0] for record in caplog.records] == [RuntimeError]
+
+
+def test_local_cache_reuses_objects_without_the_shared_pool():
+    pool = ObjectPool(factory=MyObject, max_size=10, local_cache=4)
+    objs = [pool.acquire() for _ in range(10)]
+    for obj in objs:
+        pool.release(obj)
+
+    # Half of the full cache went back to the shared pool, in one batch
+    assert len(pool._idle) == 6 and len(pool) == 10
+    assert pool.acquire() is objs[-1]
+
+    pool.clear()
+    assert len(pool) == 0 and pool._local.cache == []
+
+
+def test_local_caches_are_reclaimed():
+    pool = ObjectPool(factory=MyObject, max_objects=1, local_cache=4)
+    parked, done = threading.Event(), threading.Event()
+
+    def hold():
+        pool.release(pool.acquire())
+        parked.set()
+        done.wait(5)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    parked.wait(5)
+    assert len(pool) == 1 and len(pool._idle) == 0
+
+    # A waiting thread takes objects from the other threads' caches
+    obj = pool.acquire(timeout=1)
+    assert pool.timeouts == 0
+    done.set()
+    thread.join()
+
+    # The cache of a finished thread is returned to the shared pool
+    thread = threading.Thread(target=lambda: pool.release(obj))
+    thread.start()
+    thread.join()
+    gc.collect()
+    assert len(pool._caches) == 1
+    assert list(pool._idle) == [obj]
+
+
+def test_release_to_local_cache_wakes_a_thread_that_just_started_waiting():
+    pool = ObjectPool(factory=MyObject, max_objects=1, local_cache=4)
+    local_cache = pool._local_cache
+    acquired, releasing, done = threading.Event(), threading.Event(), threading.Event()
+
+    def slow_local_cache():
+        # Let the main thread start waiting between the release's check and its append
+        if threading.current_thread() is thread:
+            releasing.set()
+            time.sleep(0.3)
+        return local_cache()
+
+    def hold():
+        obj = pool.acquire()
+        acquired.set()
+        pool._local_cache = slow_local_cache
+        pool.release(obj)
+        # Stay alive: a finished thread's cache would be reclaimed anyway
+        done.wait(5)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    acquired.wait(5)
+    releasing.wait(5)
+    started = time.perf_counter()
+    pool.acquire(timeout=2)
+    assert time.perf_counter() - started < 1
+    done.set()
+    thread.join()
+
+
 # ---------- async tests ----------
 
 async def test_async_pool_acquire_and_release():
@@ -79,3 +361,220 @@ async def test_async_context_manager():
         obj.value = 99
 
     assert len(pool) == 1
+
+
+async def test_async_bounded_pool_serves_waiters_in_order():
+    pool = AsyncObjectPool(factory=MyObject, max_objects=1)
+    obj = await pool.acquire()
+
+    order = []
+
+    async def wait(name):
+        async with pool.borrow() as borrowed:
+            order.append((name, borrowed))
+            await asyncio.sleep(0)
+
+    waiters = [asyncio.create_task(wait(name)) for name in "abc"]
+    await asyncio.sleep(0)
+    await pool.release(obj)
+    await asyncio.gather(*waiters)
+
+    assert [name for name, _ in order] == ["a", "b", "c"]
+    assert all(borrowed is obj for _, borrowed in order)
+    assert pool.wait_times.count == 4
+
+
+async def test_async_bounded_pool_timeout_and_cancellation():
+    pool = AsyncObjectPool(factory=MyObject, max_objects=1)
+    obj = await pool.acquire()
+
+    with pytest.raises(TimeoutError):
+        await pool.acquire(timeout=0.01)
+    assert pool.timeouts == 1
+
+    # A waiter cancelled after being served passes the object on
+    first = asyncio.create_task(pool.acquire())
+    second = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0)
+    await pool.release(obj)
+    first.cancel()
+    assert await asyncio.wait_for(second, 1) is obj
+    assert first.cancelled()
+
+
+async def test_async_bounded_pool_frees_slots():
+    pool = AsyncObjectPool(factory=MyObject, max_objects=1)
+    obj = await pool.acquire()
+    await pool.release(obj)
+    await pool.clear()
+
+    # A failing factory hands its slot to the next waiter
+    pool._factory = lambda: 1 / 0
+    with pytest.raises(ZeroDivisionError):
+        await pool.acquire()
+    pool._factory = MyObject
+    fresh = await pool.acquire(timeout=0)
+    assert isinstance(fresh, MyObject) and fresh is not obj
+
+
+async def test_async_reaper_and_validate():
+    disposed = []
+    pool = AsyncObjectPool(factory=MyObject, max_idle_time=0.01, dispose=disposed.append,
+                           validate=lambda obj: obj.value >= 0)
+
+    broken = await pool.acquire()
+    broken.value = -1
+    await pool.release(broken)
+    assert await pool.acquire() is not broken
+    assert disposed == [broken]
+
+    await pool.release(MyObject())
+    await asyncio.sleep(0.05)
+    assert len(pool) == 0 and len(disposed) == 2
+    await pool.close()
+    assert pool._reaper.done()
+
+
+async def test_async_validator_that_raises_discards_the_object():
+    disposed = []
+    pool = AsyncObjectPool(factory=MyObject, max_objects=1, validate=ping, dispose=disposed.append)
+
+    dead = await pool.acquire()
+    dead.value = -1
+    await pool.release(dead)
+    assert await pool.acquire(timeout=0.2) is not dead
+    assert disposed == [dead]
+
+
+async def test_async_prefill_and_background_refill():
+    pool = AsyncObjectPool(factory=MyObject, max_objects=4, min_idle=2)
+    assert await pool.prefill(8) == 4  # Capped by max_objects
+    assert pool.warmup_times.count == 1
+
+    await pool.clear()
+    obj = await pool.acquire()
+    await asyncio.sleep(0.01)
+    assert len(pool) == 2
+    await pool.release(obj)
+    await pool.close()
+
+
+async def connect():
+    await asyncio.sleep(0.02)
+    return MyObject()
+
+
+async def test_async_factory_and_concurrent_prefill():
+    pool = AsyncObjectPool(factory=connect, prefill_concurrency=10)
+
+    assert isinstance(await pool.acquire(), MyObject)
+    started = time.perf_counter()
+    assert await pool.prefill(10) == 10
+    assert time.perf_counter() - started < 0.1
+
+
+async def test_max_creating_caps_factory_calls_and_hands_objects_to_waiters():
+    in_flight, peak = [0], [0]
+
+    async def factory():
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        await asyncio.sleep(0.01)
+        in_flight[0] -= 1
+        return MyObject()
+
+    pool = AsyncObjectPool(factory=factory, max_creating=3)
+    objs = await asyncio.gather(*(pool.acquire() for _ in range(20)))
+
+    assert peak[0] == 3
+    assert len({id(obj) for obj in objs}) == 20
+    assert len(pool) == 0  # Handed over directly, not through the idle objects
+
+
+async def test_max_creating_reuses_released_objects():
+    created = []
+
+    async def factory():
+        await asyncio.sleep(0.01)
+        created.append(MyObject())
+        return created[-1]
+
+    pool = AsyncObjectPool(factory=factory, max_creating=1, max_objects=4)
+
+    async def work():
+        async with pool.borrow():
+            await asyncio.sleep(0.005)
+
+    await asyncio.gather(*(work() for _ in range(30)))
+    assert len(created) <= 4
+
+
+async def test_async_hooks_and_factory_errors():
+    disposed = []
+
+    async def reset(obj):
+        await asyncio.sleep(0)
+        if obj.value < 0:
+            raise ValueError("broken")
+        obj.value = 0
+
+    async def dispose(obj):
+        await asyncio.sleep(0.01)
+        disposed.append(obj)
+
+    pool = AsyncObjectPool(factory=connect, reset=reset, dispose=dispose)
+    obj = await pool.acquire()
+    obj.value = 5
+    await pool.release(obj)
+    assert obj.value == 0 and len(pool) == 1
+
+    obj = await pool.acquire()
+    obj.value = -1
+    await pool.release(obj)
+    assert len(pool) == 0
+    await pool.close()
+    assert disposed == [obj]
+
+    async def failing():
+        raise ConnectionError("down")
+
+    pool = AsyncObjectPool(factory=failing, max_creating=1)
+    results = await asyncio.gather(pool.acquire(), pool.acquire(), return_exceptions=True)
+    assert all(isinstance(result, ConnectionError) for result in results)
+
+
+async def test_cancelled_async_reset_discards_the_object():
+    started = asyncio.Event()
+
+    async def reset(obj):
+        started.set()
+        await asyncio.sleep(1)
+
+    pool = AsyncObjectPool(factory=MyObject, max_objects=1, reset=reset)
+
+    async def work():
+        async with pool.borrow():
+            pass
+
+    task = asyncio.ensure_future(work())
+    await started.wait()
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    assert isinstance(await pool.acquire(timeout=0.2), MyObject)
+
+
+async def test_close_cancels_creations_for_waiters():
+    async def factory():
+        await asyncio.sleep(10)
+
+    pool = AsyncObjectPool(factory=factory, max_creating=1)
+    # The second caller waits, and gets an object created on its behalf
+    callers = [asyncio.ensure_future(pool.acquire()) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    assert len(pool._creations) == 1
+
+    await asyncio.wait_for(pool.close(), 1)
+    assert not pool._creations
+    for caller in callers:
+        caller.cancel()
+    await asyncio.gather(*callers, return_exceptions=True)
@@ -0,0 +1,36 @@
+import pytest
+
+from pattern_kit.utils.latency import LatencyRecorder
+
+
+def test_percentiles_and_totals():
+    recorder = LatencyRecorder()
+    for ms in range(1, 101):
+        recorder.record(ms / 1000)
+
+    assert recorder.percentiles(50, 99, 100) == [0.05, 0.099, 0.1]
+    assert recorder.percentile(0) == 0.001
+    assert recorder.count == 100 and recorder.max == 0.1
+    assert recorder.mean == pytest.approx(0.0505)
+
+
+def test_window_keeps_recent_samples():
+    recorder = LatencyRecorder(window=10)
+    for _ in range(100):
+        recorder.record(1.0)
+    for _ in range(10):
+        recorder.record(0.01)
+
+    assert len(recorder) == 10
+    assert recorder.percentile(99) == 0.01
+    assert recorder.count == 110 and recorder.max == 1.0
+
+
+def test_empty_and_reset():
+    recorder = LatencyRecorder()
+    assert recorder.percentile(50) == 0.0 and recorder.mean == 0.0
+    recorder.record(0.5)
+    recorder.reset()
+    assert (recorder.count, len(recorder), recorder.max) == (0, 0, 0.0)
+    with pytest.raises(ValueError):
+        recorder.percentile(101)
@@ -0,0 +1,116 @@
+import asyncio
+import time
+
+from pattern_kit.utils.result_cache import ResultCache
+
+
+def test_lru_eviction_and_stats():
+    cache = ResultCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "a" becomes most recently used
+    cache.put("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("b", "missing") == "missing"
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert (cache.hits, cache.misses, cache.evictions) == (3, 1, 1)
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+
+    cache = ResultCache(ttl=10)
+    cache.put("a", 1)
+    now[0] += 5
+    assert cache.get("a") == 1
+    now[0] += 6
+    assert cache.get("a") is None
+    assert cache.expirations == 1
+    assert len(cache) == 0
+
+
+def test_memory_bound():
+    cache = ResultCache(maxsize=None, max_bytes=10, sizeof=len)
+    cache.put("a", "x" * 4)
+    cache.put("b", "x" * 4)
+    cache.put("c", "x" * 4)
+    assert "a" not in cache and len(cache) == 2
+    assert cache.bytes == 8
+
+    cache.put("huge", "x" * 11)
+    assert "huge" not in cache
+    assert cache.evictions == 1
+
+
+def test_call_computes_once_and_key_function():
+    calls = []
+    cache = ResultCache(key=lambda data, kwargs: data.lower())
+
+    def compute(value):
+        calls.append(value)
+        return value.upper()
+
+    assert cache.call(cache.key("Hello", {}), lambda: compute("Hello")) == "HELLO"
+    assert cache.call(cache.key("HELLO", {}), lambda: compute("HELLO")) == "HELLO"
+    assert calls == ["Hello"]
+
+    assert cache.invalidate("hello")
+    assert not cache.invalidate("hello")
+
+
+async def test_call_async_collapses_concurrent_requests():
+    cache = ResultCache()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(*(cache.call_async("key", compute) for _ in range(10)))
+    assert results == ["value"] * 10
+    assert calls == 1
+    assert (cache.hits, cache.misses) == (9, 1)
+
+
+async def test_call_async_does_not_cache_errors():
+    cache = ResultCache()
+    attempts = 0
+
+    async def flaky():
+        nonlocal attempts
+        attempts += 1
+        await asyncio.sleep(0.01)
+        if attempts == 1:
+            raise RuntimeError("boom")
+        return "ok"
+
+    first = asyncio.gather(cache.call_async("key", flaky), cache.call_async("key", flaky), return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in await first)
+    assert await cache.call_async("key", flaky) == "ok"
+    assert attempts == 2
+
+
+async def test_call_async_survives_cancelled_leader():
+    cache = ResultCache()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return "value"
+
+    leader = asyncio.ensure_future(cache.call_async("key", compute))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(cache.call_async("key", compute))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "value"
+    assert leader.cancelled()
+    assert calls == 2
+    assert cache.get("key") == "value"